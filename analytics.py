@@ -0,0 +1,164 @@
+"""
+로컬 경기 저장소에 쌓인 경기로 소환사별 최근 전적을 계산합니다 (API 호출 없음).
+
+소환사마다 경기 기록을 열(column)별 NumPy 배열(승리, 킬, 데스, 어시스트, 챔피언, 큐, 게임 시간, 종료 시각)로
+메모리에 두고, 최근 승률 · KDA · 챔피언별 전적 · 연승/연패를 벡터 연산으로 계산합니다.
+배열은 경기 저장소의 참가자 색인(match_participants)에서 읽고, 그 소환사의 경기 수가 바뀌었을 때만 다시 읽습니다.
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+# 열 이름과 자료형 (MatchStore.participant_rows()의 열 순서와 같음)
+COLUMNS = (
+    ("win", np.bool_),
+    ("kills", np.int16),
+    ("deaths", np.int16),
+    ("assists", np.int16),
+    ("champion_id", np.int32),
+    ("queue_id", np.int32),
+    ("duration", np.int32),
+    ("ended_at", np.int64),
+)
+
+
+class MatchHistory:
+    """
+    소환사 한 명의 경기 기록 (종료 시각 순서, 열별 NumPy 배열).
+    """
+
+    __slots__ = tuple(name for name, _ in COLUMNS) + ("size",)
+
+    def __init__(self, rows=()):
+        self.size = len(rows)
+        for i, (name, dtype) in enumerate(COLUMNS):
+            setattr(self, name, np.fromiter((row[i] for row in rows), dtype=dtype, count=self.size))
+
+    def select(self, mask):
+        """
+        mask(불리언 배열)에 해당하는 경기만 담은 MatchHistory.
+        """
+        history = MatchHistory()
+        for name, _ in COLUMNS:
+            setattr(history, name, getattr(self, name)[mask])
+        history.size = int(np.count_nonzero(mask))
+        return history
+
+
+def kda(kills, deaths, assists):
+    """
+    (킬 + 어시스트) / 데스. 데스가 0이면 1로 계산합니다. 배열이면 합계 기준입니다.
+    """
+    return float(np.sum(kills) + np.sum(assists)) / max(int(np.sum(deaths)), 1)
+
+
+def rolling_win_rate(win, window):
+    """
+    각 경기 시점의 직전 window경기 승률(%) 배열. 앞쪽 window-1경기는 그때까지의 경기 수로 나눕니다.
+    """
+    if window < 1:
+        raise ValueError(f"window는 1 이상이어야 합니다: {window}")
+    wins = np.cumsum(win, dtype=np.int64)
+    window_wins = wins.copy()
+    window_wins[window:] -= wins[:-window]
+    counts = np.minimum(np.arange(1, len(wins) + 1), window)
+    return window_wins * 100.0 / counts
+
+
+def current_streak(win):
+    """
+    마지막 경기부터 이어진 연승(양수) 또는 연패(음수) 수. 경기가 없으면 0.
+    """
+    if len(win) == 0:
+        return 0
+    last = win[-1]
+    changed = np.flatnonzero(win != last)
+    length = len(win) - (changed[-1] + 1 if len(changed) else 0)
+    return int(length) if last else -int(length)
+
+
+class RecentStats(NamedTuple):
+    """
+    최근 전적 요약. 승률은 %(소수 둘째 자리), 연승/연패는 양수/음수입니다.
+    previous_win_rate는 그 직전 같은 수의 경기 승률 (경기가 부족하면 None).
+    champion_*은 챔피언을 지정했을 때 저장된 전체 경기 중 그 챔피언으로 한 경기의 전적입니다.
+    """
+    games: int
+    wins: int
+    losses: int
+    win_rate: float
+    previous_win_rate: float
+    kda: float
+    streak: int
+    champion_games: int = 0
+    champion_wins: int = 0
+    champion_win_rate: float = 0
+    champion_kda: float = 0
+
+
+class MatchAnalytics:
+    """
+    소환사별 MatchHistory를 캐시하고 최근 전적을 계산합니다.
+    """
+
+    def __init__(self, store, recent_games=20):
+        self.store = store
+        self.recent_games = recent_games
+        self.histories = {}
+        self.lock = threading.Lock()
+
+    def history(self, puuid):
+        """
+        소환사의 MatchHistory. 저장소의 경기 수가 바뀌었을 때만(새 경기, 백필) 다시 읽습니다.
+        """
+        count = self.store.participant_count(puuid)
+        with self.lock:
+            history = self.histories.get(puuid)
+        if history is None or history.size != count:
+            history = MatchHistory(self.store.participant_rows(puuid))
+            with self.lock:
+                self.histories[puuid] = history
+        return history
+
+    def recent_stats(self, puuid, champion_id=None, queue_id=None):
+        """
+        최근 recent_games경기의 RecentStats. queue_id를 주면 그 큐의 경기만 봅니다. 저장된 경기가 없으면 None.
+        """
+        history = self.history(puuid)
+        if queue_id is not None:
+            history = history.select(history.queue_id == queue_id)
+        if history.size == 0:
+            return None
+
+        n = self.recent_games
+        recent = slice(-n, None)
+        win = history.win
+        wins = int(np.count_nonzero(win[recent]))
+        games = len(win[recent])
+        rolling = rolling_win_rate(win, n)
+        previous = round(float(rolling[-n - 1]), 2) if history.size >= 2 * n else None
+
+        stats = RecentStats(
+            games=games,
+            wins=wins,
+            losses=games - wins,
+            win_rate=round(wins * 100 / games, 2),
+            previous_win_rate=previous,
+            kda=round(kda(history.kills[recent], history.deaths[recent], history.assists[recent]), 2),
+            streak=current_streak(win),
+        )
+        if champion_id:
+            mask = history.champion_id == int(champion_id)
+            champion_games = int(np.count_nonzero(mask))
+            if champion_games:
+                champion_wins = int(np.count_nonzero(win & mask))
+                stats = stats._replace(
+                    champion_games=champion_games,
+                    champion_wins=champion_wins,
+                    champion_win_rate=round(champion_wins * 100 / champion_games, 2),
+                    champion_kda=round(
+                        kda(history.kills[mask], history.deaths[mask], history.assists[mask]), 2
+                    ),
+                )
+        return stats
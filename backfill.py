@@ -0,0 +1,354 @@
+"""
+모니터링 대상 소환사들의 지난 경기(match-v5)를 로컬 경기 저장소(MATCH_STORE)로 한꺼번에 받아옵니다 (전적 백필).
+
+- 소환사마다 /matches/by-puuid/{puuid}/ids 를 100개씩 넘겨 보면서, 저장소에 없는 경기만 받습니다.
+- 여러 소환사의 ID 목록 조회와 경기 상세 다운로드를 동시에 진행합니다
+  (동시 실행 수는 BACKFILL_SUMMONER_CONCURRENCY / BACKFILL_CONCURRENCY, 레이트 리밋은 Riot API 클라이언트가 지킴).
+  백필 요청은 가장 낮은 우선순위로 보내서, 한도의 절반은 모니터링 요청 몫으로 남겨 둡니다.
+- 페이지를 다 받을 때마다 진행 위치를 CACHE_DIR/backfill.sqlite3 에 기록하므로,
+  중간에 멈추거나 다시 실행해도 이어서 진행합니다. (같은 경기는 저장소에 있으면 다시 받지 않습니다.)
+  끝까지 받은 소환사는 다음 실행 때 최근 경기부터 지난번에 끝까지 확인한 가장 최근 경기(head)가 나올 때까지만 확인하고,
+  이 따라잡기도 페이지마다 위치를 기록해서 중간에 멈추면 다음 실행 때 그 위치부터 이어 갑니다.
+- puuid는 상태 저장소(STATE_DB)에 있으면 그대로 쓰고, 없을 때만 계정 정보를 조회해서 저장해 둡니다.
+
+사용 예:
+  python start.py backfill
+  python backfill.py --queue 420 --since 2025-01-01 --max-matches 300
+  python backfill.py --since 30d 이름#태그 이름2#태그
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config import CACHE_DIR, BACKFILL_CONCURRENCY, BACKFILL_SUMMONER_CONCURRENCY
+from riot_api import MATCH_STORE, get_account_info, get_match_ids, fetch_match_raw, PRIORITY_BACKFILL
+from routing import route_for, regional_cluster, platform_of_match, split_summoner
+from state_store import open_state_store
+
+PAGE_SIZE = 100
+
+
+class BackfillProgress:
+    """
+    (puuid, 필터)별 백필 진행 위치를 저장하는 SQLite 테이블.
+    next_start는 다음에 조회할 ids 페이지의 start 값이고, complete는 끝까지 다 받았는지 여부입니다.
+    head_match_id는 그 아래로 빠짐없이 받은 가장 최근 경기이고, 따라잡기(catch_up) 중이면
+    catch_up_start(다음에 조회할 start)와 catch_up_head(따라잡기를 시작할 때의 가장 최근 경기)가 채워집니다.
+
+    ids는 최신순이라 그 사이 새 경기가 생기면 예전 경기가 뒤로 밀릴 뿐이므로,
+    저장된 위치에서 이어서 조회해도 경기를 건너뛰지 않습니다 (겹치는 경기는 저장소에 있어서 다시 받지 않음).
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            " puuid TEXT NOT NULL,"
+            " filter_key TEXT NOT NULL,"
+            " next_start INTEGER NOT NULL,"
+            " complete INTEGER NOT NULL,"
+            " downloaded INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " head_match_id TEXT,"
+            " catch_up_start INTEGER,"
+            " catch_up_head TEXT,"
+            " PRIMARY KEY (puuid, filter_key))"
+        )
+        # 이전 버전에서 만든 파일에는 없는 열 추가 (head가 없으면 따라잡기는 저장된 경기가 나올 때까지)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(progress)")}
+        for column, kind in (("head_match_id", "TEXT"), ("catch_up_start", "INTEGER"), ("catch_up_head", "TEXT")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE progress ADD COLUMN {column} {kind}")
+        self.conn.commit()
+
+    def get(self, puuid, filter_key):
+        """
+        (next_start, complete, downloaded)를 반환합니다. 기록이 없으면 (0, False, 0).
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT next_start, complete, downloaded FROM progress WHERE puuid = ? AND filter_key = ?",
+                (puuid, filter_key)
+            ).fetchone()
+        if row is None:
+            return 0, False, 0
+        return row[0], bool(row[1]), row[2]
+
+    def save(self, puuid, filter_key, next_start, complete, downloaded, head_match_id=None):
+        """
+        진행 위치를 기록합니다. head_match_id가 None이면 기록된 값을 그대로 둡니다.
+        """
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO progress (puuid, filter_key, next_start, complete, downloaded, updated_at, head_match_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (puuid, filter_key) DO UPDATE SET next_start = excluded.next_start,"
+                " complete = excluded.complete, downloaded = excluded.downloaded, updated_at = excluded.updated_at,"
+                " head_match_id = COALESCE(excluded.head_match_id, head_match_id)",
+                (puuid, filter_key, next_start, int(complete), downloaded, time.time(), head_match_id)
+            )
+            self.conn.commit()
+
+    def get_catch_up(self, puuid, filter_key):
+        """
+        (head_match_id, catch_up_start, catch_up_head)를 반환합니다. 진행 중인 따라잡기가 없으면 뒤의 둘은 None.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT head_match_id, catch_up_start, catch_up_head FROM progress WHERE puuid = ? AND filter_key = ?",
+                (puuid, filter_key)
+            ).fetchone()
+        return tuple(row) if row is not None else (None, None, None)
+
+    def save_catch_up(self, puuid, filter_key, start, head):
+        """
+        따라잡기 위치를 기록합니다. start가 None이면 따라잡기가 끝난 것으로 보고 head를 head_match_id로 올립니다.
+        """
+        with self.lock:
+            if start is None:
+                self.conn.execute(
+                    "UPDATE progress SET head_match_id = COALESCE(?, head_match_id), catch_up_start = NULL,"
+                    " catch_up_head = NULL, updated_at = ? WHERE puuid = ? AND filter_key = ?",
+                    (head, time.time(), puuid, filter_key)
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE progress SET catch_up_start = ?, catch_up_head = ?, updated_at = ?"
+                    " WHERE puuid = ? AND filter_key = ?",
+                    (start, head, time.time(), puuid, filter_key)
+                )
+            self.conn.commit()
+
+    def reset(self, filter_key):
+        with self.lock:
+            self.conn.execute("DELETE FROM progress WHERE filter_key = ?", (filter_key,))
+            self.conn.commit()
+
+
+def parse_time(value):
+    """
+    "2025-01-01" 같은 날짜나 "30d"(30일 전) 형식을 유닉스 시각(초)으로 바꿉니다. 비어 있으면 None.
+    """
+    if not value:
+        return None
+    if value.endswith("d") and value[:-1].isdigit():
+        return int(time.time() - int(value[:-1]) * 86400)
+    return int(datetime.datetime.strptime(value, "%Y-%m-%d").timestamp())
+
+
+class Backfill:
+    """
+    여러 소환사의 경기 기록을 동시에 받아서 MATCH_STORE에 저장합니다.
+    """
+
+    def __init__(self, queue=None, start_time=None, end_time=None, max_matches=None,
+                 concurrency=BACKFILL_CONCURRENCY, summoner_concurrency=BACKFILL_SUMMONER_CONCURRENCY,
+                 region=None, progress=None, store=MATCH_STORE, state_store=None, filter_key=None):
+        self.queue = queue
+        self.start_time = start_time
+        self.end_time = end_time
+        self.max_matches = max_matches
+        # 지정하지 않으면 소환사마다 그 플랫폼의 지역 클러스터로 보냄
+        self.region = region
+        # 진행 위치를 구분하는 키. "30d"처럼 실행할 때마다 시각이 바뀌는 필터는 시각 대신 입력 문자열로 넘겨받음
+        self.filter_key = filter_key or f"queue={queue};start={start_time};end={end_time}"
+        self.progress = progress or BackfillProgress(os.path.join(CACHE_DIR, "backfill.sqlite3"))
+        self.store = store
+        # 있으면 모니터가 저장해 둔 puuid를 다시 조회하지 않고 씀
+        self.state_store = state_store
+        self.download_slots = None
+        self.summoner_slots = None
+        self.concurrency = concurrency
+        self.summoner_concurrency = summoner_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency + summoner_concurrency,
+                                           thread_name_prefix="backfill")
+        self.downloaded = 0
+        self.skipped = 0
+        self.failed = 0
+
+    async def call(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+
+    def _download(self, match_id):
+        raw = fetch_match_raw(match_id, self.region or regional_cluster(platform_of_match(match_id)), PRIORITY_BACKFILL)
+        # 한꺼번에 많이 저장하므로 메모리 LRU(모니터링 중인 경기용)는 건드리지 않음
+        self.store.put_raw(match_id, raw, remember=False)
+
+    async def download(self, match_id):
+        """
+        경기 하나를 받아서 저장합니다. 받았으면 True, 건너뛰었으면 False.
+        404(아직 공개되지 않았거나 없는 경기)는 건너뛰고, 그 밖의 오류는 그대로 올려 보냅니다.
+        """
+        async with self.download_slots:
+            try:
+                await self.call(self._download, match_id)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    self.skipped += 1
+                    return False
+                raise
+        self.downloaded += 1
+        return True
+
+    async def backfill_summoner(self, spec):
+        """
+        소환사 한 명("이름#태그" 또는 "이름#태그@플랫폼")의 경기 ID를 저장된 위치부터 끝까지(또는 max_matches까지)
+        넘겨 보면서 없는 경기를 받습니다.
+        """
+        riot_id, platform = split_summoner(spec)
+        route = route_for(platform)
+        region = self.region or route.region
+        puuid = await self.resolve_puuid(riot_id, route)
+        if not puuid:
+            print(f"[{riot_id}] 계정 정보에서 puuid를 가져오지 못했습니다.")
+            return
+        start, complete, downloaded = self.progress.get(puuid, self.filter_key)
+        # 최대 경기 수까지 본 소환사도 (이전 버전은 완료로 기록하지 않았음) 그 뒤 새 경기만 따라잡음
+        if complete or (self.max_matches is not None and start >= self.max_matches):
+            added = await self.catch_up(puuid, region)
+            self.progress.save(puuid, self.filter_key, start + added, True, downloaded + added)
+            print(f"[{riot_id}] 이미 백필 완료, 새 경기 {added}개 저장")
+            return
+
+        while self.max_matches is None or start < self.max_matches:
+            count = PAGE_SIZE if self.max_matches is None else min(PAGE_SIZE, self.max_matches - start)
+            match_ids = await self.call(
+                get_match_ids, puuid, region, start=start, count=count,
+                queue=self.queue, start_time=self.start_time, end_time=self.end_time
+            )
+            missing = self.store.missing(match_ids)
+            results = await asyncio.gather(*(self.download(match_id) for match_id in missing))
+            # 첫 페이지의 맨 앞 경기가 다음 따라잡기의 기준(head). 그보다 새 경기는 따라잡기가 받음
+            head = match_ids[0] if start == 0 and match_ids else None
+            # 페이지의 경기를 모두 받은 뒤에만 진행 위치를 옮김 (실패하면 다음 실행 때 이 페이지부터 다시)
+            start += len(match_ids)
+            downloaded += sum(results)
+            complete = len(match_ids) < count
+            capped = not complete and self.max_matches is not None and start >= self.max_matches
+            # 최대 경기 수에 닿아도 완료로 기록해서 다음 실행부터는 head 위의 새 경기만 따라잡음
+            self.progress.save(puuid, self.filter_key, start, complete or capped, downloaded, head)
+            if complete or capped:
+                break
+        print(f"[{riot_id}] 백필 {'중단(최대 경기 수)' if capped else '완료'}: {start}경기 확인, {downloaded}경기 저장")
+
+    async def resolve_puuid(self, riot_id, route):
+        """
+        상태 저장소에 puuid가 있으면 그대로 쓰고, 없으면 계정 정보를 조회해서 저장소에 기록합니다.
+        """
+        if self.state_store is not None:
+            record = await self.call(self.state_store.load, riot_id)
+            if record is not None and record.puuid:
+                return record.puuid
+        game_name, tag_line = riot_id.split("#", 1)
+        account_info = await self.call(get_account_info, game_name, tag_line, route.account_region, PRIORITY_BACKFILL)
+        puuid = account_info.get("puuid")
+        if puuid and self.state_store is not None:
+            await self.call(self.state_store.save_account, riot_id, puuid)
+        return puuid
+
+    async def catch_up(self, puuid, region):
+        """
+        이미 끝까지 받은 소환사: 최근 경기부터 넘겨 보다가 지난번 따라잡기의 기준 경기(head_match_id)가 나오면 멈춥니다.
+        head를 모르면(이전 버전의 기록) 저장된 경기가 나올 때 멈춥니다. 새로 받은 경기 수를 반환합니다.
+
+        페이지마다 위치를 기록하므로 중간에 멈춰도 다음 실행 때 그 위치부터 이어 갑니다.
+        (처음부터 다시 보면 이미 받은 최근 경기에서 멈춰서 그 아래가 빠진 채로 남음)
+        """
+        head, start, pending_head = self.progress.get_catch_up(puuid, self.filter_key)
+        start = start or 0
+        added = 0
+        while True:
+            match_ids = await self.call(
+                get_match_ids, puuid, region, start=start, count=PAGE_SIZE,
+                queue=self.queue, start_time=self.start_time, end_time=self.end_time
+            )
+            if pending_head is None:
+                # 이번 따라잡기가 끝나면 이 경기까지 빠짐없이 받은 것이 됨
+                pending_head = match_ids[0] if match_ids else head
+            if head in match_ids:
+                match_ids = match_ids[:match_ids.index(head)]
+                reached = True
+            else:
+                reached = False
+            missing = self.store.missing(match_ids)
+            added += sum(await asyncio.gather(*(self.download(match_id) for match_id in missing)))
+            if head is None:
+                reached = len(missing) < len(match_ids)
+            if reached or len(match_ids) < PAGE_SIZE:
+                self.progress.save_catch_up(puuid, self.filter_key, None, pending_head)
+                return added
+            start += len(match_ids)
+            self.progress.save_catch_up(puuid, self.filter_key, start, pending_head)
+
+    async def _run_summoner(self, riot_id):
+        async with self.summoner_slots:
+            try:
+                await self.backfill_summoner(riot_id)
+            except Exception as e:
+                self.failed += 1
+                print(f"[{riot_id}] 백필 중 오류 발생 (다시 실행하면 이어서 진행):", e)
+
+    async def run(self, riot_ids):
+        self.download_slots = asyncio.Semaphore(self.concurrency)
+        self.summoner_slots = asyncio.Semaphore(self.summoner_concurrency)
+        started = time.monotonic()
+        try:
+            await asyncio.gather(*(self._run_summoner(riot_id) for riot_id in riot_ids))
+        finally:
+            self.executor.shutdown(wait=False)
+        elapsed = time.monotonic() - started
+        rate = self.downloaded / elapsed if elapsed > 0 else 0
+        print(
+            f"백필 종료: 소환사 {len(riot_ids)}명, 경기 {self.downloaded}개 저장 "
+            f"({elapsed:.1f}초, 초당 {rate:.1f}개), 건너뜀 {self.skipped}개, 실패한 소환사 {self.failed}명"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="모니터링 대상 소환사들의 지난 경기 백필")
+    parser.add_argument("riot_ids", nargs="*", help="백필할 Riot ID (없으면 모니터링 대상 전체)")
+    parser.add_argument("--queue", type=int, default=None, help="큐 ID (예: 420 개인 랭크, 440 자유 랭크)")
+    parser.add_argument("--since", default=None, help="이 시각 이후 경기만 (YYYY-MM-DD 또는 30d)")
+    parser.add_argument("--until", default=None, help="이 시각 이전 경기만 (YYYY-MM-DD 또는 30d)")
+    parser.add_argument("--max-matches", type=int, default=None, help="소환사당 최대로 확인할 경기 수")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY, help="동시에 받을 경기 수")
+    parser.add_argument("--restart", action="store_true", help="저장된 진행 위치를 지우고 처음부터 다시")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    riot_ids = args.riot_ids
+    if not riot_ids:
+        from multi_monitor import load_summoner_names
+        riot_ids = load_summoner_names()
+    riot_ids = [riot_id for riot_id in riot_ids if "#" in riot_id]
+    if not riot_ids:
+        print("백필할 소환사가 없습니다.")
+        return
+
+    backfill = Backfill(
+        queue=args.queue, start_time=parse_time(args.since), end_time=parse_time(args.until),
+        max_matches=args.max_matches, concurrency=args.concurrency, state_store=open_state_store(),
+        filter_key=f"queue={args.queue};since={args.since};until={args.until}",
+    )
+    if args.restart:
+        backfill.progress.reset(backfill.filter_key)
+    print(f"백필 시작: 소환사 {len(riot_ids)}명 ({backfill.filter_key})")
+    asyncio.run(backfill.run(riot_ids))
+
+
+if __name__ == "__main__":
+    main()
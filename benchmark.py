@@ -0,0 +1,293 @@
+"""
+모의 Riot API 서버(mock_riot_server.py)를 상대로 다중 소환사 모니터를 돌려서
+모니터링 인원 수에 따른 성능을 측정합니다.
+
+측정 항목:
+  - 감지한 이벤트(게임 시작/종료)당 Riot API 요청 수
+  - 감지 지연: 실제 게임 시작/종료 시각 → 알림을 대기열에 넣은 시각 (p50/p99)
+  - 폴링 1회(소환사 한 명 처리) 소요 시간 (p50/p99)
+  - 메모리 (tracemalloc 최대값, 프로세스 최대 RSS)
+  - 놓친 이벤트, 중복 이벤트 수
+
+사용 예:
+  python benchmark.py --sizes 10,100,1000 --duration 300
+  python benchmark.py --sizes 100 --party-size 3 --latency-ms 80 --error-429-rate 0.01
+
+인원 수마다 모의 서버와 모니터를 각각 새 프로세스로 띄워서 서로 영향을 주지 않게 합니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 모의 서버로 그대로 넘기는 옵션
+SERVER_OPTIONS = [
+    "party_size", "game_min", "game_max", "gap_min", "gap_max", "match_delay", "game_clock_offset",
+    "app_limit", "latency_ms", "latency_jitter_ms", "error_429_rate", "error_5xx_rate",
+    "outage_at", "outage_duration", "seed",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.load(resp)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def score(events, games, started, ended, grace):
+    """
+    기록된 알림 이벤트를 모의 서버의 실제 게임 일정과 비교해서 감지 지연, 놓친/중복 이벤트를 계산합니다.
+    측정 시작 전에 시작한 게임의 시작 이벤트나, 측정 종료 grace초 전 이후의 이벤트는 채점에서 뺍니다.
+    """
+    first_seen = {}
+    duplicates = 0
+    for key, at in events:
+        if key in first_seen:
+            duplicates += 1
+        else:
+            first_seen[key] = at
+
+    latencies = {"start": [], "end": []}
+    expected = missed = 0
+    for game in games:
+        for puuid in game["puuids"]:
+            riot_id = puuid_to_riot_id(puuid)
+            for event, truth in (("start", game["start"]), ("end", game["end"])):
+                if not (started <= truth <= ended - grace):
+                    continue
+                expected += 1
+                at = first_seen.get((riot_id, game["gameId"], event))
+                if at is None:
+                    missed += 1
+                else:
+                    latencies[event].append(at - truth)
+    return latencies, expected, missed, duplicates
+
+
+def puuid_to_riot_id(puuid, prefix="bench"):
+    return f"{prefix}{int(puuid.rsplit('-', 1)[1])}#KR1"
+
+
+def run_worker(args):
+    """
+    (자식 프로세스) 모니터를 duration초 동안 돌리고 결과를 args.result_file에 JSON으로 씁니다.
+    """
+    tracemalloc.start()
+    from multi_monitor import MultiMonitor
+    from notifier import Outbox
+
+    class RecordingOutbox(Outbox):
+        """
+        전송하지 않고 (키, 시각)만 기록합니다. 중복 여부를 채점하기 위해 중복 제거도 하지 않습니다.
+        """
+
+        def __init__(self):
+            super().__init__(transport=None)
+            self.events = []
+
+        def enqueue(self, key, text, event_at=None, trace=None):
+            self.events.append((key, time.time()))
+            return True
+
+    class BenchMonitor(MultiMonitor):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.cycle_times = []
+
+        async def poll_and_reschedule(self, state):
+            t = time.perf_counter()
+            try:
+                await super().poll_and_reschedule(state)
+            finally:
+                self.cycle_times.append(time.perf_counter() - t)
+
+    riot_ids = [f"bench{i}#KR1" for i in range(args.summoners)]
+    outbox = RecordingOutbox()
+    monitor = BenchMonitor(riot_ids, outbox=outbox)
+
+    async def main():
+        try:
+            await asyncio.wait_for(monitor.run(), args.duration)
+        except asyncio.TimeoutError:
+            pass
+
+    started = time.time()
+    asyncio.run(main())
+    ended = time.time()
+    monitor.executor.shutdown(wait=False, cancel_futures=True)
+    _, peak = tracemalloc.get_traced_memory()
+    try:
+        import resource
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        max_rss_mb = None
+
+    server = f"http://127.0.0.1:{args.port}"
+    games = fetch_json(f"{server}/__games")
+    stats = fetch_json(f"{server}/__stats")
+    riot_requests = sum(
+        count for key, count in stats["requests"].items()
+        if not key.startswith("ddragon") and not key.startswith("unknown")
+    )
+    throttled = sum(count for key, count in stats["requests"].items() if key.endswith(" 429"))
+    latencies, expected, missed, duplicates = score(outbox.events, games, started, ended, args.grace)
+    detected = len({key for key, _ in outbox.events})
+
+    result = {
+        "summoners": args.summoners,
+        "duration": round(ended - started, 1),
+        "riot_requests": riot_requests,
+        "throttled_429": throttled,
+        "events_detected": detected,
+        "events_expected": expected,
+        "events_missed": missed,
+        "events_duplicated": duplicates,
+        "requests_per_event": round(riot_requests / detected, 2) if detected else None,
+        "start_latency_p50": percentile(latencies["start"], 50),
+        "start_latency_p99": percentile(latencies["start"], 99),
+        "end_latency_p50": percentile(latencies["end"], 50),
+        "end_latency_p99": percentile(latencies["end"], 99),
+        "poll_cycle_p50_ms": (percentile(monitor.cycle_times, 50) or 0) * 1000,
+        "poll_cycle_p99_ms": (percentile(monitor.cycle_times, 99) or 0) * 1000,
+        "tracemalloc_peak_mb": round(peak / 1024 / 1024, 2),
+        "max_rss_mb": round(max_rss_mb, 1) if max_rss_mb else None,
+    }
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def run_size(args, size, workdir):
+    port = free_port()
+    server_cmd = [sys.executable, os.path.join(BASE_DIR, "mock_riot_server.py"),
+                  "--port", str(port), "--summoners", str(size)]
+    for option in SERVER_OPTIONS:
+        value = getattr(args, option)
+        if value is not None:
+            server_cmd += ["--" + option.replace("_", "-"), str(value)]
+    server = subprocess.Popen(server_cmd, stdout=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                fetch_json(f"http://127.0.0.1:{port}/__stats")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        result_file = os.path.join(workdir, f"result_{size}.json")
+        env = dict(os.environ)
+        env.update({
+            "RIOT_API_KEY": "mock",
+            "RIOT_API_BASE_URL": f"http://127.0.0.1:{port}/{{host}}",
+            "DDRAGON_URL": f"http://127.0.0.1:{port}/ddragon",
+            "CACHE_DIR": os.path.join(workdir, f"cache_{size}"),
+            "NOTIFY_TRANSPORT": "stdout",
+        })
+        worker_cmd = [sys.executable, os.path.abspath(__file__), "--worker",
+                      "--port", str(port), "--summoners", str(size), "--duration", str(args.duration),
+                      "--grace", str(args.grace), "--result-file", result_file]
+        subprocess.run(worker_cmd, env=env, stdout=subprocess.DEVNULL if not args.verbose else None, check=True)
+        with open(result_file, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def print_table(results):
+    columns = [
+        ("summoners", "인원"), ("riot_requests", "요청"), ("throttled_429", "429"),
+        ("events_detected", "이벤트"), ("events_missed", "놓침"), ("events_duplicated", "중복"),
+        ("requests_per_event", "요청/이벤트"),
+        ("start_latency_p50", "시작p50(s)"), ("start_latency_p99", "시작p99(s)"),
+        ("end_latency_p50", "종료p50(s)"), ("end_latency_p99", "종료p99(s)"),
+        ("poll_cycle_p50_ms", "폴링p50(ms)"), ("poll_cycle_p99_ms", "폴링p99(ms)"),
+        ("tracemalloc_peak_mb", "메모리(MB)"),
+    ]
+    rows = [[title for _, title in columns]]
+    for result in results:
+        rows.append([format_value(result.get(key)) for key, _ in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="모의 Riot API 서버 기반 모니터 벤치마크")
+    parser.add_argument("--sizes", default="10,100,1000", help="측정할 모니터링 인원 수 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=300, help="인원 수마다 측정할 시간(초)")
+    parser.add_argument("--grace", type=float, default=60,
+                        help="측정 종료 직전 이 시간(초) 안에 일어난 이벤트는 채점하지 않음")
+    parser.add_argument("--json", action="store_true", help="표 대신 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="모니터 출력을 그대로 보여줌")
+    parser.add_argument("--party-size", type=int, default=None)
+    parser.add_argument("--game-min", type=float, default=120)
+    parser.add_argument("--game-max", type=float, default=240)
+    parser.add_argument("--gap-min", type=float, default=20)
+    parser.add_argument("--gap-max", type=float, default=60)
+    parser.add_argument("--match-delay", type=float, default=None)
+    parser.add_argument("--game-clock-offset", type=float, default=None)
+    parser.add_argument("--app-limit", default=None)
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--latency-jitter-ms", type=float, default=None)
+    parser.add_argument("--error-429-rate", type=float, default=None)
+    parser.add_argument("--error-5xx-rate", type=float, default=None)
+    parser.add_argument("--outage-at", type=float, default=None)
+    parser.add_argument("--outage-duration", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    # 내부용 (자식 프로세스)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--summoners", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="koalarm-bench-") as workdir:
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            print(f"측정 중: 소환사 {size}명, {args.duration}초", file=sys.stderr)
+            results.append(run_size(args, size, workdir))
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
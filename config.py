@@ -7,6 +7,8 @@ if not RIOT_API_KEY:
 
 RIOT_REGION = os.environ.get("RIOT_REGION", "asia")
 RIOT_SUMMONER_REGION = os.environ.get("RIOT_SUMMONER_REGION", "kr")
+# 경기 정보(match-v5) 지역. 소환사의 플랫폼으로 지역을 알 수 없을 때만 씁니다 (routing.py)
+RIOT_MATCH_REGION = os.environ.get("RIOT_MATCH_REGION", "asia")
 
 # 소환사 이름 (예: "이름#태그")
 SUMMONER_NAME = os.environ.get("SUMMONER_NAME","t1smash#KR3")
@@ -16,4 +18,124 @@ if not SUMMONER_NAME:
 # 카카오톡 관련 설정: 오픈톡방 이름
 KAKAO_OPENTALK_NAME = os.environ.get("KAKAO_OPENTALK_NAME","단체방이름")
 if not KAKAO_OPENTALK_NAME:
-    raise EnvironmentError("KAKAO_OPENTALK_NAME 환경변수가 설정되어 있지 않습니다.") 
\ No newline at end of file
+    raise EnvironmentError("KAKAO_OPENTALK_NAME 환경변수가 설정되어 있지 않습니다.") 
+# 다중 소환사 모니터링 설정 (multi_monitor.py)
+# SUMMONER_NAMES: 쉼표로 구분한 Riot ID 목록 (예: "이름1#태그1,이름2#태그2")
+# SUMMONER_LIST_FILE: 한 줄에 Riot ID 하나씩 적은 파일 경로 (#으로 시작하는 줄은 주석)
+SUMMONER_NAMES = os.environ.get("SUMMONER_NAMES", "")
+SUMMONER_LIST_FILE = os.environ.get("SUMMONER_LIST_FILE", "")
+POLL_INTERVAL = float(os.environ.get("POLL_INTERVAL", "15"))
+# 동시에 진행할 Riot API 호출 수 (스레드 풀 크기)
+MONITOR_CONCURRENCY = int(os.environ.get("MONITOR_CONCURRENCY", "32"))
+# 소환사 한 명의 한 번 폴링에 허용하는 최대 시간(초). 초과하면 해당 소환사만 이번 주기를 건너뜁니다.
+POLL_TIMEOUT = float(os.environ.get("POLL_TIMEOUT", "30"))
+# 실행 중 목록 변경 (watchlist.py)
+# SUMMONER_LIST_FILE이 바뀌었는지 WATCHLIST_CHECK_INTERVAL초마다 확인해서, 추가/제거된 소환사만 반영합니다.
+WATCHLIST_CHECK_INTERVAL = float(os.environ.get("WATCHLIST_CHECK_INTERVAL", "5"))
+# 목록을 바꾸는 제어 소켓 주소 ("호스트:포트" 또는 "unix:/경로"). 비어 있으면 열지 않습니다.
+CONTROL_SOCKET = os.environ.get("CONTROL_SOCKET", "")
+# 실행 중에 추가된 소환사의 puuid 조회: 한 번에 RESOLVE_BATCH_SIZE명씩, 초당 RESOLVE_RATE명 이하로
+RESOLVE_BATCH_SIZE = int(os.environ.get("RESOLVE_BATCH_SIZE", "10"))
+RESOLVE_RATE = float(os.environ.get("RESOLVE_RATE", "5"))
+
+# Riot API 클라이언트 설정 (riot_client.py)
+# 응답 헤더를 받기 전까지 사용할 앱 레이트 리밋 기본값 ("횟수:초" 쉼표 구분, 개발용 키 기준)
+RIOT_APP_RATE_LIMIT = os.environ.get("RIOT_APP_RATE_LIMIT", "20:1,100:120")
+# 429 응답 시 최대 재시도 횟수
+RIOT_MAX_RETRIES = int(os.environ.get("RIOT_MAX_RETRIES", "3"))
+# 대기 중인 소환사의 폴링 요청이 레이트 리밋 때문에 이 시간(초)보다 오래 기다려야 하면 다음 폴링으로 미룹니다.
+# (한도가 빠듯할 때 게임 시작/종료 처리 요청이 먼저 나가도록)
+RIOT_IDLE_MAX_WAIT = float(os.environ.get("RIOT_IDLE_MAX_WAIT", "5"))
+# 회로 차단기: 같은 지역의 같은 엔드포인트가 RIOT_BREAKER_THRESHOLD번 연속 실패(연결 오류, 시간 초과, 5xx)하면
+# RIOT_BREAKER_RESET초 동안 요청을 보내지 않고 바로 실패합니다. 그 뒤 시험 요청이 또 실패하면 두 배씩 RIOT_BREAKER_MAX_RESET초까지 늘립니다.
+RIOT_BREAKER_THRESHOLD = int(os.environ.get("RIOT_BREAKER_THRESHOLD", "5"))
+RIOT_BREAKER_RESET = float(os.environ.get("RIOT_BREAKER_RESET", "30"))
+RIOT_BREAKER_MAX_RESET = float(os.environ.get("RIOT_BREAKER_MAX_RESET", "300"))
+# Riot API 주소 템플릿. {host}에 라우팅 값(kr, asia 등)이 들어갑니다.
+# 로컬 모의 서버(mock_riot_server.py)를 쓸 때는 예: http://127.0.0.1:8089/{host}
+RIOT_API_BASE_URL = os.environ.get("RIOT_API_BASE_URL", "https://{host}.api.riotgames.com")
+
+# 로컬 캐시 디렉터리 (Data Dragon 챔피언 데이터 등)
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+# Data Dragon 주소 (모의 서버 예: http://127.0.0.1:8089/ddragon)
+DDRAGON_URL = os.environ.get("DDRAGON_URL", "https://ddragon.leagueoflegends.com")
+# Data Dragon 최신 패치 확인 주기(초)
+DDRAGON_CHECK_INTERVAL = int(os.environ.get("DDRAGON_CHECK_INTERVAL", str(6 * 3600)))
+
+# 리그(티어/승패) 정보 캐시 유지 시간(초). 게임 시작 시 티어와 승률을 한 번의 조회로 처리합니다.
+LEAGUE_CACHE_TTL = float(os.environ.get("LEAGUE_CACHE_TTL", "120"))
+# 메모리에 유지할 경기 상세 정보 수 (나머지는 CACHE_DIR/matches.sqlite3 에서 읽음)
+MATCH_MEMORY_CACHE_SIZE = int(os.environ.get("MATCH_MEMORY_CACHE_SIZE", "32"))
+
+# 적응형 폴링 설정 (scheduler.py). POLL_INTERVAL이 가장 짧은 폴링 간격입니다.
+# 대기 중인 소환사는 폴링할 때마다 POLL_IDLE_BACKOFF배씩 간격을 늘려 POLL_IDLE_MAX초까지 늘립니다.
+POLL_IDLE_MAX = float(os.environ.get("POLL_IDLE_MAX", "60"))
+POLL_IDLE_BACKOFF = float(os.environ.get("POLL_IDLE_BACKOFF", "1.5"))
+# 폴링 간격에 더하는 무작위 비율 (0.1 = ±10%)
+POLL_JITTER = float(os.environ.get("POLL_JITTER", "0.1"))
+
+# 게임이 끝난 뒤 경기 결과(match-v5의 "{플랫폼}_{gameId}" 경기)가 공개되기를 기다리는 설정.
+# 첫 확인은 종료 감지 MATCH_RESULT_DELAY초 뒤, 이후 두 배씩 MATCH_RESULT_MAX_DELAY초까지 늘려가며 확인하고,
+# MATCH_RESULT_TIMEOUT초가 지나도 공개되지 않으면 결과 없이 종료 알림을 보냅니다.
+MATCH_RESULT_DELAY = float(os.environ.get("MATCH_RESULT_DELAY", "10"))
+MATCH_RESULT_MAX_DELAY = float(os.environ.get("MATCH_RESULT_MAX_DELAY", "60"))
+MATCH_RESULT_TIMEOUT = float(os.environ.get("MATCH_RESULT_TIMEOUT", "900"))
+
+# 알림 전송 설정 (notifier.py)
+# NOTIFY_TRANSPORT: kakao(카카오톡, Windows 전용) / stdout / file / webhook
+NOTIFY_TRANSPORT = os.environ.get("NOTIFY_TRANSPORT", "kakao")
+NOTIFY_FILE = os.environ.get("NOTIFY_FILE", "notifications.jsonl")
+NOTIFY_WEBHOOK_URL = os.environ.get("NOTIFY_WEBHOOK_URL", "")
+NOTIFY_MAX_RETRIES = int(os.environ.get("NOTIFY_MAX_RETRIES", "3"))
+# 한 번에 묶어서 보낼 최대 메시지 수
+NOTIFY_BATCH_SIZE = int(os.environ.get("NOTIFY_BATCH_SIZE", "10"))
+
+# 지표(metrics.py) 설정. 둘 다 비어 있으면 지표를 밖으로 내보내지 않습니다.
+# METRICS_PORT: Prometheus 형식 /metrics 엔드포인트 포트 (127.0.0.1에서만 열림, 0이면 사용 안 함)
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+# METRICS_FILE: Prometheus 텍스트 형식으로 주기적으로 저장할 파일 경로 (node_exporter textfile collector 등)
+METRICS_FILE = os.environ.get("METRICS_FILE", "")
+METRICS_FILE_INTERVAL = float(os.environ.get("METRICS_FILE_INTERVAL", "15"))
+
+# 알림 지연 SLO(slo.py) 설정
+# SLO_WINDOW: 감지/전송 지연 p50/p95/p99를 계산할 최근 구간(초)
+SLO_WINDOW = float(os.environ.get("SLO_WINDOW", "3600"))
+# SLO_TRACE_LOG: 알림마다 Riot 이벤트 시각, 감지/메시지 작성/대기열/전송 시각을 한 줄에 JSON 하나씩 남길 파일 (비우면 남기지 않음)
+SLO_TRACE_LOG = os.environ.get("SLO_TRACE_LOG", "")
+
+# 프로파일링 모드(profiler.py, python start.py profile) 설정
+# PROFILE_DIR: 폴링별 cProfile 통계 / 플레임 그래프용 접힌 스택 / tracemalloc 메모리 차이를 저장할 디렉터리
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profile")
+# PROFILE_EVERY: 몇 번의 폴링마다 한 번 프로파일할지 (1이면 매번)
+PROFILE_EVERY = int(os.environ.get("PROFILE_EVERY", "1"))
+# PROFILE_SLOW_SECONDS: 이보다 오래 걸린 폴링은 riot_api 함수별 시간과 함께 느린 폴링으로 출력
+PROFILE_SLOW_SECONDS = float(os.environ.get("PROFILE_SLOW_SECONDS", "1"))
+# PROFILE_TOP: 메모리 차이 파일과 느린 폴링 출력에 남길 상위 항목 수
+PROFILE_TOP = int(os.environ.get("PROFILE_TOP", "25"))
+
+# 전적 백필(backfill.py) 설정
+# 동시에 받을 경기 상세 수 (레이트 리밋은 Riot API 클라이언트가 지킴)
+BACKFILL_CONCURRENCY = int(os.environ.get("BACKFILL_CONCURRENCY", "16"))
+# 동시에 경기 ID 목록을 넘겨 볼 소환사 수
+BACKFILL_SUMMONER_CONCURRENCY = int(os.environ.get("BACKFILL_SUMMONER_CONCURRENCY", "8"))
+
+# 최근 전적(analytics.py)에 쓸 최근 경기 수. 로컬 경기 저장소에 쌓인 경기로만 계산합니다.
+ANALYTICS_RECENT_GAMES = int(os.environ.get("ANALYTICS_RECENT_GAMES", "20"))
+if ANALYTICS_RECENT_GAMES < 1:
+    raise EnvironmentError("ANALYTICS_RECENT_GAMES는 1 이상이어야 합니다.")
+
+# 모니터 상태 저장소(state_store.py) 경로. Riot ID → puuid, 진행 중인 게임, 마지막으로 처리한 경기와 알림을 저장해서
+# 재시작해도 API 호출 없이 바로 이어서 감시합니다. 비워 두면 저장하지 않습니다.
+STATE_DB = os.environ.get("STATE_DB", os.path.join(CACHE_DIR, "state.sqlite3"))
+
+# 샤딩 모드(sharding.py, rate_coordinator.py) 설정. 소환사 목록을 여러 워커 프로세스(여러 호스트 가능)에 나눠 감시하고,
+# 같은 API 키의 레이트 리밋은 코디네이터 프로세스 하나가 모든 워커에 나눠 줍니다.
+# SHARD_COORDINATOR: 코디네이터 주소 ("호스트:포트" 또는 "unix:/경로"). 설정하면 모든 Riot API 호출이 이 코디네이터의 한도를 씁니다.
+SHARD_COORDINATOR = os.environ.get("SHARD_COORDINATOR", "")
+# 워커 이름 (비우면 "호스트명-pid")
+SHARD_WORKER_ID = os.environ.get("SHARD_WORKER_ID", "")
+# 워커가 코디네이터에 살아 있다고 알리는 주기(초)와, 이 시간 동안 소식이 없으면 빠진 것으로 보는 시간(초)
+SHARD_HEARTBEAT_INTERVAL = float(os.environ.get("SHARD_HEARTBEAT_INTERVAL", "5"))
+SHARD_WORKER_TTL = float(os.environ.get("SHARD_WORKER_TTL", "20"))
+# 일관된 해싱 링에서 워커 하나가 차지하는 가상 노드 수 (많을수록 고르게 나뉨)
+SHARD_VIRTUAL_NODES = int(os.environ.get("SHARD_VIRTUAL_NODES", "64"))
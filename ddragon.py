@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+from metrics import CHAMPION_DATA_STALE
+
+
+def version_key(version):
+    """
+    "15.3.1" → (15, 3, 1). 숫자가 아닌 버전(예: lolpatch_3.7)은 가장 낮게 취급합니다.
+    """
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        return ()
+
+
+class ChampionCache:
+    """
+    Data Dragon 챔피언 데이터(key → 한국어 이름)의 버전별 디스크 캐시.
+
+    - 시작할 때는 디스크에 저장된 가장 최신 버전을 네트워크 없이 불러옵니다.
+    - 백그라운드 스레드가 versions.json으로 최신 패치를 확인하고, 새 버전이 나오면
+      champion.json을 받아 {cache_dir}/champion_{버전}_{로케일}.json 으로 저장한 뒤 교체합니다.
+    - 갱신에 실패하면 기존 데이터를 그대로 쓰면서 간격을 늘려가며 재시도합니다
+      (빈 매핑을 영구히 캐시하지 않습니다).
+    """
+
+    def __init__(self, cache_dir, locale="ko_KR", check_interval=6 * 3600, retry_max=3600,
+                 base_url="https://ddragon.leagueoflegends.com"):
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.locale = locale
+        self.check_interval = check_interval
+        self.retry_max = retry_max
+        self.version = None
+        self.mapping = {}
+        self.lock = threading.Lock()
+        # 처음 get_mapping()을 여러 스레드가 동시에 불러도 첫 갱신과 백그라운드 스레드 시작은 한 번만
+        self.init_lock = threading.Lock()
+        self.refresher = None
+        # 마지막 갱신에 실패해서 예전 버전(디스크 캐시)을 쓰고 있으면 True
+        self.stale = False
+        self.load_from_disk()
+
+    def cache_path(self, version):
+        return os.path.join(self.cache_dir, f"champion_{version}_{self.locale}.json")
+
+    def cached_versions(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        prefix, suffix = "champion_", f"_{self.locale}.json"
+        versions = [
+            name[len(prefix):-len(suffix)]
+            for name in os.listdir(self.cache_dir)
+            if name.startswith(prefix) and name.endswith(suffix)
+        ]
+        return sorted(versions, key=version_key, reverse=True)
+
+    def load_from_disk(self):
+        """
+        디스크에 있는 가장 최신 버전의 매핑을 불러옵니다. 불러오면 True.
+        """
+        for version in self.cached_versions():
+            try:
+                with open(self.cache_path(version), encoding="utf-8") as f:
+                    mapping = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"챔피언 캐시 파일 로드 실패 ({version}):", e)
+                continue
+            if mapping:
+                self.version, self.mapping = version, mapping
+                return True
+        return False
+
+    def save_to_disk(self, version, mapping):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.cache_path(version)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(mapping, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def latest_version(self):
+        resp = requests.get(f"{self.base_url}/api/versions.json", timeout=5)
+        resp.raise_for_status()
+        return resp.json()[0]
+
+    def download(self, version):
+        url = f"{self.base_url}/cdn/{version}/data/{self.locale}/champion.json"
+        resp = requests.get(url, timeout=5)
+        resp.raise_for_status()
+        data = resp.json()
+        # 챔피언의 key(문자열)와 한국어 이름 매핑 생성
+        return {champ["key"]: champ["name"] for champ in data.get("data", {}).values()}
+
+    def refresh(self):
+        """
+        최신 패치 버전을 확인해서 새 버전이면 받아서 저장하고 교체합니다.
+        실패하면 예외를 그대로 올려 보냅니다.
+        """
+        version = self.latest_version()
+        if version == self.version and self.mapping:
+            return False
+        mapping = self.load_version(version)
+        if not mapping:
+            raise ValueError(f"챔피언 데이터가 비어 있습니다 ({version})")
+        with self.lock:
+            self.version, self.mapping = version, mapping
+        print(f"챔피언 데이터 갱신: {version} ({len(mapping)}개)")
+        return True
+
+    def load_version(self, version):
+        """
+        특정 버전의 매핑을 디스크에서 읽거나, 없으면 받아서 디스크에 저장합니다.
+        """
+        path = self.cache_path(version)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        mapping = self.download(version)
+        if mapping:
+            self.save_to_disk(version, mapping)
+        return mapping
+
+    def _refresh_loop(self, wait_first=False):
+        backoff = 30
+        if wait_first:
+            # 방금 갱신했으면 다음 확인까지 기다렸다가 시작
+            time.sleep(self.check_interval)
+        while True:
+            try:
+                self.refresh()
+                self.stale = False
+                backoff = 30
+                time.sleep(self.check_interval)
+            except Exception as e:
+                self.stale = True
+                print(f"챔피언 데이터 갱신 중 오류 발생 ({backoff}초 후 재시도, 버전 {self.version} 사용):", e)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.retry_max)
+
+    def export_metrics(self):
+        """
+        예전 버전을 쓰고 있는지(stale)를 지표 게이지에 채웁니다. metrics.METRICS.add_collector()로 등록해서 씁니다.
+        """
+        CHAMPION_DATA_STALE.set(value=int(self.stale))
+
+    def start_background_refresh(self, wait_first=False):
+        with self.lock:
+            if self.refresher is None:
+                self.refresher = threading.Thread(
+                    target=self._refresh_loop, args=(wait_first,), name="ddragon-refresh", daemon=True
+                )
+                self.refresher.start()
+
+    def get_mapping(self):
+        """
+        현재 매핑을 반환합니다. 처음 호출될 때 백그라운드 갱신을 시작하고,
+        디스크 캐시가 전혀 없으면 한 번은 바로 받아 봅니다 (실패해도 백그라운드에서 재시도).
+        """
+        if self.refresher is None:
+            with self.init_lock:
+                # 기다리는 동안 다른 스레드가 이미 시작했으면 그대로 씀
+                if self.refresher is None:
+                    refreshed = False
+                    if not self.mapping:
+                        try:
+                            refreshed = self.refresh()
+                        except Exception as e:
+                            self.stale = True
+                            print("챔피언 데이터 로드 중 오류 발생:", e)
+                    self.start_background_refresh(wait_first=refreshed)
+        return self.mapping
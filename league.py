@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import NamedTuple
+
+# 티어 영어명을 한글로 매핑
+TIER_MAPPING = {
+    "IRON": "아이언",
+    "BRONZE": "브론즈",
+    "SILVER": "실버",
+    "GOLD": "골드",
+    "PLATINUM": "플래티넘",
+    "DIAMOND": "다이아몬드",
+    "MASTER": "마스터",
+    "GRANDMASTER": "그랜드마스터",
+    "CHALLENGER": "챌린저"
+}
+
+
+class LeagueEntry(NamedTuple):
+    """
+    솔로 랭크(RANKED_SOLO_5x5) 리그 정보 한 건.
+    티어 정보가 없는 소환사는 tier가 빈 문자열입니다.
+    stale은 이번 조회에 실패해서 예전에 받아 둔 정보(또는 빈 정보)로 대신했다는 표시입니다.
+    """
+    tier: str = ""
+    rank: str = ""
+    league_points: int = 0
+    wins: int = 0
+    losses: int = 0
+    stale: bool = False
+
+    @property
+    def total_games(self):
+        return self.wins + self.losses
+
+    @property
+    def win_rate(self):
+        total = self.total_games
+        return round(self.wins * 100 / total, 2) if total > 0 else 0
+
+    def tier_text(self):
+        """
+        "실버4 37포인트" 형식의 티어 문자열. 티어 정보가 없으면 "티어 정보 없음".
+        """
+        if not self.tier:
+            return "티어 정보를 불러오지 못함" if self.stale else "티어 정보 없음"
+        tier_kor = TIER_MAPPING.get(self.tier.upper(), self.tier)
+        text = f"{tier_kor}{self.rank} {self.league_points}포인트"
+        return f"{text} (이전 정보)" if self.stale else text
+
+    def overall_stats(self):
+        """
+        (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률) — get_overall_game_stats()의 반환 형식.
+        """
+        return self.total_games, self.wins, self.losses, self.win_rate
+
+
+EMPTY_LEAGUE_ENTRY = LeagueEntry()
+# 조회에 실패했고 예전에 받아 둔 정보도 없을 때
+UNAVAILABLE_LEAGUE_ENTRY = LeagueEntry(stale=True)
+
+
+def parse_league_entries(entries):
+    """
+    league-v4 entries 응답(list)에서 솔로 랭크 정보를 LeagueEntry로 변환합니다.
+    """
+    for entry in entries:
+        if entry.get("queueType") == "RANKED_SOLO_5x5":
+            return LeagueEntry(
+                tier=entry.get("tier", ""),
+                rank=entry.get("rank", ""),
+                league_points=entry.get("leaguePoints", 0),
+                wins=entry.get("wins", 0),
+                losses=entry.get("losses", 0),
+            )
+    return EMPTY_LEAGUE_ENTRY
+
+
+class LeagueCache:
+    """
+    (플랫폼, summonerId)별 LeagueEntry를 ttl초 동안 캐시합니다.
+    같은 키를 여러 스레드가 동시에 요청하면 한 번만 조회하고 결과를 나눠 씁니다.
+    만료된 항목도 지우지 않고 두었다가, 다시 조회하다 실패하면 그 값을 stale로 표시해서 돌려줍니다.
+    clock은 만료 시각 계산에 쓰는 시계입니다 (시뮬레이터는 가상 시계를 넣음).
+    """
+
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+
+    def get(self, platform, summoner_id, loader):
+        key = (platform, summoner_id)
+        while True:
+            with self.lock:
+                cached = self.entries.get(key)
+                if cached and cached[0] > self.clock():
+                    return cached[1]
+                event = self.inflight.get(key)
+                if event is None:
+                    event = self.inflight[key] = threading.Event()
+                    break
+            # 다른 스레드가 조회 중이면 끝날 때까지 기다렸다가 캐시를 다시 확인
+            event.wait()
+
+        try:
+            entry = loader(platform, summoner_id)
+            with self.lock:
+                self.entries[key] = (self.clock() + self.ttl, entry)
+            return entry
+        except Exception as e:
+            if not cached:
+                raise
+            print(f"리그 정보 조회 실패, 이전 정보 사용 ({summoner_id}):", e)
+            return cached[1]._replace(stale=True)
+        finally:
+            with self.lock:
+                del self.inflight[key]
+            event.set()
+
+    def invalidate(self, platform, summoner_id):
+        with self.lock:
+            self.entries.pop((platform, summoner_id), None)
@@ -0,0 +1,189 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class MatchStore:
+    """
+    match-v5 경기 상세 응답을 matchId로 저장하는 로컬 저장소.
+
+    - 디스크: SQLite 한 파일에 응답 원문(JSON 바이트)을 zlib으로 압축해서 저장합니다.
+    - 메모리: 최근에 읽은 경기(decode로 읽은 값)를 최대 memory_size개까지 LRU로 유지합니다.
+      decode는 응답 원문(bytes)을 받는 함수로, 기본값은 json.loads(dict 전체)입니다.
+
+    - 참가자 색인: index_rows가 주어지면 경기를 저장할 때 참가자별 한 줄 요약
+      (puuid, 승리, 킬, 데스, 어시스트, 챔피언, 큐, 게임 시간, 종료 시각)을 match_participants 테이블에 함께 넣습니다.
+      전적 분석(analytics.py)은 경기 원문을 다시 읽지 않고 이 테이블만 읽습니다.
+
+    끝난 경기의 데이터는 바뀌지 않으므로, 한 번 받은 경기는 다시 API를 호출하지 않습니다.
+    """
+
+    def __init__(self, path, memory_size=32, decode=json.loads, index_rows=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.memory_size = memory_size
+        self.decode = decode
+        self.index_rows = index_rows
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            " match_id TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS match_participants ("
+            " puuid TEXT NOT NULL,"
+            " match_id TEXT NOT NULL,"
+            " win INTEGER NOT NULL,"
+            " kills INTEGER NOT NULL,"
+            " deaths INTEGER NOT NULL,"
+            " assists INTEGER NOT NULL,"
+            " champion_id INTEGER NOT NULL,"
+            " queue_id INTEGER NOT NULL,"
+            " duration INTEGER NOT NULL,"
+            " ended_at INTEGER NOT NULL,"
+            " PRIMARY KEY (puuid, match_id))"
+        )
+        self.conn.commit()
+        if index_rows is not None:
+            self.reindex()
+
+    def _index(self, match_id, match_data):
+        # 호출하는 쪽에서 self.lock을 잡고 있어야 함
+        rows = self.index_rows(match_data)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO match_participants"
+            " (puuid, match_id, win, kills, deaths, assists, champion_id, queue_id, duration, ended_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(row[0], match_id) + tuple(row[1:]) for row in rows]
+        )
+
+    def reindex(self):
+        """
+        참가자 색인이 없는 경기(색인을 만들기 전에 저장된 경기)를 찾아 색인을 채웁니다.
+        """
+        with self.lock:
+            match_ids = [row[0] for row in self.conn.execute(
+                "SELECT match_id FROM matches"
+                " WHERE match_id NOT IN (SELECT DISTINCT match_id FROM match_participants)"
+            )]
+        if not match_ids:
+            return
+        print(f"경기 참가자 색인 생성 중: {len(match_ids)}경기")
+        for match_id in match_ids:
+            raw = self.get_raw(match_id)
+            with self.lock:
+                self._index(match_id, self.decode(raw))
+        with self.lock:
+            self.conn.commit()
+
+    def participant_count(self, puuid):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM match_participants WHERE puuid = ?", (puuid,)
+            ).fetchone()[0]
+
+    def participant_rows(self, puuid):
+        """
+        소환사의 경기별 요약을 종료 시각 순서로 반환합니다.
+        [(win, kills, deaths, assists, champion_id, queue_id, duration, ended_at), ...]
+        """
+        with self.lock:
+            return self.conn.execute(
+                "SELECT win, kills, deaths, assists, champion_id, queue_id, duration, ended_at"
+                " FROM match_participants WHERE puuid = ? ORDER BY ended_at, match_id",
+                (puuid,)
+            ).fetchall()
+
+    def _remember(self, match_id, match_data):
+        self.memory[match_id] = match_data
+        self.memory.move_to_end(match_id)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def contains(self, match_id):
+        with self.lock:
+            if match_id in self.memory:
+                return True
+            row = self.conn.execute("SELECT 1 FROM matches WHERE match_id = ?", (match_id,)).fetchone()
+            return row is not None
+
+    def missing(self, match_ids):
+        """
+        match_ids 중 아직 저장되지 않은 ID 목록을 (원래 순서대로) 반환합니다.
+        """
+        match_ids = list(match_ids)
+        if not match_ids:
+            return []
+        placeholders = ",".join("?" * len(match_ids))
+        with self.lock:
+            stored = {
+                row[0] for row in
+                self.conn.execute(f"SELECT match_id FROM matches WHERE match_id IN ({placeholders})", match_ids)
+            }
+        return [match_id for match_id in match_ids if match_id not in stored]
+
+    def get_raw(self, match_id):
+        """
+        저장된 응답 원문(JSON 바이트)을 반환합니다. 없으면 None.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT payload FROM matches WHERE match_id = ?", (match_id,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def get(self, match_id):
+        """
+        경기 데이터를 메모리 → 디스크 순서로 찾습니다. 없으면 None.
+        """
+        with self.lock:
+            match_data = self.memory.get(match_id)
+            if match_data is not None:
+                self.memory.move_to_end(match_id)
+                return match_data
+        raw = self.get_raw(match_id)
+        if raw is None:
+            return None
+        match_data = self.decode(raw)
+        with self.lock:
+            self._remember(match_id, match_data)
+        return match_data
+
+    def put_raw(self, match_id, raw, remember=True):
+        """
+        API 응답 원문(bytes)을 그대로 압축해서 저장하고, decode로 읽은 값을 반환합니다.
+        remember=False면 메모리 LRU에는 넣지 않습니다 (전적 백필처럼 한꺼번에 많이 저장할 때).
+        """
+        match_data = self.decode(raw)
+        payload = zlib.compress(raw, 6)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO matches (match_id, payload, fetched_at) VALUES (?, ?, ?)",
+                (match_id, payload, time.time())
+            )
+            if self.index_rows is not None:
+                self._index(match_id, match_data)
+            self.conn.commit()
+            if remember:
+                self._remember(match_id, match_data)
+        return match_data
+
+    def get_or_fetch(self, match_id, fetch_raw):
+        """
+        저장소에 있으면 그대로 반환하고, 없으면 fetch_raw(match_id)로 원문을 받아 저장한 뒤 반환합니다.
+        """
+        match_data = self.get(match_id)
+        if match_data is None:
+            match_data = self.put_raw(match_id, fetch_raw(match_id))
+        return match_data
+
+    def match_ids(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT match_id FROM matches")]
@@ -0,0 +1,111 @@
+"""
+게임 시작/종료 알림 메시지 포맷팅.
+monitor_lol_game.py(단일 소환사)와 multi_monitor.py(다중 소환사)가 같은 형식을 쓰도록 분리했습니다.
+"""
+
+EMPTY_LINEUP = {
+    "탑": "~",
+    "정글": "~",
+    "미드": "~",
+    "원딜": "~",
+    "서폿": "~"
+}
+
+
+def record_url(summoner_name):
+    """
+    lol.ps 전적 페이지 주소를 반환합니다.
+    """
+    return f"https://lol.ps/summoner/{summoner_name}?region=kr"
+
+
+def format_recent_stats(recent_stats, champion):
+    """
+    get_recent_stats()의 결과(analytics.RecentStats)를 메시지 한 단락으로 만듭니다. 결과가 없으면 빈 문자열.
+    """
+    if not recent_stats:
+        return ""
+    lines = [f"[최근 {recent_stats.games}경기]"]
+    win_rate = f"승률 : {recent_stats.win_rate}%"
+    if recent_stats.previous_win_rate is not None:
+        win_rate += f" (이전 {recent_stats.games}경기 {recent_stats.previous_win_rate}%)"
+    lines.append(f"{recent_stats.wins}승 {recent_stats.losses}패 / {win_rate}")
+    lines.append(f"KDA : {recent_stats.kda}")
+    if recent_stats.streak >= 2:
+        lines.append(f"{recent_stats.streak}연승 중")
+    elif recent_stats.streak <= -2:
+        lines.append(f"{-recent_stats.streak}연패 중")
+    if recent_stats.champion_games:
+        lines.append(
+            f"{champion} : {recent_stats.champion_games}전 {recent_stats.champion_wins}승"
+            f" / 승률 : {recent_stats.champion_win_rate}% / KDA : {recent_stats.champion_kda}"
+        )
+    return "\n".join(lines) + "\n\n"
+
+
+def build_start_message(display_name, summoner_name, start_info, tier_info, overall_stats, recent_stats=None):
+    """
+    게임 시작 메시지를 만듭니다.
+    overall_stats는 get_overall_game_stats()의 반환값 (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률) 입니다.
+    recent_stats는 get_recent_stats()의 반환값으로, 있으면 최근 전적 단락을 덧붙입니다.
+    """
+    total_games, wins, losses, win_rate = overall_stats
+    game_type = start_info.get("gameType", "~")
+    team_lineup = start_info.get("teamLineup", EMPTY_LINEUP)
+    return (
+        f"[{display_name}님의 게임이 시작되었습니다.]\n"
+        f"소환사 : {summoner_name}\n"
+        f"티어 : {tier_info}\n"
+        f"게임 종류 : {game_type}\n"
+        f"게임 시간 : {start_info.get('gameTime', '~')}\n"
+        f"선택 챔피언 : {start_info.get('champion', '~')}\n\n"
+        f"[팀원 정보]\n"
+        f"팀원 1    : {team_lineup.get('탑', '~')}\n"
+        f"팀원 2    : {team_lineup.get('정글', '~')}\n"
+        f"팀원 3    : {team_lineup.get('미드', '~')}\n"
+        f"팀원 4    : {team_lineup.get('원딜', '~')}\n"
+        f"팀원 5    : {team_lineup.get('서폿', '~')}\n\n"
+        f"[전체 게임 수]\n"
+        f"{total_games} / {wins} / {losses}\n"
+
+        f"승률 : {win_rate}%\n\n"
+        f"{format_recent_stats(recent_stats, start_info.get('champion', '~'))}"
+        f"전적 보러 가기 : {record_url(summoner_name)}"
+    )
+
+
+def build_end_message(display_name, summoner_name, finished_info, overall_stats, recent_stats=None):
+    """
+    게임 종료 메시지를 만듭니다.
+    finished_info가 없으면(경기 결과 조회 실패) 짧은 안내 메시지를 반환합니다.
+    recent_stats는 get_recent_stats()의 반환값으로, 있으면 최근 전적 단락을 덧붙입니다 (방금 끝난 경기 포함).
+    """
+    if not finished_info:
+        return f"{display_name}님의 게임이 종료되었습니다. (게임 결과를 확인할 수 없습니다.)"
+
+    total_games, wins, losses, win_rate = overall_stats
+    outcome = "승리" if finished_info.get("win") else "패배"
+    kda = f"{finished_info.get('kills')}/{finished_info.get('deaths')}/{finished_info.get('assists')}"
+    team_lineup = finished_info.get("teamLineup", EMPTY_LINEUP)
+    return (
+        f"[{display_name}님의 게임이 종료되었습니다.]\n"
+        f"소환사 : {summoner_name}\n"
+        f"결과 : {outcome}\n"
+        f"티어 : {finished_info.get('tier', '~')}\n"
+        f"게임 종류 : {finished_info.get('gameType', '~')}\n\n"
+        f"게임 시간 : {finished_info.get('gameTime', '~')}\n"
+        f"{display_name}님의 KDA : {kda}\n\n"
+        f"[팀원 정보]\n"
+        f"탑    : {team_lineup.get('탑', '~')}\n"
+        f"정글 : {team_lineup.get('정글', '~')}\n"
+        f"미드  : {team_lineup.get('미드', '~')}\n"
+        f"원딜 : {team_lineup.get('원딜', '~')}\n"
+        f"서폿 : {team_lineup.get('서폿', '~')}\n\n"
+        f"팀 총 킬 : {finished_info.get('teamTotalKills', '~')}\n"
+        f"최고 킬 플레이어 : {finished_info.get('topKiller', '~')}\n\n"
+        f"[전체 게임 수]\n"
+        f"{total_games} / {wins} / {losses}\n"
+        f"승률 : {win_rate}%\n\n"
+        f"{format_recent_stats(recent_stats, finished_info.get('champion', '~'))}"
+        f"전적 보러 가기 : {record_url(summoner_name)}"
+    )
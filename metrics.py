@@ -0,0 +1,264 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_PORT, METRICS_FILE, METRICS_FILE_INTERVAL
+
+# Riot API 응답 시간용 버킷(초)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# 폴링 1회 / 알림 지연용 버킷(초)
+LAG_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    parts = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """
+    증가만 하는 값. 레이블 값 조합마다 따로 셉니다.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for label_values, value in items:
+            yield self.name, format_labels(self.labels, label_values), value
+
+
+class Gauge(Counter):
+    """
+    현재 값. set()으로 덮어씁니다.
+    """
+
+    kind = "gauge"
+
+    def set(self, *label_values, value):
+        with self.lock:
+            self.values[label_values] = value
+
+
+class Histogram:
+    """
+    관측값 분포. Prometheus 형식대로 누적 버킷(_bucket), 합(_sum), 개수(_count)를 냅니다.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # 레이블 값 조합 → [버킷별 개수..., 합]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, *label_values, value):
+        with self.lock:
+            counts = self.values.get(label_values)
+            if counts is None:
+                counts = self.values[label_values] = [0] * len(self.buckets) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-1] += value
+
+    def samples(self):
+        with self.lock:
+            items = sorted((key, list(counts)) for key, counts in self.values.items())
+        bucket_labels = self.labels + ("le",)
+        for label_values, counts in items:
+            total = 0
+            for bound, count in zip(self.buckets, counts):
+                total += count
+                yield self.name + "_bucket", format_labels(bucket_labels, label_values + (format_value(bound),)), total
+            labels = format_labels(self.labels, label_values)
+            yield self.name + "_sum", labels, counts[-1]
+            yield self.name + "_count", labels, total
+
+
+class Registry:
+    """
+    지표 모음. render()가 Prometheus 텍스트 형식(0.0.4)으로 만들어 줍니다.
+    add_collector()로 등록한 함수는 render() 직전에 호출되어 게이지 값을 채웁니다
+    (레이트 리밋 잔여량처럼 시간이 지나면 저절로 바뀌는 값).
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def add_collector(self, collector):
+        with self.lock:
+            self.collectors.append(collector)
+
+    def remove_collector(self, collector):
+        with self.lock:
+            if collector in self.collectors:
+                self.collectors.remove(collector)
+
+    def render(self):
+        with self.lock:
+            collectors = list(self.collectors)
+            metrics = list(self.metrics)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print("지표 수집 중 오류 발생:", e)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """
+        node_exporter textfile collector 등에서 읽을 수 있도록 파일로 씁니다 (임시 파일 후 교체).
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+METRICS = Registry()
+
+RIOT_REQUEST_SECONDS = METRICS.histogram(
+    "koalarm_riot_request_seconds", "Riot API 요청 1회의 응답 시간(초)", ("method",))
+RIOT_RESPONSES = METRICS.counter(
+    "koalarm_riot_responses_total", "Riot API 응답 수 (상태 코드별)", ("method", "status"))
+RIOT_RATE_LIMITED = METRICS.counter(
+    "koalarm_riot_rate_limited_total", "Riot API 429 응답 수 (X-Rate-Limit-Type별)", ("method", "type"))
+RIOT_REQUEST_ERRORS = METRICS.counter(
+    "koalarm_riot_request_errors_total", "응답을 받지 못한 Riot API 요청 수 (타임아웃, 연결 오류 등)", ("method",))
+RIOT_BUDGET_REMAINING = METRICS.gauge(
+    "koalarm_riot_budget_remaining", "가장 빡빡한 창 기준 지금 보낼 수 있는 요청 수", ("host", "scope"))
+RIOT_THROTTLE_SECONDS = METRICS.counter(
+    "koalarm_riot_throttle_seconds_total", "레이트 리밋 때문에 요청 전에 기다린 시간(초)", ("method",))
+RIOT_DEFERRED = METRICS.counter(
+    "koalarm_riot_deferred_total", "레이트 리밋 여유가 없어 다음 주기로 미룬 낮은 우선순위 요청 수", ("method", "priority"))
+RIOT_CIRCUIT_REJECTED = METRICS.counter(
+    "koalarm_riot_circuit_rejected_total", "회로 차단기가 열려 있어 보내지 않고 바로 실패한 요청 수", ("method",))
+RIOT_CIRCUIT_STATE = METRICS.gauge(
+    "koalarm_riot_circuit_state", "회로 차단기 상태 (0: closed, 1: half_open, 2: open)", ("host", "method"))
+POLL_SECONDS = METRICS.histogram(
+    "koalarm_poll_seconds",
+    "소환사 한 명의 폴링 1회 소요 시간(초) (result: ok / error / timeout / deferred / circuit_open)", ("result",),
+    LAG_BUCKETS)
+MONITORED_SUMMONERS = METRICS.gauge(
+    "koalarm_monitored_summoners", "모니터링 중인 소환사 수", ("state",))
+GAME_EVENTS = METRICS.counter(
+    "koalarm_game_events_total", "감지한 게임 이벤트 수", ("event",))
+NOTIFY_QUEUE_SECONDS = METRICS.histogram(
+    "koalarm_notify_queue_seconds", "알림을 대기열에 넣은 뒤 전송 완료까지 걸린 시간(초)", ("event",), LAG_BUCKETS)
+EVENT_DELIVERY_LAG_SECONDS = METRICS.histogram(
+    "koalarm_event_delivery_lag_seconds", "게임 시작/종료 시각부터 알림 전송 완료까지 걸린 시간(초)", ("event",),
+    LAG_BUCKETS)
+NOTIFY_LATENCY_QUANTILE_SECONDS = METRICS.gauge(
+    "koalarm_notify_latency_quantile_seconds",
+    "최근 SLO_WINDOW초 동안 Riot 이벤트 시각부터 감지(detection) / 전송 완료(delivery)까지 걸린 시간의 분위수(초)",
+    ("region", "event", "stage", "quantile"))
+NOTIFY_DELIVERIES = METRICS.counter(
+    "koalarm_notify_deliveries_total",
+    "알림 전송 결과별 메시지 수 (result: sent / requeued(재시도를 다 써서 잠시 뒤 다시 보냄))", ("result",))
+NOTIFY_QUEUE_SIZE = METRICS.gauge(
+    "koalarm_notify_queue_size", "전송 대기 중인 알림 수")
+CHAMPION_DATA_STALE = METRICS.gauge(
+    "koalarm_champion_data_stale", "챔피언 데이터 갱신에 실패해서 예전 버전(디스크 캐시)을 쓰고 있으면 1")
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = METRICS.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_file_loop(path, interval):
+    while True:
+        try:
+            METRICS.write_file(path)
+        except OSError as e:
+            print("지표 파일 저장 중 오류 발생:", e)
+        time.sleep(interval)
+
+
+_exporter_started = False
+
+
+def start_metrics_exporter(port=METRICS_PORT, path=METRICS_FILE, interval=METRICS_FILE_INTERVAL):
+    """
+    설정에 따라 /metrics HTTP 엔드포인트(METRICS_PORT)와 지표 파일(METRICS_FILE) 저장을 백그라운드로 시작합니다.
+    둘 다 설정되지 않았으면 아무것도 하지 않습니다. 여러 번 불러도 한 번만 시작합니다.
+    """
+    global _exporter_started
+    if _exporter_started:
+        return
+    _exporter_started = True
+    if port:
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"지표 엔드포인트: http://127.0.0.1:{port}/metrics")
+    if path:
+        threading.Thread(target=_write_file_loop, args=(path, interval), name="metrics-file", daemon=True).start()
+        print(f"지표 파일: {path} ({interval}초마다 갱신)")
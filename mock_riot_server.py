@@ -0,0 +1,520 @@
+"""
+로컬 모의 Riot API 서버.
+
+fixtures/ 폴더의 응답 형식(account, spectator, match-v5, league, Data Dragon)을 바탕으로
+가상의 소환사들이 게임을 시작하고 끝내는 상황을 만들어서 응답합니다.
+지연 시간, 429, 장애 구간을 설정할 수 있어서 벤치마크(benchmark.py)나 리눅스에서의 동작 확인에 사용합니다.
+
+사용 예:
+  python mock_riot_server.py --port 8089 --summoners 100 --party-size 2 --latency-ms 50
+  set RIOT_API_BASE_URL=http://127.0.0.1:8089/{host}
+  set DDRAGON_URL=http://127.0.0.1:8089/ddragon
+
+소환사 Riot ID는 "{prefix}{번호}#KR1" (기본 bench0#KR1, bench1#KR1, ...) 입니다.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote, parse_qs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+PLATFORM = "KR"
+
+# 엔드포인트별 메서드 레이트 리밋 (Riot 운영 키와 비슷한 값)
+METHOD_LIMITS = {
+    "account-v1.by-riot-id": "1000:60",
+    "spectator-v5.active-games": "20000:10",
+    "match-v5.ids-by-puuid": "2000:10",
+    "match-v5.match": "2000:10",
+    "league-v4.entries-by-summoner": "100:60",
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FixedWindowLimiter:
+    """
+    Riot 서버처럼 첫 요청부터 seconds초짜리 고정 창을 세는 레이트 리밋.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.windows = {}
+        for part in spec.split(","):
+            limit, seconds = part.split(":")
+            self.windows[int(seconds)] = [int(limit), 0.0, 0]
+
+    def hit(self, now):
+        """
+        요청 1회를 기록합니다. 한도를 넘으면 Retry-After(초)를, 아니면 None을 반환합니다.
+        """
+        retry_after = None
+        for seconds, window in self.windows.items():
+            limit, started, count = window
+            if now - started >= seconds:
+                window[1], window[2] = now, 0
+            if window[2] >= limit:
+                retry_after = max(retry_after or 0, int(window[1] + seconds - now) + 1)
+        if retry_after is None:
+            for window in self.windows.values():
+                window[2] += 1
+        return retry_after
+
+    def count_header(self):
+        return ",".join(f"{window[2]}:{seconds}" for seconds, window in self.windows.items())
+
+
+class MockWorld:
+    """
+    가상의 소환사와 게임 일정.
+    party_size명씩 묶인 파티가 같은 게임에 함께 들어가고, 게임 사이에는 gap만큼 쉽니다.
+    게임이 끝나고 match_delay초가 지나야 match-v5에 경기가 나타납니다.
+    """
+
+    def __init__(self, summoners, party_size=1, seed=1, game_min=240, game_max=480,
+                 gap_min=30, gap_max=120, match_delay=10, name_prefix="bench", start_time=None,
+                 game_clock_offset=0):
+        self.start_time = start_time or time.time()
+        self.game_clock_offset = game_clock_offset
+        self.game_min, self.game_max = game_min, game_max
+        self.gap_min, self.gap_max = gap_min, gap_max
+        self.match_delay = match_delay
+        self.champion_ids = [int(c["key"]) for c in load_fixture("champion.json")["data"].values()]
+        self.lock = threading.Lock()
+        self.summoners = []
+        self.by_riot_id = {}
+        self.by_puuid = {}
+        self.by_summoner_id = {}
+        for i in range(summoners):
+            summoner = {
+                "gameName": f"{name_prefix}{i}",
+                "tagLine": "KR1",
+                "puuid": f"mock-puuid-{i:06d}",
+                "summonerId": f"mock-summoner-{i:06d}",
+                "party": i // party_size,
+            }
+            self.summoners.append(summoner)
+            self.by_riot_id[(summoner["gameName"].lower(), summoner["tagLine"].lower())] = summoner
+            self.by_puuid[summoner["puuid"]] = summoner
+            self.by_summoner_id[summoner["summonerId"]] = summoner
+        party_count = (summoners + party_size - 1) // party_size
+        self.parties = []
+        for p in range(party_count):
+            rng = random.Random(seed * 1000003 + p)
+            self.parties.append({
+                "members": self.summoners[p * party_size:(p + 1) * party_size],
+                "rng": rng,
+                "games": [],
+                "next_start": self.start_time + rng.uniform(0, gap_max),
+                "counter": 0,
+            })
+        self.games = {}
+
+    def _new_game(self, party, index, start):
+        rng = party["rng"]
+        party["counter"] += 1
+        game_id = 7_000_000_000 + index * 10_000 + party["counter"]
+        end = start + rng.uniform(self.game_min, self.game_max)
+        participants = self.build_participants(party["members"], game_id, rng)
+        game = {"gameId": game_id, "start": start, "end": end, "participants": participants, "party": index}
+        self.games[game_id] = game
+        return game
+
+    def build_participants(self, members, game_id, rng):
+        """
+        게임 참가자 10명 (앞쪽 자리에 파티원, 나머지는 가상의 다른 소환사). 승패와 KDA는 rng로 정합니다.
+        """
+        blue_win = rng.random() < 0.5
+        participants = []
+        for slot in range(10):
+            team = 100 if slot < 5 else 200
+            if slot < len(members):
+                member = members[slot]
+                puuid, summoner_id = member["puuid"], member["summonerId"]
+                name, tag = member["gameName"], member["tagLine"]
+            else:
+                puuid, summoner_id = f"filler-{game_id}-{slot}", f"filler-summoner-{game_id}-{slot}"
+                name, tag = f"filler{slot}", "KR1"
+            participants.append({
+                "puuid": puuid, "summonerId": summoner_id, "gameName": name, "tagLine": tag,
+                "teamId": team, "teamPosition": POSITIONS[slot % 5],
+                "championId": rng.choice(self.champion_ids),
+                "kills": rng.randint(0, 15), "deaths": rng.randint(0, 12), "assists": rng.randint(0, 20),
+                "win": blue_win if team == 100 else not blue_win,
+            })
+        return participants
+
+    def _extend(self, index, until):
+        party = self.parties[index]
+        while party["next_start"] <= until:
+            game = self._new_game(party, index, party["next_start"])
+            party["games"].append(game)
+            party["next_start"] = game["end"] + party["rng"].uniform(self.gap_min, self.gap_max)
+        return party["games"]
+
+    def current_game(self, puuid, now):
+        summoner = self.by_puuid.get(puuid)
+        if summoner is None:
+            return None
+        with self.lock:
+            for game in reversed(self._extend(summoner["party"], now)):
+                if game["start"] <= now < game["end"]:
+                    return game
+                if game["end"] <= now:
+                    return None
+        return None
+
+    def is_published(self, game, now):
+        """
+        경기가 match-v5에 공개되었는지 (끝난 지 match_delay초가 지났는지).
+        """
+        return game["end"] + self.match_delay <= now
+
+    def finished_games(self, puuid, now):
+        """
+        match-v5에 공개된 경기, 최신순.
+        """
+        summoner = self.by_puuid.get(puuid)
+        if summoner is None:
+            return []
+        with self.lock:
+            games = self._extend(summoner["party"], now)
+            return [g for g in reversed(games) if self.is_published(g, now)]
+
+    def truth(self, now):
+        """
+        벤치마크 채점용: 지금까지 시작된 게임과 그 게임의 모니터링 대상 puuid 목록.
+        """
+        with self.lock:
+            result = []
+            for index in range(len(self.parties)):
+                for game in self._extend(index, now):
+                    result.append({
+                        "gameId": game["gameId"],
+                        "start": game["start"],
+                        "end": game["end"],
+                        "puuids": [m["puuid"] for m in self.parties[index]["members"]],
+                    })
+            return result
+
+
+class MockRiotApi:
+    """
+    모의 Riot API 응답 생성기. HTTP 서버(MockRiotHandler)와 시뮬레이터(simulator.py)가 함께 씁니다.
+    world(MockWorld)의 게임 일정을 now 시각 기준으로 보고 fixtures/ 형식의 응답을 만듭니다.
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self.fixtures = {
+            name: load_fixture(f"{name}.json")
+            for name in ("account", "active_game", "match", "league_entries", "versions", "champion")
+        }
+
+    def endpoint_name(self, route):
+        if route[:4] == ["riot", "account", "v1", "accounts"] and len(route) == 7:
+            return "account-v1.by-riot-id"
+        if route[:5] == ["lol", "spectator", "v5", "active-games", "by-summoner"] and len(route) == 6:
+            return "spectator-v5.active-games"
+        if route[:4] == ["lol", "match", "v5", "matches"]:
+            if len(route) == 7 and route[4] == "by-puuid" and route[6] == "ids":
+                return "match-v5.ids-by-puuid"
+            if len(route) == 5:
+                return "match-v5.match"
+        if route[:5] == ["lol", "league", "v4", "entries", "by-summoner"] and len(route) == 6:
+            return "league-v4.entries-by-summoner"
+        return None
+
+    def route(self, endpoint, route, query, now):
+        """
+        (상태 코드, 응답 본문)을 반환합니다. route는 호스트 뒤의 경로 조각, query는 {이름: [값, ...]} 입니다.
+        """
+        world = self.world
+        fixtures = self.fixtures
+        not_found = {"status": {"message": "Data not found", "status_code": 404}}
+
+        if endpoint == "account-v1.by-riot-id":
+            summoner = world.by_riot_id.get((route[5].lower(), route[6].lower()))
+            if summoner is None:
+                return 404, not_found
+            body = copy.deepcopy(fixtures["account"])
+            body.update(puuid=summoner["puuid"], gameName=summoner["gameName"], tagLine=summoner["tagLine"])
+            return 200, body
+
+        if endpoint == "spectator-v5.active-games":
+            game = world.current_game(route[5], now)
+            if game is None:
+                return 404, not_found
+            return 200, self.active_game_body(game, now)
+
+        if endpoint == "match-v5.ids-by-puuid":
+            start = int(query.get("start", ["0"])[0])
+            count = min(int(query.get("count", ["20"])[0]), 100)
+            games = world.finished_games(route[5], now)
+            # 모의 경기는 모두 개인 랭크(420)
+            if "queue" in query and int(query["queue"][0]) != 420:
+                games = []
+            if "startTime" in query:
+                games = [g for g in games if g["start"] >= int(query["startTime"][0])]
+            if "endTime" in query:
+                games = [g for g in games if g["start"] <= int(query["endTime"][0])]
+            return 200, [f"{PLATFORM}_{g['gameId']}" for g in games[start:start + count]]
+
+        if endpoint == "match-v5.match":
+            platform, _, game_id = route[4].partition("_")
+            game = world.games.get(int(game_id)) if game_id.isdigit() else None
+            if game is None or not world.is_published(game, now):
+                return 404, not_found
+            return 200, self.match_body(game)
+
+        if endpoint == "league-v4.entries-by-summoner":
+            summoner = world.by_summoner_id.get(route[5])
+            body = copy.deepcopy(fixtures["league_entries"])
+            for entry in body:
+                entry["summonerId"] = route[5]
+                entry["puuid"] = summoner["puuid"] if summoner else ""
+            return 200, body
+
+        return 404, not_found
+
+    def active_game_body(self, game, now):
+        body = copy.deepcopy(self.fixtures["active_game"])
+        template = body.pop("_participantTemplate")
+        body["gameId"] = game["gameId"]
+        body["gameStartTime"] = int((game["start"] - self.world.game_clock_offset) * 1000)
+        body["gameLength"] = int(now - game["start"] + self.world.game_clock_offset)
+        for p in game["participants"]:
+            participant = copy.deepcopy(template)
+            participant.update(
+                puuid=p["puuid"], summonerId=p["summonerId"], teamId=p["teamId"],
+                championId=p["championId"], riotId=f"{p['gameName']}#{p['tagLine']}",
+            )
+            body["participants"].append(participant)
+        return body
+
+    def match_body(self, game):
+        body = copy.deepcopy(self.fixtures["match"])
+        template = body.pop("_participantTemplate")
+        match_id = f"{PLATFORM}_{game['gameId']}"
+        duration = int(game["end"] - game["start"])
+        body["metadata"]["matchId"] = match_id
+        body["metadata"]["participants"] = [p["puuid"] for p in game["participants"]]
+        info = body["info"]
+        info.update(
+            gameId=game["gameId"], gameCreation=int(game["start"] * 1000) - 60000,
+            gameStartTimestamp=int(game["start"] * 1000), gameEndTimestamp=int(game["end"] * 1000),
+            gameDuration=duration,
+        )
+        for team in info["teams"]:
+            team["win"] = any(p["win"] for p in game["participants"] if p["teamId"] == team["teamId"])
+        for p in game["participants"]:
+            participant = copy.deepcopy(template)
+            participant.update(
+                puuid=p["puuid"], summonerId=p["summonerId"], riotIdGameName=p["gameName"],
+                riotIdTagline=p["tagLine"], summonerName=p["gameName"], teamId=p["teamId"],
+                teamPosition=p["teamPosition"], individualPosition=p["teamPosition"],
+                championId=p["championId"], kills=p["kills"], deaths=p["deaths"], assists=p["assists"],
+                win=p["win"],
+            )
+            participant["challenges"]["gameLength"] = duration
+            info["participants"].append(participant)
+        return body
+
+
+class MockRiotServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, world, app_limit="500:10,30000:600", latency_ms=0, latency_jitter_ms=0,
+                 error_429_rate=0.0, error_5xx_rate=0.0, outage_at=None, outage_duration=0):
+        super().__init__(address, MockRiotHandler)
+        self.world = world
+        self.app_limit_spec = app_limit
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.outage_at = outage_at
+        self.outage_duration = outage_duration
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.app_limiters = {}
+        self.method_limiters = {}
+        self.stats = {}
+        self.api = MockRiotApi(world)
+        self.fixtures = self.api.fixtures
+
+    def count(self, endpoint, status):
+        with self.lock:
+            key = f"{endpoint} {status}"
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def in_outage(self, now):
+        if self.outage_at is None:
+            return False
+        offset = now - self.started
+        return self.outage_at <= offset < self.outage_at + self.outage_duration
+
+    def check_limits(self, host, endpoint, now):
+        """
+        (Retry-After, 제한 종류, 응답 헤더)를 반환합니다. 제한에 걸리지 않았으면 Retry-After는 None.
+        """
+        with self.lock:
+            app = self.app_limiters.get(host)
+            if app is None:
+                app = self.app_limiters[host] = FixedWindowLimiter(self.app_limit_spec)
+            method = self.method_limiters.get((host, endpoint))
+            if method is None:
+                method = self.method_limiters[(host, endpoint)] = FixedWindowLimiter(METHOD_LIMITS[endpoint])
+            retry_after, limit_type = app.hit(now), "application"
+            if retry_after is None:
+                retry_after, limit_type = method.hit(now), "method"
+            headers = {
+                "X-App-Rate-Limit": app.spec,
+                "X-App-Rate-Limit-Count": app.count_header(),
+                "X-Method-Rate-Limit": method.spec,
+                "X-Method-Rate-Limit-Count": method.count_header(),
+            }
+        return retry_after, limit_type, headers
+
+
+class MockRiotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+        if not parts:
+            return self.send_json(404, {"status": {"message": "Not found", "status_code": 404}})
+
+        if parts[0] == "__stats":
+            with server.lock:
+                stats = dict(server.stats)
+            return self.send_json(200, {"requests": stats, "total": sum(stats.values())})
+        if parts[0] == "__games":
+            return self.send_json(200, server.world.truth(time.time()))
+
+        if server.latency_ms or server.latency_jitter_ms:
+            delay = server.latency_ms + random.uniform(0, server.latency_jitter_ms)
+            time.sleep(delay / 1000)
+
+        if parts[0] == "ddragon":
+            return self.handle_ddragon(parts[1:])
+
+        host, route = parts[0], parts[1:]
+        endpoint = server.api.endpoint_name(route)
+        if endpoint is None:
+            server.count("unknown", 404)
+            return self.send_json(404, {"status": {"message": "Not found", "status_code": 404}})
+
+        now = time.time()
+        if server.in_outage(now) or random.random() < server.error_5xx_rate:
+            server.count(endpoint, 503)
+            return self.send_json(503, {"status": {"message": "Service unavailable", "status_code": 503}})
+        if random.random() < server.error_429_rate:
+            server.count(endpoint, 429)
+            return self.send_json(429, {"status": {"message": "Rate limit exceeded", "status_code": 429}},
+                                  {"Retry-After": "1", "X-Rate-Limit-Type": "service"})
+        retry_after, limit_type, headers = server.check_limits(host, endpoint, now)
+        if retry_after is not None:
+            server.count(endpoint, 429)
+            headers.update({"Retry-After": str(retry_after), "X-Rate-Limit-Type": limit_type})
+            return self.send_json(429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}, headers)
+
+        status, body = server.api.route(endpoint, route, query, now)
+        server.count(endpoint, status)
+        self.send_json(status, body, headers)
+
+    def handle_ddragon(self, route):
+        fixtures = self.server.fixtures
+        if route == ["api", "versions.json"]:
+            self.server.count("ddragon.versions", 200)
+            return self.send_json(200, fixtures["versions"])
+        if len(route) == 5 and route[0] == "cdn" and route[4] == "champion.json":
+            self.server.count("ddragon.champion", 200)
+            body = copy.deepcopy(fixtures["champion"])
+            body["version"] = route[1]
+            return self.send_json(200, body)
+        self.server.count("ddragon.unknown", 404)
+        return self.send_json(404, {"status": {"message": "Not found", "status_code": 404}})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 모의 Riot API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--summoners", type=int, default=100, help="가상 소환사 수")
+    parser.add_argument("--party-size", type=int, default=1, help="같은 게임에 함께 들어가는 소환사 수")
+    parser.add_argument("--name-prefix", default="bench")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--game-min", type=float, default=240, help="게임 길이 최솟값(초)")
+    parser.add_argument("--game-max", type=float, default=480, help="게임 길이 최댓값(초)")
+    parser.add_argument("--gap-min", type=float, default=30, help="게임 사이 대기 시간 최솟값(초)")
+    parser.add_argument("--gap-max", type=float, default=120, help="게임 사이 대기 시간 최댓값(초)")
+    parser.add_argument("--game-clock-offset", type=float, default=0,
+                        help="spectator gameStartTime을 앞당기고 gameLength에 더할 값(초). 짧은 게임을 후반 게임처럼 보이게 할 때 사용")
+    parser.add_argument("--match-delay", type=float, default=10, help="게임 종료 후 match-v5에 공개되기까지(초)")
+    parser.add_argument("--history-hours", type=float, default=0,
+                        help="서버 시작 전 이 시간(시간)만큼의 지난 경기를 미리 만들어 둠 (전적 백필 확인용)")
+    parser.add_argument("--app-limit", default="500:10,30000:600", help="앱 레이트 리밋 (횟수:초, 쉼표 구분)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="응답마다 추가할 지연(ms)")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0, help="추가 지연의 무작위 폭(ms)")
+    parser.add_argument("--error-429-rate", type=float, default=0.0, help="무작위 429(service) 응답 비율")
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0, help="무작위 503 응답 비율")
+    parser.add_argument("--outage-at", type=float, default=None, help="서버 시작 후 이 시점(초)부터 전체 503")
+    parser.add_argument("--outage-duration", type=float, default=0, help="장애 지속 시간(초)")
+    return parser.parse_args(argv)
+
+
+def create_server(args):
+    world = MockWorld(
+        args.summoners, party_size=args.party_size, seed=args.seed,
+        game_min=args.game_min, game_max=args.game_max, gap_min=args.gap_min, gap_max=args.gap_max,
+        match_delay=args.match_delay, name_prefix=args.name_prefix, game_clock_offset=args.game_clock_offset,
+        start_time=time.time() - args.history_hours * 3600,
+    )
+    return MockRiotServer(
+        (args.host, args.port), world, app_limit=args.app_limit,
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_429_rate=args.error_429_rate, error_5xx_rate=args.error_5xx_rate,
+        outage_at=args.outage_at, outage_duration=args.outage_duration,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = create_server(args)
+    print(f"모의 Riot API 서버 시작: http://{args.host}:{server.server_address[1]} (소환사 {args.summoners}명)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,20 @@
 import time
 import sys
-from riot_api import get_account_info, get_start_game_info, get_finished_game_info, SUMMONER_NAME, get_summoner_tier, get_overall_game_stats
-from send_kakao_message import send_kakao_message
+from riot_api import get_account_info, get_start_game_info, get_finished_game_info, SUMMONER_NAME, get_summoner_tier, get_overall_game_stats, get_recent_stats, MatchNotReady, RequestDeferred, CircuitOpen, PRIORITY_IN_GAME, PRIORITY_IDLE
+from notifier import create_outbox
+from messages import build_start_message, build_end_message
+from scheduler import PollPolicy
+from config import (
+    POLL_INTERVAL, POLL_IDLE_MAX, POLL_IDLE_BACKOFF, POLL_JITTER,
+    MATCH_RESULT_DELAY, MATCH_RESULT_MAX_DELAY, MATCH_RESULT_TIMEOUT
+)
+from metrics import start_metrics_exporter, POLL_SECONDS, GAME_EVENTS
+from state_store import open_state_store, resend_pending
+from slo import EventTrace
+from routing import route_for, split_summoner
+
+# 메시지에 표시되는 대상 플레이어 호칭
+DISPLAY_NAME = "고병국"
 
 # 테스트 모드 활성화: 명령줄 인자 "test"가 있으면 활성화
 test_mode = False
@@ -12,7 +25,7 @@ if test_mode:
     print("테스트 모드 활성화: Dummy 함수 사용 및 체크 주기 2초 적용")
     sim_counter = 0
 
-    def get_start_game_info(puuid):
+    def get_start_game_info(puuid, platform=None, priority=None):
         """
         테스트 모드용 더미 함수:
           - sim_counter 값에 따라 게임 진행 여부를 시뮬레이션.
@@ -21,6 +34,7 @@ if test_mode:
         """
         global sim_counter
         state = sim_counter % 4
+        game_id = sim_counter // 4
         sim_counter += 1
         if state in (1, 2):
             return {
@@ -34,15 +48,16 @@ if test_mode:
                     "원딜": "태지귀요밍 [카이사, 1/4/5]",
                     "서폿": "군대가기싫어요 [쓰레쉬, 1/6/12]"
                 },
-                "summonerId": "DUMMY_SUMMONER_ID"
+                "summonerId": "DUMMY_SUMMONER_ID",
+                "gameId": game_id
             }
         else:
             return False
 
-    def get_finished_game_info(puuid):
+    def get_finished_game_info(puuid, game_id, platform_id=None):
         """
         테스트 모드용 더미 함수:
-          - 고정된 게임 종료 정보를 반환.
+          - 고정된 게임 종료 정보를 반환 (경기 결과가 바로 공개된 것으로 봄).
           - 게임 종류, 티어, 팀 라인업 등의 정보도 포함.
         """
         return {
@@ -69,9 +84,10 @@ else:
     get_start_game_info = get_start_game_info
     get_finished_game_info = get_finished_game_info
 
-def monitor_game():
+def monitor_game(profiler=None):
     """
     타겟 플레이어의 게임 상태(시작/종료)를 주기적으로 체크하여 카카오톡 메시지를 전송합니다.
+    profiler(profiler.CycleProfiler)가 있으면 폴링 1회마다 프로파일을 남깁니다 (python start.py profile).
     
     [게임 시작 시] 출력 예시:
       [고병국님의 게임이 시작되었습니다.]
@@ -124,117 +140,191 @@ def monitor_game():
         print("SUMMONER_NAME 형식이 올바르지 않습니다. 예: 이름#태그")
         return
 
-    game_name, tag_line = SUMMONER_NAME.split("#", 1)
+    # SUMMONER_NAME에 "@플랫폼"(예: @na1)이 붙어 있으면 그 플랫폼/지역으로 조회
     try:
-        account_info = get_account_info(game_name, tag_line)
-        puuid = account_info.get("puuid")
-        if not puuid:
-            print("계정 정보에서 puuid를 가져오지 못했습니다.")
-            return
-        print(f"모니터링 시작: puuid {puuid} 확인됨")
-    except Exception as e:
-        print("계정 정보를 가져오는 중 오류 발생:", e)
+        riot_id, platform = split_summoner(SUMMONER_NAME)
+    except ValueError as e:
+        print(e)
         return
+    route = route_for(platform)
+    game_name, tag_line = riot_id.split("#", 1)
+    # 테스트 모드의 더미 게임은 매번 같은 gameId를 쓰므로 상태를 저장하지 않음
+    store = None if test_mode else open_state_store()
+    record = store.load(riot_id) if store else None
+    if record and record.puuid:
+        # 저장된 puuid가 있으면 계정 조회 없이 바로 시작
+        puuid = record.puuid
+        print(f"모니터링 시작: 저장된 puuid {puuid} 사용")
+    else:
+        try:
+            account_info = get_account_info(game_name, tag_line, route.account_region)
+            puuid = account_info.get("puuid")
+            if not puuid:
+                print("계정 정보에서 puuid를 가져오지 못했습니다.")
+                return
+            print(f"모니터링 시작: puuid {puuid} 확인됨")
+        except Exception as e:
+            print("계정 정보를 가져오는 중 오류 발생:", e)
+            return
+        if store:
+            store.save_account(riot_id, puuid)
 
+    # 알림은 백그라운드에서 전송 (모니터링 루프를 막지 않음)
+    outbox = create_outbox(on_delivered=store.mark_sent if store else None)
+    start_metrics_exporter()  # METRICS_PORT / METRICS_FILE 이 설정된 경우에만 지표를 내보냄
     in_game = False  # 게임 상태 플래그
+    game_id = None  # 진행 중인 게임의 gameId (알림 중복 방지 키)
+    last_game_id = None  # 마지막으로 종료 처리한 게임의 gameId
+    summoner_id = None
+    idle_polls = 0  # 연속으로 게임 중이 아니었던 폴링 횟수
+    game_started_at = None  # 게임 시작 시각 추정값 (time.monotonic 기준)
+    platform_id = None  # 진행 중인 게임의 플랫폼 (spectator platformId)
+    # 끝났지만 경기 결과(match-v5 "{플랫폼}_{gameId}")가 아직 공개되지 않아 종료 알림을 기다리는 게임들
+    # {"game_id", "platform_id", "ended_at"(time.monotonic 기준 종료 감지 시각), "detected_at"(같은 시각의 유닉스 시각),
+    #  "attempts", "next_check"}
+    ended_games = []
+    if record:
+        # 재시작 전 상태에서 이어서 감시 (진행 중이던 게임이 끝나면 종료 알림을 보냄)
+        summoner_id = record.summoner_id
+        last_game_id = record.last_game_id
+        if record.game_id is not None:
+            in_game = True
+            game_id = record.game_id
+            if record.game_started_at is not None:
+                game_started_at = time.monotonic() - (time.time() - record.game_started_at)
+            print(f"저장된 상태 불러옴: 게임 {game_id} 진행 중")
+        for ended_game_id, detected_at in record.ended_games:
+            detected_at = detected_at or time.time()
+            ended_at = time.monotonic() - (time.time() - detected_at)
+            ended_games.append({"game_id": ended_game_id, "platform_id": None, "ended_at": ended_at,
+                                "detected_at": detected_at, "attempts": 0, "next_check": time.monotonic()})
+            print(f"저장된 상태 불러옴: 게임 {ended_game_id} 결과 대기 중")
+        resend_pending(store, outbox, [riot_id])
+    policy = PollPolicy(
+        POLL_INTERVAL, POLL_IDLE_MAX, POLL_IDLE_BACKOFF, POLL_JITTER, MATCH_RESULT_DELAY, MATCH_RESULT_MAX_DELAY
+    )
     print("타겟 게임 상태를 체크합니다.")
     while True:
+        poll_started = time.perf_counter()
+        poll_result = "ok"
+        if profiler:
+            profiler.start_cycle()
         try:
-            start_info = get_start_game_info(puuid)
+            start_info = get_start_game_info(puuid, route.platform, PRIORITY_IN_GAME if in_game else PRIORITY_IDLE)
+            detected_at = time.time()
             print("활성 게임 정보:", start_info)
-            if start_info and not in_game:
+            current_game_id = start_info.get("gameId") if start_info else None
+            if in_game and current_game_id != game_id:
+                # 추적하던 게임(gameId)이 spectator에서 사라졌거나 폴링 사이에 다음 게임이 시작됨:
+                # 종료 처리만 하고, 종료 알림은 그 게임의 경기 결과가 공개된 뒤에 보냄
+                now = time.monotonic()
+                ended_games.append({"game_id": game_id, "platform_id": platform_id, "ended_at": now,
+                                    "detected_at": detected_at, "attempts": 0,
+                                    "next_check": now + policy.result_check_delay(0)})
+                if store:
+                    store.record_game_over(riot_id, game_id, detected_at)
+                last_game_id = game_id
+                in_game = False
+                game_id = None
+                idle_polls = 0
+                game_started_at = None
+
+            if start_info and not in_game and current_game_id != last_game_id:
                 # 활성 게임이 감지되면, 반환된 summonerId로 티어 정보 조회
                 summoner_id = start_info.get("summonerId")
-                tier_info = get_summoner_tier(summoner_id) if summoner_id else "티어 정보 없음"
-                game_type = start_info.get("gameType", "~")
-                team_lineup = start_info.get("teamLineup", {
-                    "탑": "~",
-                    "정글": "~",
-                    "미드": "~",
-                    "원딜": "~",
-                    "서폿": "~"
-                })
-                
-                # 전체 게임 정보 조회 (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률)
-                total_games, wins, losses, win_rate = get_overall_game_stats(summoner_id)
-                
-                start_msg = (
-                    f"[고병국님의 게임이 시작되었습니다.]\n"
-                    f"소환사 : {SUMMONER_NAME}\n"
-                    f"티어 : {tier_info}\n"
-                    f"게임 종류 : {game_type}\n"
-                    f"게임 시간 : {start_info.get('gameTime', '~')}\n"
-                    f"선택 챔피언 : {start_info.get('champion', '~')}\n\n"
-                    f"[팀원 정보]\n"
-                    f"팀원 1    : {team_lineup.get('탑', '~')}\n"
-                    f"팀원 2    : {team_lineup.get('정글', '~')}\n"
-                    f"팀원 3    : {team_lineup.get('미드', '~')}\n"
-                    f"팀원 4    : {team_lineup.get('원딜', '~')}\n"
-                    f"팀원 5    : {team_lineup.get('서폿', '~')}\n\n"
-                    f"[전체 게임 수]\n"
-                    f"{total_games} / {wins} / {losses}\n"
-
-                    f"승률 : {win_rate}%\n\n"
-                    f"전적 보러 가기 : https://lol.ps/summoner/{SUMMONER_NAME}?region=kr"
-                )
-                print(start_msg)
-                result = send_kakao_message(start_msg)
-                print("메시지 전송 결과:", result)
-                in_game = True
+                tier_info = get_summoner_tier(summoner_id, route.platform) if summoner_id else "티어 정보 없음"
 
-            elif not start_info and in_game:
-                finished_info = get_finished_game_info(puuid)
-                if finished_info:
-                    outcome = "승리" if finished_info.get("win") else "패배"
-                    kda = f"{finished_info.get('kills')}/{finished_info.get('deaths')}/{finished_info.get('assists')}"
-                    record_url = f"https://lol.ps/summoner/{SUMMONER_NAME}?region=kr"
+                # 전체 게임 정보 조회 (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률)
+                overall_stats = get_overall_game_stats(summoner_id, route.platform)
 
-                    # 전체 게임 정보 조회 (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률)
-                    total_games, wins, losses, win_rate = get_overall_game_stats(summoner_id)
+                # 로컬에 쌓인 경기로 계산한 최근 전적 (API 호출 없음)
+                recent_stats = get_recent_stats(puuid, start_info.get("championId"))
 
-                    team_lineup = finished_info.get("teamLineup", {
-                        "탑": "~",
-                        "정글": "~",
-                        "미드": "~",
-                        "원딜": "~",
-                        "서폿": "~"
-                    })
-                    
-                    end_msg = (
-                        f"[고병국님의 게임이 종료되었습니다.]\n"
-                        f"소환사 : {SUMMONER_NAME}\n"
-                        f"결과 : {outcome}\n"
-                        f"티어 : {finished_info.get('tier', '~')}\n"
-                        f"게임 종류 : {finished_info.get('gameType', '~')}\n\n"
-                        f"게임 시간 : {finished_info.get('gameTime', '~')}\n"
-                        f"고병국님의 KDA : {kda}\n\n"
-                        f"[팀원 정보]\n"
-                        f"탑    : {team_lineup.get('탑', '~')}\n"
-                        f"정글 : {team_lineup.get('정글', '~')}\n"
-                        f"미드  : {team_lineup.get('미드', '~')}\n"
-                        f"원딜 : {team_lineup.get('원딜', '~')}\n"
-                        f"서폿 : {team_lineup.get('서폿', '~')}\n\n"
-                        f"팀 총 킬 : {finished_info.get('teamTotalKills', '~')}\n"
-                        f"최고 킬 플레이어 : {finished_info.get('topKiller', '~')}\n\n"
-                        f"[전체 게임 수]\n"
-                        f"{total_games} / {wins} / {losses}\n"
-                        f"승률 : {win_rate}%\n\n"
-                        f"전적 보러 가기 : {record_url}"
-                    )
-                    print(end_msg)
-                    result = send_kakao_message(end_msg)
-                    print("메시지 전송 결과:", result)
+                start_msg = build_start_message(DISPLAY_NAME, riot_id, start_info, tier_info, overall_stats, recent_stats)
+                game_id = current_game_id
+                platform_id = start_info.get("platformId")
+                if start_info.get("gameStartTime"):
+                    start_at = start_info["gameStartTime"] / 1000
                 else:
-                    end_msg = "고병국님의 게임이 종료되었습니다. (게임 결과를 확인할 수 없습니다.)"
-                    print(end_msg)
-                    result = send_kakao_message(end_msg)
-                    print("메시지 전송 결과:", result)
-                in_game = False
+                    start_at = detected_at - start_info.get("gameLength", 0)
+                trace = EventTrace("start", riot_id, route.platform, game_id, start_at, detected_at)
+                trace.rendered_at = time.time()
+                key = (riot_id, game_id, "start")
+                # 상태와 알림을 먼저 기록하고 넣음 (이미 기록된 알림이면 다시 보내지 않음)
+                if store is None or store.record_start(riot_id, summoner_id, game_id, start_at, key, start_msg, start_at):
+                    if outbox.enqueue(key, start_msg, start_at, trace):
+                        GAME_EVENTS.inc("start")
+                in_game = True
+                game_started_at = time.monotonic() - start_info.get("gameLength", 0)
+            elif not start_info:
+                idle_polls += 1
+                print("상태 변화 없음.")
             else:
                 print("상태 변화 없음.")
+        except RequestDeferred:
+            # 레이트 리밋 여유가 없어 대기 중 폴링을 미룸 (다음 주기에 다시)
+            poll_result = "deferred"
+        except CircuitOpen:
+            # Riot 장애로 회로가 열려 있음 (복구를 확인할 때까지 바로 실패하므로 다음 주기에 다시)
+            poll_result = "circuit_open"
         except Exception as e:
+            poll_result = "error"
             print("모니터링 중 오류 발생:", e)
-        time.sleep(2 if test_mode else 15)
+        # 경기 결과 확인은 위의 spectator 폴링이 실패해도 따로 진행 (MultiMonitor.check_result와 같은 방식)
+        for ended in list(ended_games):
+            if time.monotonic() < ended["next_check"]:
+                continue
+            finished_info = None
+            try:
+                finished_info = get_finished_game_info(puuid, ended["game_id"], ended["platform_id"] or route.platform)
+            except MatchNotReady:
+                pass
+            except Exception as e:
+                # 5xx, 회로 열림, 응답 파싱 오류 등도 공개 전과 똑같이 간격을 늘려서 다시 확인하고 제한 시간을 적용
+                print(f"[게임 {ended['game_id']}] 경기 결과 조회 중 오류 발생:", e)
+            if finished_info is None:
+                if time.monotonic() - ended["ended_at"] < MATCH_RESULT_TIMEOUT:
+                    # 아직 공개되지 않음: 간격을 늘려서 다시 확인
+                    ended["attempts"] += 1
+                    ended["next_check"] = time.monotonic() + policy.result_check_delay(ended["attempts"])
+                    continue
+                print(f"{MATCH_RESULT_TIMEOUT:.0f}초 동안 경기 결과를 받지 못해 결과 없이 알립니다.")
+                GAME_EVENTS.inc("result_timeout")
+            ended_games.remove(ended)
+            try:
+                if finished_info:
+                    # 전체 게임 정보 조회 (전체 게임 수, 이긴 판 수, 패배한 판 수, 승률)
+                    overall_stats = get_overall_game_stats(summoner_id, route.platform)
+                    recent_stats = get_recent_stats(puuid, finished_info.get("championId"))
+                    end_msg = build_end_message(DISPLAY_NAME, riot_id, finished_info, overall_stats, recent_stats)
+                    end_at = (finished_info.get("gameEndTimestamp") or 0) / 1000 or None
+                    match_id = finished_info.get("matchId")
+                else:
+                    end_msg = build_end_message(DISPLAY_NAME, riot_id, None, None)
+                    end_at = None
+                    match_id = None
+                trace = EventTrace("end", riot_id, route.platform, ended["game_id"], end_at, ended["detected_at"])
+                trace.rendered_at = time.time()
+                key = (riot_id, ended["game_id"], "end")
+                if store is None or store.record_end(riot_id, ended["game_id"], match_id, key, end_msg, end_at):
+                    if outbox.enqueue(key, end_msg, end_at, trace):
+                        GAME_EVENTS.inc("end")
+            except Exception as e:
+                poll_result = "error"
+                print("모니터링 중 오류 발생:", e)
+        POLL_SECONDS.observe(poll_result, value=time.perf_counter() - poll_started)
+        if profiler:
+            profiler.end_cycle(poll_result)
+        if test_mode:
+            delay = 2
+        elif in_game and game_started_at is not None:
+            delay = policy.delay(True, elapsed=time.monotonic() - game_started_at)
+        else:
+            delay = policy.delay(False, idle_polls=idle_polls)
+        if ended_games:
+            # 경기 결과 확인 시각이 먼저 오면 그때 깨어남
+            delay = min(delay, max(0, min(e["next_check"] for e in ended_games) - time.monotonic()))
+        time.sleep(delay)
 
 if __name__ == "__main__":
     monitor_game() 
\ No newline at end of file
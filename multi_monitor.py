@@ -0,0 +1,619 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    SUMMONER_NAME, SUMMONER_NAMES, SUMMONER_LIST_FILE,
+    POLL_INTERVAL, MONITOR_CONCURRENCY, POLL_TIMEOUT,
+    POLL_IDLE_MAX, POLL_IDLE_BACKOFF, POLL_JITTER,
+    MATCH_RESULT_DELAY, MATCH_RESULT_MAX_DELAY, MATCH_RESULT_TIMEOUT, RESOLVE_BATCH_SIZE, RESOLVE_RATE
+)
+from riot_api import (
+    get_account_info, get_active_game, parse_start_game_info, get_finished_games_info,
+    get_league_entry, get_overall_game_stats, get_recent_stats, MatchNotReady, RequestDeferred, CircuitOpen,
+    PRIORITY_IN_GAME, PRIORITY_IDLE
+)
+from messages import build_start_message, build_end_message
+from notifier import create_outbox
+from scheduler import PollPolicy, PollScheduler
+from metrics import METRICS, start_metrics_exporter, POLL_SECONDS, MONITORED_SUMMONERS, GAME_EVENTS
+from state_store import open_state_store, resend_pending
+from slo import EventTrace
+from routing import split_summoner
+from registry import SummonerState, SummonerRegistry
+
+
+def load_summoner_names(list_file=SUMMONER_LIST_FILE):
+    """
+    모니터링할 Riot ID 목록을 불러옵니다.
+    list_file(기본 SUMMONER_LIST_FILE, 한 줄에 하나) → SUMMONER_NAMES(쉼표 구분) 순서로 합치고,
+    둘 다 비어 있으면 SUMMONER_NAME 하나만 사용합니다. 중복은 제거됩니다.
+    각 항목은 "이름#태그" 또는 플랫폼을 붙인 "이름#태그@플랫폼"(예: @na1, @euw1) 형식입니다 (routing.py).
+    """
+    names = []
+    if list_file:
+        with open(list_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                # 빈 줄과 '#'으로 시작하는 주석 줄은 무시
+                if line and not line.startswith("#"):
+                    names.append(line)
+    if SUMMONER_NAMES:
+        names.extend(name.strip() for name in SUMMONER_NAMES.split(",") if name.strip())
+    if not names:
+        names.append(SUMMONER_NAME)
+    return list(dict.fromkeys(names))
+
+
+def valid_summoners(specs):
+    """
+    형식이 올바른 항목("이름#태그", "이름#태그@플랫폼")만 남깁니다. 잘못된 항목은 이유를 출력하고 뺍니다.
+    """
+    riot_ids = []
+    for spec in specs:
+        if "#" not in spec:
+            print("SUMMONER_NAME 형식이 올바르지 않습니다. 예: 이름#태그 ->", spec)
+            continue
+        try:
+            split_summoner(spec)
+        except ValueError as e:
+            print(e)
+            continue
+        riot_ids.append(spec)
+    return riot_ids
+
+
+class FinishedGame:
+    """
+    끝났지만 경기 결과(match-v5 "{플랫폼}_{gameId}")가 아직 공개되지 않아 종료 알림을 기다리는 게임.
+    ended_at은 종료를 감지한 시각(이벤트 루프 시계 기준), detected_at은 같은 시각의 유닉스 시각(알림 지연 SLO용),
+    attempts는 지금까지 결과를 확인한 횟수입니다.
+    """
+
+    def __init__(self, game_id, platform_id, members, ended_at, detected_at=None):
+        self.game_id = game_id
+        self.platform_id = platform_id
+        self.members = members
+        self.ended_at = ended_at
+        self.detected_at = detected_at
+        self.attempts = 0
+
+
+class PuuidResolver:
+    """
+    실행 중에 추가된 소환사의 puuid를 백그라운드에서 조회합니다.
+    batch_size명씩 동시에 조회하고, 전체로는 초당 rate명을 넘지 않게 쉬어 가며 조회해서
+    목록에 수백 명을 한꺼번에 추가해도 다른 소환사의 폴링이 레이트 리밋을 기다리지 않게 합니다.
+    조회되면 바로 첫 폴링을 예약하고, 실패한 소환사는 평소 폴링 경로(poll_and_reschedule)에서 간격을 늘려가며 다시 조회합니다.
+    """
+
+    def __init__(self, monitor, batch_size=RESOLVE_BATCH_SIZE, rate=RESOLVE_RATE):
+        self.monitor = monitor
+        self.batch_size = max(1, batch_size)
+        self.rate = rate
+        self.pending = []
+        self.ready = None
+
+    def submit(self, state):
+        self.pending.append(state)
+        if self.ready is not None:
+            self.ready.set()
+
+    async def run(self):
+        self.ready = asyncio.Event()
+        monitor = self.monitor
+        while True:
+            if not self.pending:
+                self.ready.clear()
+                await self.ready.wait()
+            batch, self.pending = self.pending[:self.batch_size], self.pending[self.batch_size:]
+            # 조회를 기다리는 동안 목록에서 빠진 소환사는 건너뜀
+            batch = [state for state in batch if monitor.registry.get(state.riot_id) is state and state.puuid is None]
+            started = asyncio.get_running_loop().time()
+            resolved = await asyncio.gather(*(monitor.resolve(state) for state in batch))
+            for state, ok in zip(batch, resolved):
+                if not ok:
+                    state.resolve_backoff = monitor.poll_interval
+                monitor.reschedule(state)
+            if batch and self.rate > 0:
+                elapsed = asyncio.get_running_loop().time() - started
+                await asyncio.sleep(max(0.0, len(batch) / self.rate - elapsed))
+
+
+class MultiMonitor:
+    """
+    하나의 프로세스에서 여러 소환사의 게임 시작/종료를 동시에 감시합니다.
+
+    - 다음 폴링 시각을 최소 힙(PollScheduler)에 담아 두고, 시각이 된 소환사만 꺼내서
+      각각 별도의 태스크로 폴링합니다. 한 소환사의 호출이 느리거나 실패해도
+      다른 소환사의 폴링은 지연되지 않습니다.
+    - 폴링 간격은 소환사 상태에 따라 PollPolicy가 정합니다 (대기 중 백오프, 게임 경과 시간 기반).
+    - 모니터링 대상 여러 명이 같은 게임에 있으면 spectator 응답 하나로 모두 갱신하고,
+      게임이 끝날 때까지 리더 한 명만 spectator를 폴링합니다.
+    - 게임은 spectator gameId로 추적합니다. spectator에서 사라지거나 다른 gameId가 보이면 그 게임이 끝난 것으로 보고,
+      소환사는 바로 대기 상태로 돌아가며, 경기 결과는 그 게임의 matchId가 공개될 때까지 간격을 늘려가며 따로 확인합니다.
+    - riot_api의 동기 함수(requests 기반)는 스레드 풀에서 실행되어 이벤트 루프를 막지 않습니다.
+      요청은 우선순위별로 나갑니다: 경기 결과/리그 조회(이벤트) → 게임 중 폴링 → 대기 중 폴링 → 백필.
+    - 알림은 Outbox에 넣기만 하고 바로 돌아오며, 실제 전송은 Outbox의 백그라운드 스레드가 합니다.
+    - state_store가 있으면 puuid와 게임 시작/종료를 알림과 함께 기록하고, 시작할 때 그 상태에서 이어서 감시합니다.
+    - 알림마다 Riot 이벤트 시각과 감지/메시지 작성 시각을 EventTrace로 붙여 보냅니다 (slo.py의 알림 지연 SLO).
+      clock은 이 시각들과 게임 경과 시간을 잴 유닉스 시계입니다 (시뮬레이션에서는 가상 시계).
+    - 실행 중에도 add_summoner()/remove_summoner()로 대상을 바꿀 수 있습니다 (샤딩 모드의 재배정 등).
+    """
+
+    def __init__(self, riot_ids, poll_interval=POLL_INTERVAL, concurrency=MONITOR_CONCURRENCY,
+                 poll_timeout=POLL_TIMEOUT, outbox=None, state_store=None, clock=time.time):
+        # 모니터링 대상 상태와 Riot ID / puuid 색인 (소환사 10만 명 이상도 수십 MB 안에서)
+        self.registry = SummonerRegistry(SummonerState(spec) for spec in riot_ids)
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.clock = clock
+        self.policy = PollPolicy(
+            poll_interval, POLL_IDLE_MAX, POLL_IDLE_BACKOFF, POLL_JITTER, MATCH_RESULT_DELAY, MATCH_RESULT_MAX_DELAY
+        )
+        self.scheduler = PollScheduler()
+        # 진행 중인 게임(gameId)별 모니터링 대상 소환사 목록. 첫 번째가 spectator 폴링을 맡는 리더입니다.
+        self.games = {}
+        # 경기 결과를 기다리는 끝난 게임 (gameId → FinishedGame). 스케줄러에는 ("result", gameId) 키로 예약합니다.
+        self.finished = {}
+        self.state_store = state_store
+        self.outbox = outbox or create_outbox(on_delivered=state_store.mark_sent if state_store else None)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="riot")
+        # 실행 중에 추가된 소환사의 puuid 조회 (run()에서 시작)
+        self.resolver = PuuidResolver(self)
+
+    async def call(self, func, *args):
+        """
+        블로킹 riot_api 함수를 스레드 풀에서 실행하고 결과를 기다립니다.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def restore(self):
+        """
+        상태 저장소에 기록된 puuid와 진행 중인 게임을 불러오고, 보내지 못한 알림을 다시 넣습니다.
+        진행 중이던 게임은 각자 리더로 폴링을 이어가고(같은 게임이면 첫 폴링에서 다시 묶임), 끝나면 종료 알림을 보냅니다.
+        결과를 기다리던 끝난 게임은 바로 경기 결과를 다시 확인합니다.
+        """
+        records = self.state_store.load_all()
+        restored = in_game = 0
+        for state in self.registry:
+            record = records.get(state.riot_id)
+            if record is None or not record.puuid:
+                continue
+            restored += 1
+            in_game += self.restore_state(state, record)
+        print(f"저장된 상태 불러옴: 소환사 {restored}명 (게임 중 {in_game}명)")
+        resend_pending(self.state_store, self.outbox, self.registry.riot_ids())
+
+    def restore_state(self, state, record):
+        """
+        저장된 SummonerRecord를 소환사 한 명의 상태에 적용합니다. 진행 중인 게임이 있었으면 True.
+        """
+        loop = asyncio.get_running_loop()
+        loop_offset = loop.time() - self.clock()
+        self.registry.set_puuid(state, record.puuid)
+        state.summoner_id = record.summoner_id
+        state.last_game_id = record.last_game_id
+        for ended_game_id, ended_at in record.ended_games:
+            # 끝났지만 종료 알림을 아직 보내지 못한 게임: 경기 결과 확인부터 다시
+            detected_at = ended_at or self.clock()
+            self.add_finished(ended_game_id, None, [state], detected_at + loop_offset, loop.time(), detected_at)
+        if record.game_id is None:
+            return False
+        state.in_game = True
+        state.game_id = record.game_id
+        state.game_leader = state.riot_id
+        if record.game_started_at is not None:
+            state.game_started_at = record.game_started_at + loop_offset
+        return True
+
+    def add_summoner(self, spec):
+        """
+        실행 중에 소환사("이름#태그" 또는 "이름#태그@플랫폼")를 모니터링 대상에 추가합니다.
+        상태 저장소에 기록이 있으면 그 상태(puuid, 진행 중인 게임)에서 이어서 감시하면서 폴링 주기 안의 임의 시점에
+        첫 폴링을 예약하고, 없으면 puuid 조회를 PuuidResolver에 맡깁니다 (조회되면 첫 폴링이 예약됨).
+        이미 대상이면 아무것도 하지 않고 False를 반환합니다.
+        """
+        state = SummonerState(spec)
+        riot_id = state.riot_id
+        if not self.registry.add(state):
+            return False
+        record = self.state_store.load(riot_id) if self.state_store is not None else None
+        if record is None or not record.puuid:
+            self.resolver.submit(state)
+            return True
+        self.restore_state(state, record)
+        resend_pending(self.state_store, self.outbox, [riot_id])
+        loop = asyncio.get_running_loop()
+        self.scheduler.schedule(riot_id, loop.time() + random.uniform(0, self.poll_interval))
+        return True
+
+    def remove_summoner(self, riot_id):
+        """
+        소환사를 모니터링 대상에서 뺍니다. 상태 저장소의 기록은 남겨 두므로 다시 추가하면(다른 프로세스에서도) 이어서 감시합니다.
+        이 소환사가 리더로 폴링하던 게임은 같은 게임의 다른 소환사가 이어받습니다. 대상이 아니었으면 False.
+        """
+        state = self.registry.remove(riot_id)
+        if state is None:
+            return False
+        self.scheduler.remove(riot_id)
+        if state.in_game:
+            members = [m for m in self.games.get(state.game_id, []) if m is not state]
+            if members:
+                self.games[state.game_id] = members
+                if state.game_leader == riot_id:
+                    leader = members[0]
+                    for member in members:
+                        member.game_leader = leader.riot_id
+                    self.reschedule(leader)
+            else:
+                self.games.pop(state.game_id, None)
+        for game_id, finished in list(self.finished.items()):
+            if state in finished.members:
+                finished.members.remove(state)
+                if not finished.members:
+                    del self.finished[game_id]
+                    self.scheduler.remove(("result", game_id))
+        return True
+
+    async def resolve(self, state):
+        """
+        Riot ID로 puuid를 조회합니다. 조회되면 True.
+        """
+        try:
+            account_info = await self.call(get_account_info, state.game_name, state.tag_line, state.route.account_region)
+            self.registry.set_puuid(state, account_info.get("puuid"))
+            if state.puuid:
+                if self.state_store is not None:
+                    await self.call(self.state_store.save_account, state.riot_id, state.puuid)
+                print(f"[{state.riot_id}] 모니터링 시작: puuid {state.puuid} 확인됨")
+                return True
+            print(f"[{state.riot_id}] 계정 정보에서 puuid를 가져오지 못했습니다.")
+        except Exception as e:
+            print(f"[{state.riot_id}] 계정 정보를 가져오는 중 오류 발생:", e)
+        return False
+
+    def needs_start(self, state, game_id):
+        """
+        소환사가 game_id 게임을 아직 시작 처리하지 않았으면 True.
+        이미 시작했거나, 시작 처리 중이거나, 이미 종료 처리한 게임이면 False.
+        """
+        if state.in_game and state.game_id == game_id:
+            return False
+        return game_id not in (state.pending_game_id, state.last_game_id)
+
+    async def start_game(self, state, game_data, leader, detected_at=None):
+        """
+        spectator 응답(game_data)으로 소환사의 게임 시작을 처리하고 시작 알림을 넣습니다.
+        leader는 이 게임의 spectator 폴링을 대신 맡는 소환사이고, detected_at은 그 응답을 받은 시각(유닉스 시각)입니다.
+        """
+        detected_at = detected_at or self.clock()
+        game_id = game_data.get("gameId")
+        # 같은 게임의 다른 소환사를 처리하는 동안 이 소환사 자신의 폴링이 먼저 시작 처리했을 수 있음
+        if not self.needs_start(state, game_id):
+            return
+        # 리더의 폴링과 이 소환사 자신의 폴링이 동시에 같은 게임을 시작 처리하지 않도록 표시
+        state.pending_game_id = game_id
+        try:
+            if state.in_game:
+                # 폴링 사이에 이전 게임이 끝나고 바로 다음 게임이 시작됨: 이전 게임부터 종료 처리
+                await self.finish_game(state)
+            start_info = await self.call(parse_start_game_info, game_data, state.puuid, detected_at)
+            if not start_info:
+                return
+            state.summoner_id = start_info.get("summonerId")
+            league_entry = await self.call(get_league_entry, state.summoner_id, state.route.platform)
+            recent_stats = await self.call(get_recent_stats, state.puuid, start_info.get("championId"))
+        finally:
+            state.pending_game_id = None
+        start_msg = build_start_message(
+            state.game_name, state.riot_id, start_info, league_entry.tier_text(), league_entry.overall_stats(),
+            recent_stats
+        )
+        state.in_game = True
+        state.game_id = start_info.get("gameId")
+        state.platform_id = game_data.get("platformId")
+        state.game_leader = leader.riot_id
+        state.game_started_at = asyncio.get_running_loop().time() - start_info.get("gameLength", 0)
+        if start_info.get("gameStartTime"):
+            event_at = start_info["gameStartTime"] / 1000
+        else:
+            event_at = detected_at - start_info.get("gameLength", 0)
+        trace = EventTrace("start", state.riot_id, state.route.platform, state.game_id, event_at, detected_at)
+        trace.rendered_at = self.clock()
+        key = (state.riot_id, state.game_id, "start")
+        # 알림을 넣기 전에 상태와 알림을 먼저 기록 (기록해 둔 알림은 재시작 후에도 보내고, 다시 만들지 않음)
+        if self.state_store is not None and not await self.call(
+                self.state_store.record_start, state.riot_id, state.summoner_id, state.game_id, event_at,
+                key, start_msg, event_at):
+            return
+        if self.outbox.enqueue(key, start_msg, event_at, trace):
+            GAME_EVENTS.inc("start")
+
+    async def end_game(self, state, game_id, finished_info, detected_at=None):
+        """
+        소환사의 game_id 게임 종료 알림을 넣습니다.
+        finished_info는 get_finished_games_info()가 만든 이 소환사의 경기 결과입니다 (없으면 None).
+        detected_at은 게임이 spectator에서 사라진 것을 감지한 시각(유닉스 시각)입니다.
+        """
+        event_at = None
+        if finished_info:
+            overall_stats = await self.call(get_overall_game_stats, state.summoner_id, state.route.platform)
+            recent_stats = await self.call(get_recent_stats, state.puuid, finished_info.get("championId"))
+            end_msg = build_end_message(state.game_name, state.riot_id, finished_info, overall_stats, recent_stats)
+            if finished_info.get("gameEndTimestamp"):
+                event_at = finished_info["gameEndTimestamp"] / 1000
+        else:
+            end_msg = build_end_message(state.game_name, state.riot_id, None, None)
+        trace = EventTrace("end", state.riot_id, state.route.platform, game_id, event_at, detected_at)
+        trace.rendered_at = self.clock()
+        key = (state.riot_id, game_id, "end")
+        match_id = finished_info.get("matchId") if finished_info else None
+        if self.state_store is None or await self.call(
+                self.state_store.record_end, state.riot_id, game_id, match_id, key, end_msg, event_at):
+            if self.outbox.enqueue(key, end_msg, event_at, trace):
+                GAME_EVENTS.inc("end")
+
+    async def for_each_member(self, members, handler, *args):
+        """
+        같은 게임의 소환사들에게 handler를 적용합니다. 한 명의 실패가 다른 소환사에게 번지지 않습니다.
+        """
+        for member in members:
+            try:
+                await handler(member, *args)
+            except Exception as e:
+                print(f"[{member.riot_id}] 모니터링 중 오류 발생:", e)
+
+    def add_finished(self, game_id, platform_id, members, ended_at, check_at, detected_at=None):
+        """
+        끝난 게임을 결과 대기 목록에 넣고 check_at(이벤트 루프 시계)에 결과 확인을 예약합니다.
+        """
+        finished = self.finished.get(game_id)
+        if finished is None:
+            finished = self.finished[game_id] = FinishedGame(game_id, platform_id, [], ended_at, detected_at)
+            self.scheduler.schedule(("result", game_id), check_at)
+        finished.members.extend(m for m in members if m not in finished.members)
+        finished.platform_id = finished.platform_id or platform_id
+
+    async def finish_game(self, state):
+        """
+        소환사가 추적하던 게임이 끝났습니다 (spectator에서 사라졌거나 다른 게임이 보임).
+        같은 게임의 소환사들을 모두 대기 상태로 돌리고, 경기 결과 확인을 예약합니다.
+        종료 알림은 그 게임의 경기 결과가 공개된 뒤 check_result()가 보냅니다.
+        """
+        game_id = state.game_id
+        members = [m for m in self.games.pop(game_id, None) or [state] if m.in_game and m.game_id == game_id]
+        if state not in members:
+            members.append(state)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        for member in members:
+            member.last_game_id = game_id
+            member.in_game = False
+            member.game_id = None
+            member.game_leader = None
+            member.idle_polls = 0
+            member.game_started_at = None
+            if member is not state:
+                # 리더가 대신 폴링하던 소환사는 다시 각자 폴링
+                self.reschedule(member)
+        ended_at = self.clock()
+        self.add_finished(game_id, state.platform_id, members, now, now + self.policy.result_check_delay(0), ended_at)
+        if self.state_store is not None:
+            for member in members:
+                await self.call(self.state_store.record_game_over, member.riot_id, game_id, ended_at)
+
+    async def check_result(self, game_id):
+        """
+        끝난 게임의 경기 결과를 확인합니다. 공개되었으면 같은 게임을 마친 소환사들의 종료 알림을 넣고,
+        아직이면 간격을 늘려서 다시 예약합니다. MATCH_RESULT_TIMEOUT이 지나면 결과 없이 종료 알림을 보냅니다.
+        경기는 한 번만 받아서 모든 소환사의 결과를 만듭니다.
+        """
+        finished = self.finished.get(game_id)
+        if finished is None:
+            return
+        loop = asyncio.get_running_loop()
+        results = None
+        # 재시작 후 불러온 게임은 spectator platformId를 모르므로 소환사의 플랫폼으로 matchId를 만듦
+        platform_id = finished.platform_id or finished.members[0].route.platform
+        try:
+            results = await asyncio.wait_for(
+                self.call(get_finished_games_info, [m.puuid for m in finished.members], game_id, platform_id),
+                self.poll_timeout
+            )
+        except MatchNotReady:
+            pass
+        except asyncio.TimeoutError:
+            print(f"[게임 {game_id}] 경기 결과 조회 시간 초과 ({self.poll_timeout}초)")
+        except Exception as e:
+            print(f"[게임 {game_id}] 경기 결과 조회 중 오류 발생:", e)
+        if results is None:
+            if loop.time() - finished.ended_at < MATCH_RESULT_TIMEOUT:
+                finished.attempts += 1
+                self.scheduler.schedule(
+                    ("result", game_id), loop.time() + self.policy.result_check_delay(finished.attempts)
+                )
+                return
+            print(f"[게임 {game_id}] {MATCH_RESULT_TIMEOUT:.0f}초 동안 경기 결과가 공개되지 않아 결과 없이 알립니다.")
+            GAME_EVENTS.inc("result_timeout")
+            results = {}
+        del self.finished[game_id]
+        for member in finished.members:
+            try:
+                await self.end_game(member, game_id, results.get(member.puuid), finished.detected_at)
+            except Exception as e:
+                print(f"[{member.riot_id}] 모니터링 중 오류 발생:", e)
+
+    async def poll(self, state):
+        """
+        소환사 한 명의 게임 상태를 한 번 확인하고, 상태가 바뀌었으면 알림을 보냅니다.
+
+        spectator 응답의 participants에 다른 모니터링 대상이 있으면 그 소환사들의 상태도
+        이 응답으로 함께 갱신하고, 게임이 끝날 때까지 그들의 spectator 폴링은 이 소환사(리더)가 대신합니다.
+        추적하던 게임이 spectator에서 사라지면 종료 처리만 하고, 경기 결과는 check_result()가 따로 기다립니다.
+        """
+        # 게임 중인 소환사의 폴링은 대기 중인 소환사의 폴링보다 먼저 나감 (한도가 빠듯하면 대기 폴링은 미뤄짐)
+        priority = PRIORITY_IN_GAME if state.in_game else PRIORITY_IDLE
+        game_data = await self.call(get_active_game, state.puuid, state.route.platform, priority)
+        detected_at = self.clock()
+        if game_data:
+            game_id = game_data.get("gameId")
+            members = [state]
+            for p in game_data.get("participants", []):
+                other = self.registry.find(p.get("puuid"))
+                if other is not None and other is not state:
+                    members.append(other)
+            new_members = [m for m in members if self.needs_start(m, game_id)]
+            await self.for_each_member(new_members, self.start_game, game_data, state, detected_at)
+            if not self.is_follower(state):
+                # 재시작 후 불러온 소환사는 각자 리더로 시작하므로, 같은 게임이면 이 소환사 아래로 다시 묶음
+                for member in members[1:]:
+                    if member.in_game and member.game_id == game_id and member.game_leader != state.riot_id:
+                        member.game_leader = state.riot_id
+                        self.scheduler.remove(member.riot_id)
+            self.games[game_id] = [m for m in members if m.in_game and m.game_id == game_id]
+            state.idle_polls = 0
+
+        elif state.in_game:
+            await self.finish_game(state)
+
+        else:
+            state.idle_polls += 1
+
+    def is_follower(self, state):
+        """
+        다른 소환사(리더)가 이 소환사의 게임을 대신 폴링하고 있으면 True.
+        """
+        return state.in_game and state.game_leader not in (None, state.riot_id)
+
+    def next_delay(self, state):
+        """
+        소환사 상태에 맞는 다음 폴링까지의 간격(초).
+        """
+        if state.puuid is None:
+            return state.resolve_backoff
+        if state.in_game and state.game_started_at is not None:
+            elapsed = asyncio.get_running_loop().time() - state.game_started_at
+            return self.policy.delay(True, elapsed=elapsed)
+        return self.policy.delay(False, idle_polls=state.idle_polls)
+
+    async def poll_and_reschedule(self, state):
+        """
+        소환사 한 명을 한 번 처리하고(puuid 조회 또는 게임 상태 확인) 다음 폴링을 예약합니다.
+        """
+        started = time.perf_counter()
+        result = "ok"
+        try:
+            if state.puuid is None:
+                await asyncio.wait_for(self.resolve(state), self.poll_timeout)
+            else:
+                await asyncio.wait_for(self.poll(state), self.poll_timeout)
+        except RequestDeferred:
+            # 레이트 리밋 여유가 없어 대기 중 폴링을 미룸: 다음 주기에 다시 (대기 횟수는 늘리지 않음)
+            result = "deferred"
+        except CircuitOpen:
+            # 이 지역 엔드포인트의 회로가 열려 있음 (Riot 장애): 소환사마다 오류를 찍지 않고 다음 주기에 다시
+            result = "circuit_open"
+        except asyncio.TimeoutError:
+            result = "timeout"
+            print(f"[{state.riot_id}] 폴링 시간 초과 ({self.poll_timeout}초)")
+        except Exception as e:
+            result = "error"
+            print(f"[{state.riot_id}] 모니터링 중 오류 발생:", e)
+        finally:
+            POLL_SECONDS.observe(result, value=time.perf_counter() - started)
+            if state.puuid is None:
+                # puuid 조회 실패: 재시도 간격을 두 배씩 늘림 (최대 10분)
+                state.resolve_backoff = min(state.resolve_backoff * 2, 600) if state.resolve_backoff else self.poll_interval
+            # 리더가 대신 폴링하는 동안에는 예약하지 않음 (게임이 끝나면 리더가 다시 예약)
+            if not self.is_follower(state):
+                self.reschedule(state)
+
+    def export_metrics(self):
+        """
+        상태별 소환사 수를 지표 게이지에 채웁니다 (지표를 내보낼 때마다 호출됨).
+        """
+        counts = {"unresolved": 0, "idle": 0, "in_game": 0}
+        for state in self.registry:
+            if state.puuid is None:
+                counts["unresolved"] += 1
+            elif state.in_game:
+                counts["in_game"] += 1
+            else:
+                counts["idle"] += 1
+        for name, count in counts.items():
+            MONITORED_SUMMONERS.set(name, value=count)
+
+    def reschedule(self, state):
+        # 폴링 중에 모니터링 대상에서 빠진 소환사는 다시 예약하지 않음
+        if self.registry.get(state.riot_id) is not state:
+            return
+        loop = asyncio.get_running_loop()
+        self.scheduler.schedule(state.riot_id, loop.time() + self.next_delay(state))
+
+    async def run(self):
+        """
+        예약 시각이 된 소환사를 힙에서 꺼내 폴링 태스크를 띄우는 루프.
+        첫 폴링 시점은 폴링 주기 안에 고르게 흩어서, 수천 명이 한꺼번에 요청하지 않도록 합니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self.state_store is not None:
+            self.restore()
+        count = max(1, len(self.registry))
+        now = loop.time()
+        for i, state in enumerate(self.registry):
+            self.scheduler.schedule(state.riot_id, now + self.poll_interval * i / count)
+
+        resolver = asyncio.create_task(self.resolver.run())
+        # 실행 중에만 상태별 소환사 수를 내보냄 (모니터를 여러 번 만들어도 수집기가 쌓이지 않도록 끝나면 뺌)
+        METRICS.add_collector(self.export_metrics)
+        tasks = set()
+        try:
+            while True:
+                now = loop.time()
+                for key in self.scheduler.pop_due(now):
+                    if isinstance(key, tuple):
+                        task = asyncio.create_task(self.check_result(key[1]))
+                    else:
+                        state = self.registry.get(key)
+                        if state is None:
+                            continue
+                        task = asyncio.create_task(self.poll_and_reschedule(state))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                next_due = self.scheduler.next_due()
+                # 폴링이 끝난 소환사는 태스크 안에서 다시 예약되므로 최대 1초 단위로 힙을 다시 확인
+                wait = 1.0 if next_due is None else min(1.0, max(0.0, next_due - loop.time()))
+                await asyncio.sleep(wait)
+        finally:
+            resolver.cancel()
+            METRICS.remove_collector(self.export_metrics)
+
+
+def run_multi_monitor():
+    """
+    load_summoner_names()로 읽은 소환사 전체를 모니터링합니다.
+    실행 중에 목록 파일이 바뀌거나 제어 소켓으로 요청이 오면 바뀐 소환사만 반영합니다 (watchlist.py).
+    """
+    riot_ids = valid_summoners(load_summoner_names())
+    if not riot_ids:
+        print("모니터링할 소환사가 없습니다.")
+        return
+
+    print(f"다중 모니터링 시작: 소환사 {len(riot_ids)}명")
+    start_metrics_exporter()
+    from watchlist import WatchList
+    monitor = MultiMonitor(riot_ids, state_store=open_state_store())
+    # 목록 파일 / 제어 소켓으로 실행 중에 소환사를 추가/제거
+    watch = WatchList(monitor, riot_ids)
+
+    async def main():
+        await asyncio.gather(monitor.run(), watch.run())
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run_multi_monitor()
@@ -0,0 +1,287 @@
+import heapq
+import itertools
+import json
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from config import (
+    KAKAO_OPENTALK_NAME, NOTIFY_TRANSPORT, NOTIFY_FILE, NOTIFY_WEBHOOK_URL,
+    NOTIFY_MAX_RETRIES, NOTIFY_BATCH_SIZE
+)
+from metrics import NOTIFY_QUEUE_SECONDS, EVENT_DELIVERY_LAG_SECONDS, NOTIFY_DELIVERIES, NOTIFY_QUEUE_SIZE
+from slo import LATENCY
+
+
+class PartialDelivery(Exception):
+    """
+    여러 메시지 중 앞의 sent개만 보내고 실패했습니다 (원래 예외는 __cause__).
+    Outbox는 보낸 메시지를 전송 완료로 기록하고 나머지만 다시 보냅니다.
+    """
+
+    def __init__(self, sent, error):
+        super().__init__(f"{sent}건 전송 후 실패: {error}")
+        self.sent = sent
+
+
+class KakaoTransport:
+    """
+    카카오톡 오픈톡방으로 전송합니다 (Windows 전용).
+    여러 메시지가 한꺼번에 오면 채팅방을 한 번만 열고 이어서 보냅니다.
+    """
+
+    def __init__(self, chatroom_name=KAKAO_OPENTALK_NAME):
+        # win32 모듈은 Windows에서만 있으므로 이 전송 방식을 쓸 때만 불러옴
+        from send_kakao_message import open_chatroom, kakao_sendtext
+        self.open_chatroom = open_chatroom
+        self.kakao_sendtext = kakao_sendtext
+        self.chatroom_name = chatroom_name
+
+    def send(self, texts):
+        self.open_chatroom(self.chatroom_name)
+        for i, text in enumerate(texts):
+            if i:
+                time.sleep(0.5)
+            try:
+                self.kakao_sendtext(self.chatroom_name, text)
+            except Exception as e:
+                raise PartialDelivery(i, e) from e
+
+
+class StdoutTransport:
+    """
+    표준 출력으로 전송합니다 (리눅스/테스트용).
+    """
+
+    def send(self, texts):
+        for text in texts:
+            sys.stdout.write(text + "\n\n")
+        sys.stdout.flush()
+
+
+class FileTransport:
+    """
+    파일 끝에 JSON Lines 형식으로 추가합니다 (한 줄에 {"ts": 시각, "text": 메시지}).
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, texts):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for i, text in enumerate(texts):
+                try:
+                    f.write(json.dumps({"ts": time.time(), "text": text}, ensure_ascii=False) + "\n")
+                    f.flush()
+                except OSError as e:
+                    raise PartialDelivery(i, e) from e
+
+
+class WebhookTransport:
+    """
+    로컬 HTTP 웹훅으로 전송합니다. POST {"messages": [메시지, ...]}
+    요청 하나로 묶어 보내므로 모두 받았거나(2xx) 하나도 못 받은 것으로 봅니다.
+    """
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, texts):
+        response = self.session.post(self.url, json={"messages": texts}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+def create_transport(name=NOTIFY_TRANSPORT):
+    """
+    NOTIFY_TRANSPORT 값(kakao / stdout / file / webhook)에 맞는 전송 방식을 만듭니다.
+    """
+    name = (name or "kakao").lower()
+    if name == "kakao":
+        return KakaoTransport()
+    if name == "stdout":
+        return StdoutTransport()
+    if name == "file":
+        return FileTransport(NOTIFY_FILE)
+    if name == "webhook":
+        if not NOTIFY_WEBHOOK_URL:
+            raise EnvironmentError("NOTIFY_WEBHOOK_URL 환경변수가 설정되어 있지 않습니다.")
+        return WebhookTransport(NOTIFY_WEBHOOK_URL)
+    raise ValueError(f"알 수 없는 NOTIFY_TRANSPORT 값입니다: {name}")
+
+
+def event_name(key):
+    """
+    (소환사, gameId, 이벤트) 형식의 알림 키에서 이벤트 이름을 꺼냅니다. 다른 형식이면 "message".
+    """
+    if isinstance(key, tuple) and len(key) == 3:
+        return str(key[2])
+    return "message"
+
+
+class Outbox:
+    """
+    알림 발송 대기열.
+
+    모니터는 enqueue()로 메시지를 넣고 바로 돌아가고, 백그라운드 스레드가 전송합니다.
+    - (소환사, gameId, 이벤트) 키가 같은 메시지는 한 번만 보냅니다.
+    - 대기 중인 메시지가 여러 개면 최대 batch_size개씩 묶어서 보냅니다.
+    - 전송에 실패하면 아직 보내지 못한 메시지만 간격을 늘려가며 max_retries번까지 다시 시도합니다
+      (전송 방식이 PartialDelivery로 몇 건까지 보냈는지 알려 주면 그 메시지는 다시 보내지 않음).
+      그래도 보내지 못한 메시지는 따로 두었다가 requeue_delay초 뒤 다시 보내고, 보낼 때까지 계속 시도합니다.
+      기다리는 동안에도 새 메시지는 그대로 보냅니다.
+    - on_delivered가 있으면 전송에 성공한 메시지들의 키 목록으로 호출합니다 (상태 저장소에 전송 완료 기록).
+      일부만 보내졌으면 보낸 메시지들만 바로 기록합니다.
+    - 메시지에 EventTrace가 붙어 있으면 전송 시각을 채워 latency(LatencyTracker)에 넘깁니다 (알림 지연 SLO).
+    """
+
+    def __init__(self, transport, max_retries=NOTIFY_MAX_RETRIES, batch_size=NOTIFY_BATCH_SIZE, dedupe_size=10000,
+                 on_delivered=None, latency=LATENCY, requeue_delay=60):
+        self.transport = transport
+        self.requeue_delay = requeue_delay
+        self.on_delivered = on_delivered
+        self.latency = latency
+        self.max_retries = max_retries
+        self.batch_size = batch_size
+        self.dedupe_size = dedupe_size
+        self.queue = queue.Queue()
+        # 다시 보낼 시각이 되기를 기다리는 메시지 (시각, 순번, 메시지) 힙. 전송 스레드만 씀
+        self.delayed = []
+        self.delayed_order = itertools.count()
+        self.seen = OrderedDict()
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def start(self):
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._run, name="outbox", daemon=True)
+            self.worker.start()
+        return self
+
+    def enqueue(self, key, text, event_at=None, trace=None):
+        """
+        메시지를 대기열에 넣습니다. 같은 키로 이미 넣은 메시지가 있으면 무시하고 False를 반환합니다.
+        event_at은 알림의 원인이 된 게임 이벤트 시각(유닉스 시각, 초)으로, 전송 지연 지표에만 쓰입니다.
+        trace(slo.EventTrace)는 감지부터 전송까지의 시각 기록입니다 (재전송하는 알림처럼 없으면 None).
+        """
+        with self.lock:
+            if key in self.seen:
+                return False
+            self.seen[key] = True
+            while len(self.seen) > self.dedupe_size:
+                self.seen.popitem(last=False)
+        print(text)
+        enqueued_at = time.time()
+        if trace is not None:
+            trace.enqueued_at = enqueued_at
+        self.queue.put((key, text, enqueued_at, event_at, trace))
+        NOTIFY_QUEUE_SIZE.set(value=self.queue.qsize() + len(self.delayed))
+        return True
+
+    def _due_delayed(self):
+        """
+        다시 보낼 시각이 된 메시지를 최대 batch_size개 꺼냅니다.
+        """
+        now = time.monotonic()
+        batch = []
+        while self.delayed and self.delayed[0][0] <= now and len(batch) < self.batch_size:
+            batch.append(heapq.heappop(self.delayed)[2])
+        return batch
+
+    def _next_batch(self):
+        """
+        다시 보낼 시각이 된 메시지와 대기열의 메시지를 합쳐 최대 batch_size개를 꺼냅니다.
+        둘 다 없으면 새 메시지가 오거나 가장 이른 재전송 시각이 될 때까지 기다리고, 그래도 없으면 빈 목록입니다.
+        """
+        batch = self._due_delayed()
+        if not batch:
+            timeout = max(0.0, self.delayed[0][0] - time.monotonic()) if self.delayed else None
+            try:
+                batch = [self.queue.get(timeout=timeout)]
+            except queue.Empty:
+                return self._due_delayed()
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, batch):
+        """
+        batch를 보내고, 끝내 보내지 못한 메시지 목록을 반환합니다. 보낸 메시지는 그때그때 전송 완료로 기록합니다.
+        """
+        remaining = list(batch)
+        backoff = 1
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.transport.send([item[1] for item in remaining])
+                print(f"메시지 전송 결과: 전송 성공 ({len(remaining)}건)")
+                self._delivered(remaining)
+                return []
+            except PartialDelivery as e:
+                # 앞의 메시지들은 이미 보냈으므로 다시 보내지 않음
+                self._delivered(remaining[:e.sent])
+                remaining = remaining[e.sent:]
+                print(f"메시지 전송 실패 ({attempt + 1}/{self.max_retries + 1}):", e)
+            except Exception as e:
+                print(f"메시지 전송 실패 ({attempt + 1}/{self.max_retries + 1}):", e)
+            if attempt < self.max_retries:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+        return remaining
+
+    def _delivered(self, items):
+        if not items:
+            return
+        delivered_at = time.time()
+        for key, _, enqueued_at, event_at, trace in items:
+            NOTIFY_QUEUE_SECONDS.observe(event_name(key), value=delivered_at - enqueued_at)
+            if event_at:
+                EVENT_DELIVERY_LAG_SECONDS.observe(event_name(key), value=delivered_at - event_at)
+            if trace is not None and self.latency is not None:
+                trace.delivered_at = delivered_at
+                self.latency.record(trace)
+        NOTIFY_DELIVERIES.inc("sent", amount=len(items))
+        if self.on_delivered is not None:
+            try:
+                self.on_delivered([item[0] for item in items])
+            except Exception as e:
+                print("전송 완료 기록 중 오류 발생:", e)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            failed = self._deliver(batch)
+            if failed:
+                # 끝내 보내지 못한 메시지는 중복 기록에 남겨 둔 채 따로 두었다가 requeue_delay초 뒤 다시 보냄.
+                # 그동안 새 메시지는 계속 보냄 (재시작하면 상태 저장소가 다시 넣음)
+                NOTIFY_DELIVERIES.inc("requeued", amount=len(failed))
+                print(f"보내지 못한 메시지 {len(failed)}건을 {self.requeue_delay:.0f}초 뒤 다시 보냅니다.")
+                due = time.monotonic() + self.requeue_delay
+                for item in failed:
+                    heapq.heappush(self.delayed, (due, next(self.delayed_order), item))
+            NOTIFY_QUEUE_SIZE.set(value=self.queue.qsize() + len(self.delayed))
+            # 다시 보낼 메시지는 보낼 때까지 처리 중으로 남겨 둠 (flush()가 기다리도록)
+            for _ in range(len(batch) - len(failed)):
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        대기열의 메시지가 모두 처리될 때까지 기다립니다 (다시 보내려고 기다리는 메시지 포함).
+        """
+        self.queue.join()
+
+
+def create_outbox(on_delivered=None):
+    """
+    설정(NOTIFY_TRANSPORT)에 맞는 전송 방식으로 Outbox를 만들고 백그라운드 전송을 시작합니다.
+    """
+    return Outbox(create_transport(), on_delivered=on_delivered).start()
@@ -0,0 +1,186 @@
+"""
+경기 참가자 레코드와 포지션(라인) 매핑.
+
+spectator-v5(게임 시작)와 match-v5(게임 종료) 응답의 참가자를 같은 Participant 레코드로 다루고,
+match-v5 경기 상세는 필요한 필드만 골라서 MatchRecord로 읽습니다.
+match-v5 응답은 참가자마다 수백 개의 challenges/perks 통계가 들어 있어서 수백 KB나 되지만,
+알림과 전적 분석에 쓰는 값은 참가자당 10여 개뿐입니다.
+
+decode_match()는 json 파서가 참가자 객체를 하나 만들 때마다(object_hook) 바로 필요한 필드만 남기고
+나머지는 버리므로, 경기 전체 dict를 메모리에 올리지 않습니다.
+"""
+import json
+
+# 라인 표시 순서
+LANES = ("탑", "정글", "미드", "원딜", "서폿")
+
+# teamPosition → 라인. BOTTOM은 role로 원딜/서폿을 나눕니다.
+LANE_BY_POSITION = {
+    "TOP": "탑",
+    "JUNGLE": "정글",
+    "MIDDLE": "미드",
+    "MID": "미드",
+    "UTILITY": "서폿",
+}
+# teamPosition이 BOTTOM이거나 알 수 없을 때 role로 정하는 라인
+LANE_BY_ROLE = {
+    "CARRY": "원딜",
+    "SUPPORT": "서폿",
+}
+
+
+def lane_for(position, role):
+    """
+    teamPosition/role 값으로 라인(탑, 정글, 미드, 원딜, 서폿)을 정합니다. 알 수 없으면 None.
+    BOTTOM인데 role이 없으면 원딜로 봅니다.
+    """
+    position = (position or "").upper()
+    role = (role or "").upper()
+    lane = LANE_BY_POSITION.get(position)
+    if lane:
+        return lane
+    if position == "BOTTOM":
+        return LANE_BY_ROLE.get(role, "원딜")
+    return LANE_BY_ROLE.get(role)
+
+
+# 응답의 필드 이름 → Participant 속성 이름
+PARTICIPANT_FIELDS = {
+    "puuid": "puuid",
+    "summonerId": "summoner_id",
+    "riotId": "riot_id",
+    "riotIdGameName": "riot_id_game_name",
+    "summonerName": "summoner_name",
+    "teamId": "team_id",
+    "championId": "champion_id",
+    "teamPosition": "team_position",
+    "role": "role",
+    "kills": "kills",
+    "deaths": "deaths",
+    "assists": "assists",
+    "win": "win",
+}
+
+
+class Participant:
+    """
+    경기 참가자 한 명. 알림과 전적 분석에 필요한 필드만 가집니다.
+    """
+
+    __slots__ = tuple(PARTICIPANT_FIELDS.values())
+
+    def __init__(self, puuid=None, summoner_id=None, riot_id=None, riot_id_game_name=None, summoner_name=None,
+                 team_id=None, champion_id=None, team_position=None, role=None,
+                 kills=0, deaths=0, assists=0, win=False):
+        self.puuid = puuid
+        self.summoner_id = summoner_id
+        self.riot_id = riot_id
+        self.riot_id_game_name = riot_id_game_name
+        self.summoner_name = summoner_name
+        self.team_id = team_id
+        self.champion_id = champion_id
+        self.team_position = team_position
+        self.role = role
+        self.kills = kills
+        self.deaths = deaths
+        self.assists = assists
+        self.win = win
+
+    @classmethod
+    def from_dict(cls, data):
+        participant = cls()
+        for key, attr in PARTICIPANT_FIELDS.items():
+            value = data.get(key)
+            if value is not None:
+                setattr(participant, attr, value)
+        return participant
+
+    @property
+    def lane(self):
+        return lane_for(self.team_position, self.role)
+
+    @property
+    def kda_text(self):
+        return f"{self.kills}/{self.deaths}/{self.assists}"
+
+    def __repr__(self):
+        return f"Participant({self.puuid!r}, team={self.team_id}, champion={self.champion_id}, lane={self.lane})"
+
+
+def assign_lanes(participants):
+    """
+    한 팀의 참가자들을 라인별로 나눕니다. {라인: Participant 또는 None}
+    같은 라인에 여러 명이 있으면 먼저 나온 참가자를 씁니다.
+    """
+    by_lane = dict.fromkeys(LANES)
+    for participant in participants:
+        lane = participant.lane
+        if lane and by_lane[lane] is None:
+            by_lane[lane] = participant
+    return by_lane
+
+
+class MatchRecord:
+    """
+    match-v5 경기 상세에서 필요한 값만 담은 레코드.
+    """
+
+    __slots__ = ("game_duration", "queue_id", "game_end_timestamp", "participants")
+
+    def __init__(self, game_duration=0, queue_id=None, game_end_timestamp=None, participants=None):
+        self.game_duration = game_duration
+        self.queue_id = queue_id
+        self.game_end_timestamp = game_end_timestamp
+        self.participants = participants or []
+
+    def participant(self, puuid):
+        for participant in self.participants:
+            if participant.puuid == puuid:
+                return participant
+        return None
+
+    def team(self, team_id):
+        return [p for p in self.participants if p.team_id == team_id]
+
+    def __repr__(self):
+        return f"MatchRecord(queue={self.queue_id}, duration={self.game_duration}, participants={len(self.participants)})"
+
+
+# match-v5 info 아래에서 읽는 필드 → MatchRecord 속성 이름
+MATCH_INFO_FIELDS = {
+    "gameDuration": "game_duration",
+    "queueId": "queue_id",
+    "gameEndTimestamp": "game_end_timestamp",
+}
+
+
+def _slim_object(data):
+    # 참가자 객체는 만들어지는 즉시 필요한 필드만 남겨서, challenges 등 큰 하위 객체를 바로 버립니다
+    if "puuid" in data and "championId" in data:
+        return Participant.from_dict(data)
+    return data
+
+
+def decode_match(raw):
+    """
+    match-v5 경기 상세 응답 원문(bytes)을 MatchRecord로 읽습니다.
+    """
+    data = json.loads(raw, object_hook=_slim_object)
+    info = data.get("info", {})
+    record = MatchRecord(participants=[p for p in info.get("participants", []) if isinstance(p, Participant)])
+    for key, attr in MATCH_INFO_FIELDS.items():
+        if info.get(key) is not None:
+            setattr(record, attr, info[key])
+    return record
+
+
+def match_index_rows(record):
+    """
+    경기 저장소의 참가자 색인(match_participants)에 넣을 참가자별 요약.
+    [(puuid, 승리, 킬, 데스, 어시스트, 챔피언 ID, 큐 ID, 게임 시간(초), 종료 시각(ms)), ...]
+    """
+    return [
+        (p.puuid, int(bool(p.win)), p.kills, p.deaths, p.assists, p.champion_id or 0,
+         record.queue_id or 0, record.game_duration or 0, record.game_end_timestamp or 0)
+        for p in record.participants if p.puuid
+    ]
@@ -0,0 +1,186 @@
+"""
+폴링 주기 프로파일링 (python start.py profile).
+
+단일 소환사 모니터(monitor_game)의 폴링 1회마다(또는 PROFILE_EVERY번에 한 번씩) cProfile과 tracemalloc을 켜서
+외부 프로파일러 없이 실제 트래픽에서 JSON 디코딩, 라인업 포맷팅, HTTP 처리 같은 구간의 회귀를 찾습니다.
+
+PROFILE_DIR에 폴링마다 다음 파일을 남깁니다 (NNNNNN은 폴링 번호).
+  cycle-NNNNNN.prof       pstats 형식 (python -m pstats, snakeviz 등으로 열기)
+  cycle-NNNNNN.folded     접힌 스택 형식 (flamegraph.pl, speedscope, inferno 등으로 플레임 그래프, 값은 마이크로초)
+  cycle-NNNNNN.alloc.txt  폴링 전후 tracemalloc 스냅샷 차이 (코드 줄별로 늘어난 메모리 상위 PROFILE_TOP개)
+  cycles.jsonl            폴링마다 한 줄: 번호, 결과, 소요 시간, 느림 여부, riot_api 함수별 시간, 늘어난 메모리
+
+PROFILE_SLOW_SECONDS보다 오래 걸린 폴링은 riot_api 함수별 누적 시간과 함께 바로 출력합니다.
+
+사용 예:
+  set PROFILE_DIR=profile
+  set PROFILE_SLOW_SECONDS=0.5
+  python start.py profile
+"""
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+from config import PROFILE_DIR, PROFILE_EVERY, PROFILE_SLOW_SECONDS, PROFILE_TOP
+
+# 접힌 스택에서 이보다 짧은 경로(마이크로초)는 버림
+MIN_FOLDED_MICROSECONDS = 1
+# 접힌 스택의 최대 깊이 (재귀가 깊은 경로에서 파일이 너무 커지지 않도록)
+MAX_FOLDED_DEPTH = 64
+# 메모리 차이에서 뺄 프레임 (프로파일러 자신과 import 기계)
+ALLOC_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def frame_label(func):
+    """
+    pstats 함수 키 (파일, 줄, 이름)를 플레임 그래프의 프레임 이름으로 바꿉니다.
+    """
+    filename, lineno, name = func
+    if filename == "~":
+        # 내장 함수 (예: "<method 'json' of ...>")
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(";", ",")
+
+
+def folded_stacks(stats):
+    """
+    pstats 통계를 접힌 스택({"a;b;c": 마이크로초})으로 바꿉니다.
+
+    cProfile은 호출자 → 피호출자 쌍만 기록하므로, 피호출자의 시간은 호출자별 누적 시간 비율대로
+    각 경로에 나눠 줍니다 (flameprof과 같은 방식). 재귀 호출은 같은 경로에 두 번 나오지 않게 끊습니다.
+    """
+    children = {}
+    # 호출자에게서 온 몫을 빼고 남은 시간은 프로파일을 켜기 전에 시작된 프레임에서 불린 것이므로 맨 아래 프레임이 됨
+    roots = []
+    for func, (_, _, _, total_time, callers) in stats.items():
+        outside_time = total_time
+        for caller, edge in callers.items():
+            if caller in stats:
+                children.setdefault(caller, []).append((func, edge[3]))
+                if caller != func:
+                    outside_time -= edge[3]
+        if total_time and outside_time * 1e6 >= MIN_FOLDED_MICROSECONDS:
+            roots.append((func, min(outside_time / total_time, 1.0)))
+
+    folded = {}
+
+    def walk(func, path, on_path, share):
+        self_time = stats[func][2]
+        path = path + [frame_label(func)]
+        micros = int(self_time * share * 1e6)
+        if micros >= MIN_FOLDED_MICROSECONDS:
+            key = ";".join(path)
+            folded[key] = folded.get(key, 0) + micros
+        if len(path) >= MAX_FOLDED_DEPTH:
+            return
+        on_path.add(func)
+        for child, edge_time in children.get(func, ()):
+            child_total = stats[child][3]
+            if child in on_path or not child_total:
+                continue
+            child_share = share * edge_time / child_total
+            if child_share * child_total * 1e6 >= MIN_FOLDED_MICROSECONDS:
+                walk(child, path, on_path, min(child_share, 1.0))
+        on_path.discard(func)
+
+    for root, share in roots:
+        walk(root, [], set(), share)
+    return folded
+
+
+def riot_api_breakdown(stats):
+    """
+    riot_api.py 함수별 누적 시간과 호출 수. 오래 걸린 순서입니다.
+    """
+    breakdown = []
+    for (filename, _, name), (_, calls, _, total_time, _) in stats.items():
+        if os.path.basename(filename) == "riot_api.py":
+            breakdown.append({"function": name, "calls": calls, "seconds": round(total_time, 4)})
+    breakdown.sort(key=lambda item: item["seconds"], reverse=True)
+    return breakdown
+
+
+class CycleProfiler:
+    """
+    폴링 주기마다 start_cycle() / end_cycle(result)로 감싸서 프로파일을 남깁니다.
+    every번에 한 번만 프로파일하고 (1이면 매번), slow_seconds보다 오래 걸린 폴링은 느린 폴링으로 표시합니다.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, every=PROFILE_EVERY, slow_seconds=PROFILE_SLOW_SECONDS, top=PROFILE_TOP):
+        self.directory = directory
+        self.every = max(1, every)
+        self.slow_seconds = slow_seconds
+        self.top = top
+        self.cycle = 0
+        self.profile = None
+        self.snapshot = None
+        self.started = None
+        os.makedirs(directory, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        print(f"프로파일링 모드: {self.every}번에 한 번씩 폴링을 프로파일해서 {os.path.abspath(directory)}에 저장합니다.")
+
+    def start_cycle(self):
+        self.cycle += 1
+        if self.cycle % self.every:
+            return
+        self.snapshot = tracemalloc.take_snapshot()
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.profile.enable()
+
+    def end_cycle(self, result="ok"):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        seconds = time.perf_counter() - self.started
+        after = tracemalloc.take_snapshot()
+        profile, before = self.profile, self.snapshot
+        self.profile = self.snapshot = None
+        try:
+            self._write(profile, before, after, seconds, result)
+        except OSError as e:
+            print("프로파일 저장 중 오류 발생:", e)
+
+    def _path(self, suffix):
+        return os.path.join(self.directory, f"cycle-{self.cycle:06d}{suffix}")
+
+    def _write(self, profile, before, after, seconds, result):
+        profile.dump_stats(self._path(".prof"))
+        stats = pstats.Stats(profile).stats
+
+        with open(self._path(".folded"), "w", encoding="utf-8") as f:
+            for stack, micros in sorted(folded_stacks(stats).items()):
+                f.write(f"{stack} {micros}\n")
+
+        diff = after.filter_traces(ALLOC_FILTERS).compare_to(before.filter_traces(ALLOC_FILTERS), "lineno")
+        allocated = sum(stat.size_diff for stat in diff)
+        with open(self._path(".alloc.txt"), "w", encoding="utf-8") as f:
+            f.write(f"# 폴링 {self.cycle}: 늘어난 메모리 {allocated / 1024:+.1f} KiB\n")
+            for stat in diff[:self.top]:
+                f.write(f"{stat}\n")
+
+        breakdown = riot_api_breakdown(stats)
+        slow = seconds >= self.slow_seconds
+        summary = {
+            "cycle": self.cycle, "at": time.time(), "result": result, "seconds": round(seconds, 4), "slow": slow,
+            "riot_api": breakdown, "allocated_bytes": allocated,
+        }
+        with open(os.path.join(self.directory, "cycles.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+        if slow:
+            details = ", ".join(f"{item['function']} {item['seconds']:.3f}초({item['calls']}회)"
+                                for item in breakdown[:self.top]) or "riot_api 호출 없음"
+            print(f"[프로파일] 느린 폴링 #{self.cycle} ({seconds:.3f}초, {result}): {details}")
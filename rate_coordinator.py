@@ -0,0 +1,248 @@
+"""
+레이트 리밋 코디네이터 (샤딩 모드).
+
+같은 API 키를 쓰는 여러 워커 프로세스(sharding.py)가 앱/메서드 레이트 리밋을 나눠 쓰도록,
+코디네이터 프로세스 하나가 RateBudget을 들고 TCP 또는 유닉스 소켓으로 요청 허가를 내줍니다.
+워커 목록(가입/하트비트/탈퇴)도 관리해서 워커들이 같은 목록으로 소환사를 나눌 수 있게 합니다.
+
+프로토콜은 한 줄에 JSON 하나씩 주고받는 요청/응답입니다.
+  {"op": "reserve", "host": "kr", "method": "...", "priority": 2} → {"wait": 0.0, "scope": null}  (0이면 허가, 요청 1회 기록됨)
+  {"op": "headers", "host", "method", "headers": {...}}           → {}
+  {"op": "block", "host", "method", "type", "retry_after"}        → {}
+  {"op": "remaining", "host", "method"}                           → {"app": n, "method": n}
+  {"op": "snapshot"}                                              → {"budgets": [[host, scope, n], ...]}
+  {"op": "join" | "heartbeat" | "leave", "worker": "이름"}        → {"workers": [...], "version": n}
+
+사용 예:
+  python start.py coordinator
+  python rate_coordinator.py --address unix:/tmp/koalarm.sock
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from config import RIOT_APP_RATE_LIMIT, SHARD_COORDINATOR, SHARD_WORKER_TTL
+from riot_client import RateBudget, PRIORITY_EVENT
+
+DEFAULT_ADDRESS = "127.0.0.1:8790"
+
+# 코디네이터로 넘기는 응답 헤더 (레이트 리밋 갱신에 필요한 것만)
+RATE_LIMIT_HEADERS = ("X-App-Rate-Limit", "X-App-Rate-Limit-Count", "X-Method-Rate-Limit", "X-Method-Rate-Limit-Count")
+
+
+def parse_address(address):
+    """
+    "호스트:포트" → (AF_INET, (호스트, 포트)), "unix:/경로" → (AF_UNIX, 경로)
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+class RateCoordinator:
+    """
+    모든 워커가 나눠 쓰는 레이트 리밋(RateBudget)과 워커 목록.
+    worker_ttl초 동안 하트비트가 없는 워커는 목록에서 빠지고, 목록이 바뀔 때마다 version이 올라갑니다.
+    """
+
+    def __init__(self, default_app_limits=RIOT_APP_RATE_LIMIT, worker_ttl=SHARD_WORKER_TTL):
+        self.budget = RateBudget(default_app_limits)
+        self.worker_ttl = worker_ttl
+        self.workers = {}
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        expired = [worker for worker, seen in self.workers.items() if seen <= now - self.worker_ttl]
+        for worker in expired:
+            del self.workers[worker]
+            print(f"워커 {worker} 응답 없음: 목록에서 뺌")
+        if expired:
+            self.version += 1
+
+    def membership(self, op, worker):
+        with self.lock:
+            now = time.monotonic()
+            self._expire(now)
+            if op == "leave":
+                if self.workers.pop(worker, None) is not None:
+                    self.version += 1
+                    print(f"워커 {worker} 탈퇴 (워커 {len(self.workers)}개)")
+            else:
+                if worker not in self.workers:
+                    self.version += 1
+                    print(f"워커 {worker} 참여 (워커 {len(self.workers) + 1}개)")
+                self.workers[worker] = now
+            return {"workers": sorted(self.workers), "version": self.version}
+
+    def dispatch(self, request):
+        op = request.get("op")
+        if op == "reserve":
+            priority = request.get("priority", PRIORITY_EVENT)
+            wait, scope = self.budget.reserve(request["host"], request["method"], priority)
+            return {"wait": wait, "scope": scope}
+        if op == "headers":
+            self.budget.update_from_headers(request["host"], request["method"], request.get("headers") or {})
+            return {}
+        if op == "block":
+            self.budget.block(request["host"], request["method"], request.get("type") or "", request["retry_after"])
+            return {}
+        if op == "remaining":
+            app, method = self.budget.remaining(request["host"], request.get("method"))
+            return {"app": app, "method": method}
+        if op == "snapshot":
+            return {"budgets": self.budget.snapshot()}
+        if op in ("join", "heartbeat", "leave"):
+            return self.membership(op, request["worker"])
+        return {"error": f"알 수 없는 요청입니다: {op}"}
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """
+    연결 하나에서 요청 줄을 읽는 대로 처리합니다 (워커는 스레드마다 연결을 하나씩 유지).
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.coordinator.dispatch(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"error": str(e)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class TCPCoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class UnixCoordinatorServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def create_server(address, coordinator):
+    """
+    address("호스트:포트" 또는 "unix:/경로")에서 coordinator 요청을 받는 서버를 만듭니다 (serve_forever로 시작).
+    """
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(target):
+            os.unlink(target)
+        server = UnixCoordinatorServer(target, CoordinatorHandler)
+    else:
+        server = TCPCoordinatorServer(target, CoordinatorHandler)
+    server.coordinator = coordinator
+    return server
+
+
+class CoordinatorError(Exception):
+    """
+    코디네이터가 요청을 처리하지 못했을 때 발생합니다.
+    """
+
+
+class RemoteRateBudget:
+    """
+    코디네이터의 RateBudget을 RateBudget과 같은 방식으로 쓰게 해 주는 클라이언트 (RiotClient(budget=...)).
+    요청은 riot_api를 호출하는 스레드마다 따로 연결을 열어서 보내고, 연결이 끊기면 한 번 다시 연결해서 보냅니다.
+    """
+
+    def __init__(self, address, timeout=10):
+        self.address = address
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connect(self):
+        family, target = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        self.local.sock = sock
+        self.local.reader = sock.makefile("rb")
+        return sock
+
+    def _close(self):
+        sock = getattr(self.local, "sock", None)
+        if sock is not None:
+            self.local.reader.close()
+            sock.close()
+            self.local.sock = None
+
+    def request(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+        for attempt in range(2):
+            try:
+                sock = getattr(self.local, "sock", None) or self._connect()
+                sock.sendall(data)
+                line = self.local.reader.readline()
+                if not line:
+                    raise ConnectionError("코디네이터 연결이 끊겼습니다.")
+                break
+            except OSError:
+                self._close()
+                if attempt:
+                    raise
+        response = json.loads(line)
+        if "error" in response:
+            raise CoordinatorError(response["error"])
+        return response
+
+    def reserve(self, host, method, priority=PRIORITY_EVENT):
+        response = self.request({"op": "reserve", "host": host, "method": method, "priority": priority})
+        return response["wait"], response["scope"]
+
+    def update_from_headers(self, host, method, headers):
+        forwarded = {name: headers[name] for name in RATE_LIMIT_HEADERS if headers.get(name)}
+        if forwarded:
+            self.request({"op": "headers", "host": host, "method": method, "headers": forwarded})
+
+    def block(self, host, method, limit_type, retry_after):
+        self.request({"op": "block", "host": host, "method": method, "type": limit_type, "retry_after": retry_after})
+
+    def remaining(self, host, method=None):
+        response = self.request({"op": "remaining", "host": host, "method": method})
+        return response["app"], response["method"]
+
+    def snapshot(self):
+        return [tuple(item) for item in self.request({"op": "snapshot"})["budgets"]]
+
+    def membership(self, op, worker):
+        """
+        op(join / heartbeat / leave) 후의 (워커 목록, 목록 버전)을 반환합니다.
+        """
+        response = self.request({"op": op, "worker": worker})
+        return response["workers"], response["version"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="샤딩 모드 레이트 리밋 코디네이터")
+    parser.add_argument("--address", default=SHARD_COORDINATOR or DEFAULT_ADDRESS,
+                        help='"호스트:포트" 또는 "unix:/경로" (기본: SHARD_COORDINATOR 또는 127.0.0.1:8790)')
+    parser.add_argument("--app-limit", default=RIOT_APP_RATE_LIMIT, help="응답 헤더를 받기 전까지 쓸 앱 레이트 리밋")
+    parser.add_argument("--worker-ttl", type=float, default=SHARD_WORKER_TTL,
+                        help="이 시간(초) 동안 하트비트가 없는 워커는 빠진 것으로 봄")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.address, RateCoordinator(args.app_limit, args.worker_ttl))
+    print(f"레이트 리밋 코디네이터 시작: {args.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
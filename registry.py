@@ -0,0 +1,123 @@
+"""
+다중 모니터(multi_monitor.py)의 소환사 상태 저장소.
+
+소환사 10만 명 이상을 한 프로세스에서 감시할 수 있도록 소환사 한 명당 메모리를 줄입니다.
+- 상태는 __dict__ 없는 __slots__ 레코드(SummonerState)입니다.
+- Riot ID와 puuid 문자열은 sys.intern으로 한 벌만 두고 색인과 상태가 같은 객체를 가리킵니다.
+- 게임 이름/태그는 Riot ID에서 필요할 때 잘라 쓰고, Route는 플랫폼마다 하나를 나눠 씁니다 (routing.route_for).
+- Riot ID → 상태, puuid → 상태 색인으로 spectator participants의 puuid를 O(1)로 찾고,
+  추가/제거도 O(1)이라 샤딩 재배정이나 목록 변경이 잦아도 전체를 훑지 않습니다.
+"""
+import sys
+
+from routing import route_for, split_summoner
+
+
+class SummonerState:
+    """
+    소환사 한 명의 모니터링 상태.
+    monitor_game()과 같은 in_game 상태 기계를 소환사마다 따로 가집니다.
+    spec은 "이름#태그" 또는 "이름#태그@플랫폼"이고, route는 이 소환사의 요청을 보낼 플랫폼/지역 호스트입니다.
+
+    필드:
+      platform_id      진행 중인 게임이 열린 플랫폼 (spectator platformId, 경기 결과 matchId에 사용)
+      game_leader      이 소환사의 게임을 spectator로 폴링하는 소환사의 Riot ID (자기 자신일 수도 있음)
+      pending_game_id  시작 처리 중인 게임의 gameId
+      last_game_id     마지막으로 종료 처리한 게임의 gameId (종료 직전에 받은 spectator 응답으로 다시 시작 처리하지 않도록)
+      idle_polls       연속으로 게임 중이 아니었던 폴링 횟수 (대기 중 폴링 간격을 늘리는 데 사용)
+      game_started_at  게임 시작 시각 추정값 (이벤트 루프 시계 기준, spectator gameLength로 계산)
+      resolve_backoff  puuid 조회 실패 시 다음 재시도까지의 간격
+    """
+
+    __slots__ = (
+        "riot_id", "route", "puuid", "summoner_id", "in_game", "game_id", "platform_id", "game_leader",
+        "pending_game_id", "last_game_id", "idle_polls", "game_started_at", "resolve_backoff",
+    )
+
+    def __init__(self, spec):
+        riot_id, platform = split_summoner(spec)
+        self.riot_id = sys.intern(riot_id)
+        self.route = route_for(platform)
+        self.puuid = None
+        self.summoner_id = None
+        self.in_game = False
+        self.game_id = None
+        self.platform_id = None
+        self.game_leader = None
+        self.pending_game_id = None
+        self.last_game_id = None
+        self.idle_polls = 0
+        self.game_started_at = None
+        self.resolve_backoff = None
+
+    @property
+    def game_name(self):
+        return self.riot_id.split("#", 1)[0]
+
+    @property
+    def tag_line(self):
+        return self.riot_id.split("#", 1)[1]
+
+
+class SummonerRegistry:
+    """
+    모니터링 대상 SummonerState 모음과 Riot ID / puuid 색인.
+    순회하면 추가한 순서대로 상태가 나옵니다.
+    """
+
+    def __init__(self, states=()):
+        self.by_id = {}
+        self.by_puuid = {}
+        for state in states:
+            self.add(state)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, riot_id):
+        return riot_id in self.by_id
+
+    def riot_ids(self):
+        return self.by_id.keys()
+
+    def get(self, riot_id):
+        return self.by_id.get(riot_id)
+
+    def find(self, puuid):
+        """
+        puuid에 해당하는 모니터링 대상 상태. 대상이 아니면 None.
+        """
+        return self.by_puuid.get(puuid)
+
+    def add(self, state):
+        """
+        상태를 추가합니다. 같은 Riot ID가 이미 있으면 추가하지 않고 False를 반환합니다.
+        """
+        if state.riot_id in self.by_id:
+            return False
+        self.by_id[state.riot_id] = state
+        if state.puuid:
+            self.by_puuid[state.puuid] = state
+        return True
+
+    def set_puuid(self, state, puuid):
+        """
+        소환사의 puuid를 정하고 puuid 색인을 갱신합니다.
+        """
+        if state.puuid and self.by_puuid.get(state.puuid) is state:
+            del self.by_puuid[state.puuid]
+        state.puuid = sys.intern(puuid) if puuid else None
+        if state.puuid and self.by_id.get(state.riot_id) is state:
+            self.by_puuid[state.puuid] = state
+
+    def remove(self, riot_id):
+        """
+        Riot ID의 상태를 빼고 반환합니다. 대상이 아니었으면 None.
+        """
+        state = self.by_id.pop(riot_id, None)
+        if state is not None and state.puuid and self.by_puuid.get(state.puuid) is state:
+            del self.by_puuid[state.puuid]
+        return state
@@ -1,31 +1,72 @@
 import os
-import json
-import requests
+import time
 from urllib.parse import quote
-from config import RIOT_API_KEY, RIOT_REGION, RIOT_SUMMONER_REGION, SUMMONER_NAME
 
-# 챔피언 정보를 캐시하기 위한 전역 변수
-CHAMPION_MAPPING = None
+import requests
+
+from config import (
+    RIOT_API_KEY, RIOT_REGION, SUMMONER_NAME,
+    RIOT_APP_RATE_LIMIT, RIOT_MAX_RETRIES, RIOT_IDLE_MAX_WAIT, RIOT_API_BASE_URL, MONITOR_CONCURRENCY,
+    CACHE_DIR, DDRAGON_URL, DDRAGON_CHECK_INTERVAL, LEAGUE_CACHE_TTL, MATCH_MEMORY_CACHE_SIZE,
+    ANALYTICS_RECENT_GAMES, SHARD_COORDINATOR, RIOT_BREAKER_THRESHOLD, RIOT_BREAKER_RESET, RIOT_BREAKER_MAX_RESET
+)
+from riot_client import (
+    RiotClient, RequestDeferred, CircuitOpen, PRIORITY_EVENT, PRIORITY_IN_GAME, PRIORITY_IDLE, PRIORITY_BACKFILL
+)
+from rate_coordinator import RemoteRateBudget
+from routing import normalize_platform, regional_cluster, platform_of_match
+from ddragon import ChampionCache
+from league import LeagueCache, parse_league_entries, EMPTY_LEAGUE_ENTRY, UNAVAILABLE_LEAGUE_ENTRY
+from match_store import MatchStore
+from participants import LANES, Participant, assign_lanes, decode_match, match_index_rows
+from analytics import MatchAnalytics
+from metrics import METRICS
+
+# 모든 Riot API 호출이 공유하는 클라이언트 (호스트별 커넥션 풀 + 레이트 리밋)
+# SHARD_COORDINATOR가 설정되어 있으면 레이트 리밋은 코디네이터가 다른 프로세스들과 나눠서 관리합니다.
+RIOT_CLIENT = RiotClient(
+    RIOT_API_KEY,
+    default_app_limits=RIOT_APP_RATE_LIMIT,
+    pool_size=MONITOR_CONCURRENCY,
+    max_retries=RIOT_MAX_RETRIES,
+    base_url=RIOT_API_BASE_URL,
+    budget=RemoteRateBudget(SHARD_COORDINATOR) if SHARD_COORDINATOR else None,
+    idle_max_wait=RIOT_IDLE_MAX_WAIT,
+    breaker_threshold=RIOT_BREAKER_THRESHOLD,
+    breaker_reset=RIOT_BREAKER_RESET,
+    breaker_max_reset=RIOT_BREAKER_MAX_RESET,
+)
+# 지표를 내보낼 때마다 레이트 리밋 잔여량과 회로 차단기 상태 게이지를 갱신
+METRICS.add_collector(RIOT_CLIENT.export_budget)
+METRICS.add_collector(RIOT_CLIENT.export_circuits)
+
+# 챔피언 정보 디스크 캐시 (Data Dragon 버전별 저장, 백그라운드 갱신)
+CHAMPION_CACHE = ChampionCache(
+    os.path.join(CACHE_DIR, "ddragon"), check_interval=DDRAGON_CHECK_INTERVAL, base_url=DDRAGON_URL
+)
+# 갱신에 실패해서 예전 챔피언 데이터를 쓰고 있는지 지표로 내보냄
+METRICS.add_collector(CHAMPION_CACHE.export_metrics)
+
+# 소환사별 리그 정보 캐시 (티어 + 전체 게임 수/승률을 한 번의 조회로)
+LEAGUE_CACHE = LeagueCache(LEAGUE_CACHE_TTL)
+
+# 끝난 경기 상세 정보 저장소 (SQLite + 메모리 LRU). 한 번 받은 경기는 다시 호출하지 않습니다.
+# 메모리에는 필요한 필드만 읽은 MatchRecord를 유지하고, 참가자별 요약은 전적 분석용으로 색인합니다.
+MATCH_STORE = MatchStore(
+    os.path.join(CACHE_DIR, "matches.sqlite3"), MATCH_MEMORY_CACHE_SIZE,
+    decode=decode_match, index_rows=match_index_rows
+)
+
+# 저장된 경기로 계산하는 소환사별 최근 전적 (최근 승률, KDA, 챔피언별 전적, 연승/연패)
+ANALYTICS = MatchAnalytics(MATCH_STORE, ANALYTICS_RECENT_GAMES)
 
 def get_champion_mapping():
     """
-    Data Dragon의 한국어 챔피언 데이터를 가져와서
+    Data Dragon의 한국어 챔피언 데이터에서
     챔피언의 key와 한국어 이름을 매핑한 딕셔너리를 반환합니다.
-    캐시되어 있다면 재요청하지 않습니다.
-    """
-    global CHAMPION_MAPPING
-    if CHAMPION_MAPPING is None:
-        try:
-            champion_url = "https://ddragon.leagueoflegends.com/cdn/15.3.1/data/ko_KR/champion.json"
-            resp = requests.get(champion_url, timeout=5)
-            resp.raise_for_status()
-            data = resp.json()
-            # 챔피언의 key(문자열)와 한국어 이름 매핑 생성
-            CHAMPION_MAPPING = {champ["key"]: champ["name"] for champ in data.get("data", {}).values()}
-        except Exception as e:
-            print("챔피언 데이터 로드 중 오류 발생:", e)
-            CHAMPION_MAPPING = {}
-    return CHAMPION_MAPPING
+    디스크 캐시를 먼저 사용하고, 새 패치가 나오면 백그라운드에서 갱신됩니다.
+    """
+    return CHAMPION_CACHE.get_mapping()
 
 def get_champion_name(champion_id):
     """
@@ -35,41 +76,37 @@ def get_champion_name(champion_id):
     mapping = get_champion_mapping()
     return mapping.get(str(champion_id), "~")
 
-def get_account_info(game_name, tag_line):
+def get_account_info(game_name, tag_line, region=None, priority=PRIORITY_IDLE):
     """
     소환사 정보 조회.
-    GET https://{RIOT_REGION}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}
+    GET https://{region}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}
+    region은 account-v1 클러스터(americas, asia, europe)이고, 없으면 RIOT_REGION을 씁니다.
+    priority는 요청 우선순위(riot_client.PRIORITY_*)입니다.
     """
-    url = f"https://{RIOT_REGION}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    headers = {"X-Riot-Token": RIOT_API_KEY}
-    response = requests.get(url, headers=headers, timeout=10)
+    path = f"/riot/account/v1/accounts/by-riot-id/{quote(game_name)}/{quote(tag_line)}"
+    response = RIOT_CLIENT.get(region or RIOT_REGION, path, "account-v1.by-riot-id", priority=priority)
     response.raise_for_status()
     return response.json()
 
 def format_team_lineup(team_participants):
     """
-    팀 참가자 정보를 받아서, 각 포지션별(탑, 정글, 미드, 원딜, 서폿)
+    팀 참가자(Participant) 5명을 받아서, 각 포지션별(탑, 정글, 미드, 원딜, 서폿)
     팀원 정보를 구성합니다.
     각 팀원의 이름은 우선순위: riotId > summonerName > summonerId 순이며,
     챔피언 이름은 한국어로 출력됩니다.
     """
-    lanes = ["탑", "정글", "미드", "원딜", "서폿"]
     team_lineup = {}
     if len(team_participants) == 5:
-        for lane, p in zip(lanes, team_participants):
-            display_name = p.get("riotId") or p.get("summonerName") or p.get("summonerId", "알수없음")
-            k = p.get("kills", 0)
-            d = p.get("deaths", 0)
-            a = p.get("assists", 0)
-            kda = f"{k}/{d}/{a}"
+        for lane, p in zip(LANES, team_participants):
+            display_name = p.riot_id or p.summoner_name or p.summoner_id or "알수없음"
             # champion_id를 이용해 get_champion_name() 함수에서 한국어 이름 반환
-            champ_name = get_champion_name(p.get("championId"))
-            team_lineup[lane] = f"{display_name} [{champ_name}, {kda}]"
+            champ_name = get_champion_name(p.champion_id)
+            team_lineup[lane] = f"{display_name} [{champ_name}, {p.kda_text}]"
     else:
-        team_lineup = {lane: "~" for lane in lanes}
+        team_lineup = {lane: "~" for lane in LANES}
     return team_lineup
 
-def get_start_game_info(puuid):
+def get_start_game_info(puuid, platform=None, priority=PRIORITY_IDLE):
     """
     활성 게임 정보를 조회하여 게임이 진행 중이면 다음 정보를 반환합니다:
       - 선택 챔피언 (대상 소환사가 선택한 챔피언)
@@ -77,35 +114,63 @@ def get_start_game_info(puuid):
       - 게임 종류 (gameQueueConfigId 기준: 개인 랭크, 자유 랭크, 특별 게임 모드)
       - 팀 라인업 (같은 팀 5명의 참가자에 대해 포지션별(탑, 정글, 미드, 원딜, 서폿) 정보 출력)
       - summonerId (대상 소환사의 암호화된 summonerId)
+      - gameLength (게임 경과 시간, 초. spectator gameStartTime 기준)
+      - gameStartTime (Riot 쪽 게임 시작 시각, 유닉스 시각 ms. 아직 로딩 중이면 None)
+      - gameId (spectator 게임 ID)
+      - platformId (게임이 열린 플랫폼, 예: KR. 경기 결과의 matchId를 만들 때 사용)
 
     게임이 진행 중이지 않으면 False를 반환합니다.
+    platform은 소환사의 플랫폼 호스트(kr, na1 등)이고, 없으면 RIOT_SUMMONER_REGION을 씁니다.
+    """
+    game_data = get_active_game(puuid, platform, priority)
+    if not game_data:
+        return False  # 활성 게임 정보가 없으면 False 반환
+    # print(game_data)
+    return parse_start_game_info(game_data, puuid)
+
+def get_active_game(puuid, platform=None, priority=PRIORITY_IDLE):
+    """
+    spectator-v5 활성 게임 응답(dict)을 그대로 반환합니다. 게임 중이 아니면(404) None.
+    응답의 participants에는 같은 게임의 10명이 모두 들어 있습니다.
+    platform은 소환사의 플랫폼 호스트(kr, na1 등)이고, 없으면 RIOT_SUMMONER_REGION을 씁니다.
+    priority는 게임 중인 소환사면 PRIORITY_IN_GAME, 대기 중이면 PRIORITY_IDLE입니다.
+    레이트 리밋 여유가 없으면 대기 중 폴링은 riot_client.RequestDeferred로 다음 주기로 미뤄집니다.
     """
     encrypted_puuid = quote(puuid)
-    url = f"https://{RIOT_SUMMONER_REGION}.api.riotgames.com/lol/spectator/v5/active-games/by-summoner/{encrypted_puuid}"
-    headers = {"X-Riot-Token": RIOT_API_KEY}
+    path = f"/lol/spectator/v5/active-games/by-summoner/{encrypted_puuid}"
 
-    response = requests.get(url, headers=headers, timeout=10)
+    response = RIOT_CLIENT.get(normalize_platform(platform), path, "spectator-v5.active-games", priority=priority)
     if response.status_code == 404:
-        return False  # 활성 게임 정보가 없으면 False 반환
+        return None
     response.raise_for_status()
-    game_data = response.json()
-    # print(game_data)
+    return response.json()
+
+def parse_start_game_info(game_data, puuid, now=None):
+    """
+    spectator-v5 활성 게임 응답(game_data)에서 puuid에 해당하는 소환사의
+    게임 시작 정보를 추출합니다. 반환 형식은 get_start_game_info와 같습니다.
+    now는 게임 경과 시간을 잴 기준 시각(유닉스 시각, 초)이고, 없으면 지금입니다.
+    """
+    participants = [Participant.from_dict(p) for p in game_data.get("participants", [])]
+
     # 대상 소환사(타겟) 찾기
-    target = None
-    for p in game_data.get("participants", []):
-        if p.get("puuid") == puuid:
-            target = p
-            break
+    target = next((p for p in participants if p.puuid == puuid), None)
     if not target:
         print("타겟 참가자를 찾을 수 없습니다.")
         return False
 
     # 선택한 챔피언 이름 조회 (championId 기준)
-    champion_id = target.get("championId")
-    champion = get_champion_name(champion_id) if champion_id else "~"
+    champion = get_champion_name(target.champion_id) if target.champion_id else "~"
 
-    # 게임 경과 시간 계산 (보정된 150초 추가 후 '분 초' 형식)
-    game_length_seconds = game_data.get("gameLength", 0) + 150
+    # 게임 경과 시간 계산 ('분 초' 형식)
+    # spectator gameLength는 로딩 화면 동안 멈춰 있어 실제보다 늦으므로, 게임이 실제로 시작된 시각(gameStartTime)부터 잼
+    # gameStartTime이 아직 0이면(로딩 중) gameLength를 그대로 씀
+    game_start_time = game_data.get("gameStartTime") or None
+    if game_start_time:
+        now = time.time() if now is None else now
+        game_length_seconds = max(0, int(now - game_start_time / 1000))
+    else:
+        game_length_seconds = max(0, int(game_data.get("gameLength", 0)))
     minutes = game_length_seconds // 60
     seconds = game_length_seconds % 60
     game_time_str = f"{minutes}분 {seconds}초"
@@ -122,221 +187,215 @@ def get_start_game_info(puuid):
         game_type = "~"
 
     # 동일 팀 참가자 추출
-    my_team_id = target.get("teamId")
-    team_participants = [p for p in game_data.get("participants", []) if p.get("teamId") == my_team_id]
+    team_participants = [p for p in participants if p.team_id == target.team_id]
 
     # 만약 팀 참가자 모두에 teamPosition 정보가 없다면(예: API 응답에 해당 필드 미존재, 5명 모두),
     # 원래 순서대로 할당하여 format_team_lineup 함수가 정상 동작하도록 함.
-    if all(not p.get("teamPosition") for p in team_participants) and len(team_participants) == 5:
+    if all(not p.team_position for p in team_participants) and len(team_participants) == 5:
         ordered_team_participants = team_participants
     else:
         # teamPosition(및 role) 값을 이용해 라인별로 참가자를 분류 (탑, 정글, 미드, 원딜, 서폿)
-        lane_mapping = {"탑": None, "정글": None, "미드": None, "원딜": None, "서폿": None}
-        for p in team_participants:
-            pos = (p.get("teamPosition") or "").upper()
-            role = (p.get("role") or "").upper()
-            lane = None
-            if pos == "TOP":
-                lane = "탑"
-            elif pos == "JUNGLE":
-                lane = "정글"
-            elif pos in ("MIDDLE", "MID"):
-                lane = "미드"
-            elif pos in ("BOTTOM",):
-                if role == "CARRY":
-                    lane = "원딜"
-                elif role == "SUPPORT":
-                    lane = "서폿"
-                else:
-                    lane = "원딜"
-            elif pos == "UTILITY":
-                lane = "서폿"
-            if lane and lane_mapping[lane] is None:
-                lane_mapping[lane] = p
-
-        ordered_team_participants = []
-        for lane in ["탑", "정글", "미드", "원딜", "서폿"]:
-            if lane_mapping[lane] is None:
-                # 해당 라인에 해당하는 플레이어 정보가 없으면 기본 더미 데이터를 사용
-                dummy = {
-                    "riotId": "~",
-                    "summonerName": "~",
-                    "summonerId": "알수없음",
-                    "championId": None,
-                    "kills": 0,
-                    "deaths": 0,
-                    "assists": 0
-                }
-                ordered_team_participants.append(dummy)
-            else:
-                ordered_team_participants.append(lane_mapping[lane])
+        # 해당 라인에 해당하는 플레이어 정보가 없으면 기본 더미 데이터를 사용
+        by_lane = assign_lanes(team_participants)
+        ordered_team_participants = [
+            by_lane[lane] or Participant(riot_id="~", summoner_name="~", summoner_id="알수없음")
+            for lane in LANES
+        ]
 
     # 팀 라인업 포맷팅: monitor_lol_game.py에서 사용하는 형식(탑, 정글, 미드, 원딜, 서폿)으로 변환
     team_lineup = format_team_lineup(ordered_team_participants)
 
     return {
         "champion": champion,
+        "championId": target.champion_id,
         "gameTime": game_time_str,
         "gameType": game_type,
         "teamLineup": team_lineup,
-        "summonerId": target.get("summonerId")
+        "summonerId": target.summoner_id,
+        "gameLength": game_length_seconds,
+        "gameStartTime": game_start_time,
+        "gameId": game_data.get("gameId"),
+        "platformId": game_data.get("platformId")
     }
 
-def get_summoner_tier(summoner_id):
+def fetch_league_entry(platform, summoner_id):
     """
-    소환사의 티어 정보를 조회합니다.
+    league-v4 entries를 조회해서 솔로 랭크 LeagueEntry를 반환합니다 (캐시 없이 매번 조회).
     API Endpoint:
       GET /lol/league/v4/entries/by-summoner/{encryptedSummonerId}
+    """
+    encrypted_summoner_id = quote(str(summoner_id))
+    path = f"/lol/league/v4/entries/by-summoner/{encrypted_summoner_id}"
+    # 게임 시작/종료 알림에 쓰이므로 이벤트 우선순위
+    response = RIOT_CLIENT.get(platform, path, "league-v4.entries-by-summoner", priority=PRIORITY_EVENT)
+    response.raise_for_status()
+    return parse_league_entries(response.json())
+
+def get_league_entry(summoner_id, platform=None):
+    """
+    소환사의 솔로 랭크 리그 정보(LeagueEntry)를 반환합니다.
+    (플랫폼, summonerId)별로 LEAGUE_CACHE_TTL초 동안 캐시되므로
+    티어와 전체 게임 수/승률을 연달아 물어도 API는 한 번만 호출됩니다.
+    조회에 실패하면(Riot 장애, 회로 차단 등) 마지막으로 받은 정보를 stale로 표시해서 돌려주고,
+    받은 적이 없으면 UNAVAILABLE_LEAGUE_ENTRY를 돌려줘서 알림은 그대로 나가게 합니다.
+    """
+    if not summoner_id:
+        return EMPTY_LEAGUE_ENTRY
+    try:
+        return LEAGUE_CACHE.get(normalize_platform(platform), summoner_id, fetch_league_entry)
+    except requests.RequestException as e:
+        print("리그 정보 조회 실패 (티어 정보 없이 알림):", e)
+        return UNAVAILABLE_LEAGUE_ENTRY
+
+def get_summoner_tier(summoner_id, platform=None):
+    """
+    소환사의 티어 정보를 조회합니다.
     반환 예시:
       "실버4 37포인트"
     """
-    encrypted_summoner_id = quote(summoner_id)
-    url = f"https://kr.api.riotgames.com/lol/league/v4/entries/by-summoner/{encrypted_summoner_id}?api_key={RIOT_API_KEY}"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    data = response.json()
-    # 일반적으로 솔로랭크 큐 "RANKED_SOLO_5x5" 정보를 사용합니다.
-    for entry in data:
-        if entry.get("queueType") == "RANKED_SOLO_5x5":
-            tier = entry.get("tier", "티어없음")
-            rank = entry.get("rank", "")
-            lp = entry.get("leaguePoints", 0)
-            # 티어 영어명을 한글로 매핑
-            tier_mapping = {
-                "IRON": "아이언",
-                "BRONZE": "브론즈",
-                "SILVER": "실버",
-                "GOLD": "골드",
-                "PLATINUM": "플래티넘",
-                "DIAMOND": "다이아몬드",
-                "MASTER": "마스터",
-                "GRANDMASTER": "그랜드마스터",
-                "CHALLENGER": "챌린저"
-            }
-            tier_kor = tier_mapping.get(tier.upper(), tier)
-            return f"{tier_kor}{rank} {lp}포인트"
-    return "티어 정보 없음"
-
-def get_finished_game_info(puuid):
-    """
-    puuid를 사용해 최근 완료된 경기 결과 정보를 조회합니다.
-    1. 최근 경기 ID 조회: GET /lol/match-v5/matches/by-puuid/{puuid}/ids?start=0&count=1
-    2. 경기 상세 정보를 통해 승리 여부, KDA, 게임 시간, 게임 종류,
+    return get_league_entry(summoner_id, platform).tier_text()
+
+class MatchNotReady(Exception):
+    """
+    끝난 게임의 경기 결과가 아직 match-v5에 공개되지 않았을 때 발생합니다 (잠시 후 다시 확인).
+    """
+
+def match_id_for_game(game_id, platform_id=None):
+    """
+    spectator gameId에 해당하는 match-v5 matchId를 만듭니다. 예: ("KR", 7000000001) → "KR_7000000001"
+    platform_id는 spectator 응답의 platformId이고, 없으면 RIOT_SUMMONER_REGION을 씁니다.
+    """
+    return f"{normalize_platform(platform_id).upper()}_{game_id}"
+
+def get_finished_game_info(puuid, game_id, platform_id=None):
+    """
+    spectator로 추적한 게임(game_id)의 경기 결과 정보를 조회합니다.
+    1. matchId는 "{플랫폼}_{gameId}"로 정해지므로 최근 경기 ID 목록을 조회하지 않고 바로
+       GET /lol/match/v5/matches/{matchId} 로 경기 상세를 받습니다.
+    2. 경기 상세를 통해 승리 여부, KDA, 게임 시간, 게임 종류,
        포지션별 팀원 정보, 팀 총 킬, 최고 킬 플레이어, 그리고 티어 정보를 추출합니다.
+    경기가 아직 공개되지 않았으면 MatchNotReady를 발생시킵니다. 그 경기에 소환사가 없으면 None.
+    """
+    return get_finished_games_info([puuid], game_id, platform_id)[puuid]
+
+def get_match_ids(puuid, region=None, start=0, count=100, queue=None, start_time=None, end_time=None,
+                  priority=PRIORITY_BACKFILL):
+    """
+    소환사의 경기 ID 목록(최신순)을 한 페이지 조회합니다.
+    GET /lol/match/v5/matches/by-puuid/{puuid}/ids
+    count는 최대 100, queue는 큐 ID(예: 420 개인 랭크), start_time/end_time은 유닉스 시각(초)입니다.
+    region은 match-v5 지역 클러스터이고, 없으면 RIOT_SUMMONER_REGION 플랫폼의 클러스터를 씁니다.
     """
-    RIOT_MATCH_REGION = os.environ.get("RIOT_MATCH_REGION", "asia")
-    puuid_encoded = quote(puuid)
-    match_ids_url = (
-        f"https://{RIOT_MATCH_REGION}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid_encoded}/ids"
-        f"?start=0&count=1&api_key={RIOT_API_KEY}"
-    )
+    region = region or regional_cluster(None)
+    params = {"start": start, "count": count}
+    if queue is not None:
+        params["queue"] = queue
+    if start_time is not None:
+        params["startTime"] = int(start_time)
+    if end_time is not None:
+        params["endTime"] = int(end_time)
+    path = f"/lol/match/v5/matches/by-puuid/{quote(puuid)}/ids"
+    response = RIOT_CLIENT.get(region, path, "match-v5.ids-by-puuid", params=params, priority=priority)
+    response.raise_for_status()
+    return response.json()
 
-    response_ids = requests.get(match_ids_url, timeout=10)
-    response_ids.raise_for_status()
-    match_ids = response_ids.json()
+def get_finished_games_info(puuids, game_id, platform_id=None):
+    """
+    같은 게임(game_id)을 마친 여러 소환사의 경기 결과를 한 번에 조회합니다.
+    경기 상세는 한 번만 받고, 그 경기 데이터로 각 소환사의 결과(get_finished_game_info와 같은 형식)를 만듭니다.
 
-    if not match_ids:
-        return None
+    게임이 끝난 직후에는 match-v5에 경기가 아직 없어서 최근 경기 ID 목록에 직전 경기가 나오므로,
+    목록 대신 그 게임의 matchId를 직접 조회합니다. 아직 공개되지 않았으면(404) MatchNotReady를 발생시킵니다.
 
-    match_id = match_ids[0]
-    # print(match_id)
-    match_url = f"https://{RIOT_MATCH_REGION}.api.riotgames.com/lol/match/v5/matches/{match_id}?api_key={RIOT_API_KEY}"
-    response_match = requests.get(match_url, timeout=10)
+    반환: {puuid: 결과 dict 또는 None}
+    """
+    match_id = match_id_for_game(game_id, platform_id)
+    try:
+        match = get_match(match_id)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            raise MatchNotReady(match_id) from None
+        raise
+    return {puuid: parse_finished_game_info(match, puuid, match_id) for puuid in puuids}
+
+def fetch_match_raw(match_id, region, priority=PRIORITY_EVENT):
+    """
+    match-v5 경기 상세 응답 원문(bytes)을 API에서 받아옵니다.
+    GET /lol/match/v5/matches/{matchId}
+    끝난 게임의 결과 조회는 PRIORITY_EVENT, 전적 백필은 PRIORITY_BACKFILL로 보냅니다.
+    """
+    match_path = f"/lol/match/v5/matches/{quote(match_id)}"
+    response_match = RIOT_CLIENT.get(region, match_path, "match-v5.match", priority=priority)
     response_match.raise_for_status()
-    match_data = response_match.json()
-    # print(match_data)
-    participants = match_data.get("info", {}).get("participants", [])
-    target = None
-    for p in participants:
-        if p.get("puuid") == puuid:
-            target = p
-            break
+    return response_match.content
+
+def get_match(match_id, region=None):
+    """
+    경기 상세 정보를 필요한 필드만 읽은 MatchRecord(participants.py)로 반환합니다.
+    로컬 경기 저장소(MATCH_STORE)를 먼저 확인하고, 없을 때만 API를 호출해서 저장합니다.
+    region을 주지 않으면 matchId의 플랫폼("KR_..." → asia)으로 지역 클러스터를 정합니다.
+    """
+    region = region or regional_cluster(platform_of_match(match_id))
+    return MATCH_STORE.get_or_fetch(match_id, lambda mid: fetch_match_raw(mid, region))
+
+def parse_finished_game_info(match, puuid, match_id):
+    """
+    경기 상세(MatchRecord)에서 puuid에 해당하는 소환사의
+    경기 결과 정보를 추출합니다. 반환 형식은 get_finished_game_info와 같습니다.
+    """
+    target = match.participant(puuid)
     if not target:
         return None
 
     # 게임 시간 변환 (초 → 분:초)
-    game_duration_sec = match_data.get("info", {}).get("gameDuration", 0)
+    game_duration_sec = match.game_duration or 0
     minutes = game_duration_sec // 60
     seconds = game_duration_sec % 60
     game_time = f"{minutes}분 {seconds:02d}초"
 
     # 게임 종류 설정 (queueId에 따라)
-    queue_id = match_data.get("info", {}).get("queueId")
-    if queue_id == 420:
+    if match.queue_id == 420:
         game_type = "개인 랭크"
-    elif queue_id == 440:
+    elif match.queue_id == 440:
         game_type = "자유 랭크"
     else:
         game_type = "특별 게임 모드"
 
     # 같은 팀 참가자 추출
-    team_id = target.get("teamId")
-    team_participants = [p for p in participants if p.get("teamId") == team_id]
-
-    # 포지션별 팀원 정보 초기화
-    team_lineup = {
-        "탑": "~",
-        "정글": "~",
-        "미드": "~",
-        "원딜": "~",
-        "서폿": "~"
-    }
+    team_participants = match.team(target.team_id)
 
-    for p in team_participants:
-        pos = (p.get("teamPosition") or "").upper()
-        role = (p.get("role") or "").upper()
-        lane = None
-        if pos == "TOP":
-            lane = "탑"
-        elif pos == "JUNGLE":
-            lane = "정글"
-        elif pos in ("MIDDLE", "MID"):
-            lane = "미드"
-        elif pos in ("BOTTOM",):
-            if role == "CARRY":
-                lane = "원딜"
-            elif role == "SUPPORT":
-                lane = "서폿"
-            else:
-                lane = "원딜"
-        elif pos == "UTILITY":
-            lane = "서폿"
-        else:
-            if role == "SUPPORT":
-                lane = "서폿"
-            elif role == "CARRY":
-                lane = "원딜"
-        if lane:
-            nickname = p.get("riotIdGameName") or p.get("summonerName") or "~"
-            champion_id = p.get("championId")
-            # 챔피언 ID가 있으면 한국어 이름 반환, 없으면 "~" 사용
-            champ = get_champion_name(champion_id) if champion_id else "~"
-            k = p.get("kills", 0)
-            d = p.get("deaths", 0)
-            a = p.get("assists", 0)
-            lineup_str = f"{nickname} [{champ}, {k}/{d}/{a}]"
-            team_lineup[lane] = lineup_str
+    # 포지션별 팀원 정보 (teamPosition/role 기준, 해당 라인에 아무도 없으면 "~")
+    team_lineup = {}
+    for lane, p in assign_lanes(team_participants).items():
+        if p is None:
+            team_lineup[lane] = "~"
+            continue
+        nickname = p.riot_id_game_name or p.summoner_name or "~"
+        # 챔피언 ID가 있으면 한국어 이름 반환, 없으면 "~" 사용
+        champ = get_champion_name(p.champion_id) if p.champion_id else "~"
+        team_lineup[lane] = f"{nickname} [{champ}, {p.kda_text}]"
 
     # 팀 전체 킬 및 최고 킬 플레이어 계산
-    team_total_kills = sum(p.get("kills", 0) for p in team_participants)
+    team_total_kills = sum(p.kills for p in team_participants)
     top_killer = None
     max_kills = -1
     for p in team_participants:
-        kills = p.get("kills", 0)
-        if kills > max_kills:
-            max_kills = kills
-            top_killer = p.get("riotIdGameName") or p.get("summonerName")
+        if p.kills > max_kills:
+            max_kills = p.kills
+            top_killer = p.riot_id_game_name or p.summoner_name
     top_killer_info = f"{top_killer} ({max_kills}킬)" if top_killer else ""
 
-    # 플레이어 티어 정보 (솔로 랭크 기준)
-    summoner_id = target.get("summonerId")
-    tier_info = get_summoner_tier(summoner_id) if summoner_id else "티어 정보 없음"
+    # 플레이어 티어 정보 (솔로 랭크 기준, 경기가 열린 플랫폼에서 조회)
+    summoner_id = target.summoner_id
+    tier_info = get_summoner_tier(summoner_id, platform_of_match(match_id)) if summoner_id else "티어 정보 없음"
 
     return {
-        "win": target.get("win", False),
-        "kills": target.get("kills", 0),
-        "deaths": target.get("deaths", 0),
-        "assists": target.get("assists", 0),
+        "win": target.win,
+        "champion": get_champion_name(target.champion_id) if target.champion_id else "~",
+        "championId": target.champion_id,
+        "kills": target.kills,
+        "deaths": target.deaths,
+        "assists": target.assists,
         "matchId": match_id,
         "gameTime": game_time,
         "gameType": game_type,
@@ -344,10 +403,20 @@ def get_finished_game_info(puuid):
         "teamLineup": team_lineup,
         "teamTotalKills": team_total_kills,
         "topKiller": top_killer_info,
-        "summonerId": summoner_id
+        "summonerId": summoner_id,
+        "gameEndTimestamp": match.game_end_timestamp
     }
 
-def get_overall_game_stats(summoner_id):
+def get_recent_stats(puuid, champion_id=None):
+    """
+    로컬 경기 저장소에 쌓인 경기로 계산한 최근 전적(analytics.RecentStats)을 반환합니다. 저장된 경기가 없으면 None.
+    API를 호출하지 않습니다. champion_id를 주면 그 챔피언으로 한 경기의 전적도 함께 계산합니다.
+    """
+    if not puuid:
+        return None
+    return ANALYTICS.recent_stats(puuid, champion_id)
+
+def get_overall_game_stats(summoner_id, platform=None):
     """
     주어진 summoner_id로 솔로 랭크 (RANKED_SOLO_5x5) 전체 게임 정보를 조회하여
     전체 게임 수, 이긴 판 수, 패배한 판 수, 승률을 반환합니다.
@@ -355,19 +424,4 @@ def get_overall_game_stats(summoner_id):
     반환 예시:
        total_games, win_count, loss_count, win_rate
     """
-    encrypted_summoner_id = quote(str(summoner_id))
-    url = f"https://{RIOT_SUMMONER_REGION}.api.riotgames.com/lol/league/v4/entries/by-summoner/{encrypted_summoner_id}?api_key={RIOT_API_KEY}"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    data = response.json()
-
-    # 솔로 랭크 결과(RANKED_SOLO_5x5) 찾기
-    solo = next((entry for entry in data if entry.get("queueType") == "RANKED_SOLO_5x5"), None)
-    if solo:
-        wins = solo.get("wins", 0)
-        losses = solo.get("losses", 0)
-        total = wins + losses
-        win_rate = round(wins * 100 / total, 2) if total > 0 else 0
-        return total, wins, losses, win_rate
-    else:
-        return 0, 0, 0, 0
\ No newline at end of file
+    return get_league_entry(summoner_id, platform).overall_stats()
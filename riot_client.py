@@ -0,0 +1,501 @@
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import (
+    RIOT_REQUEST_SECONDS, RIOT_RESPONSES, RIOT_RATE_LIMITED, RIOT_REQUEST_ERRORS,
+    RIOT_BUDGET_REMAINING, RIOT_THROTTLE_SECONDS, RIOT_DEFERRED, RIOT_CIRCUIT_REJECTED, RIOT_CIRCUIT_STATE
+)
+
+# 요청 우선순위 (숫자가 작을수록 먼저). 같은 호스트에서 더 높은 우선순위 요청이 기다리는 동안에는 낮은 우선순위 요청이 나가지 않습니다.
+PRIORITY_EVENT = 0      # 게임 이벤트 처리 (종료 후 경기 결과, 시작 알림용 리그 정보)
+PRIORITY_IN_GAME = 1    # 게임 중인 소환사의 spectator 폴링
+PRIORITY_IDLE = 2       # 대기 중인 소환사의 spectator 폴링, 계정 조회
+PRIORITY_BACKFILL = 3   # 전적 백필
+PRIORITY_NAMES = ("event", "in_game", "idle", "backfill")
+
+# 우선순위별로 남겨 둬야 하는 한도 비율. 창 안의 남은 요청이 이 비율 이하로 줄면 그 우선순위 요청은 창이 비워질 때까지 기다립니다.
+# (예: 100:120 한도에서 대기 폴링은 남은 요청이 20개 이하면 기다리고, 그 20개는 게임 중/이벤트 요청이 씀)
+PRIORITY_HEADROOM = (0.0, 0.05, 0.2, 0.5)
+
+
+class RequestDeferred(Exception):
+    """
+    레이트 리밋 여유가 없어 낮은 우선순위 요청을 max_wait 안에 보내지 못했을 때 발생합니다 (다음 주기로 미룸).
+    """
+
+
+class CircuitOpen(requests.RequestException):
+    """
+    (호스트, 메서드)의 회로 차단기가 열려 있어서 요청을 보내지 않고 바로 실패했습니다 (그 지역의 Riot 장애 등).
+    requests.RequestException이므로 호출하는 쪽에서는 연결 오류와 같이 처리하면 됩니다.
+    """
+
+
+class CircuitBreaker:
+    """
+    (호스트, 메서드) 하나의 회로 차단기.
+
+    - closed: 평소 상태. 연결 오류, 시간 초과, 5xx 응답이 failure_threshold번 연속되면 open이 됩니다.
+    - open: reset_timeout초 동안 요청을 보내지 않고 바로 CircuitOpen으로 실패합니다.
+    - half_open: reset_timeout이 지나면 시험 요청 하나만 보내 봅니다. 성공하면 closed로 돌아가고,
+      실패하면 다시 open이 되며 기다리는 시간을 두 배씩 max_reset_timeout초까지 늘립니다.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, max_reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """
+        요청을 보내도 되면 True. half_open에서는 시험 요청 하나에만 True를 반환합니다.
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() < self.opened_at + self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def release(self):
+        """
+        allow()로 받은 시험 요청의 결과를 기록하지 못했을 때 (레이트 리밋으로 미뤄짐, 코디네이터 오류 등)
+        다른 요청이 시험할 수 있게 돌려놓습니다.
+        """
+        with self.lock:
+            self.probing = False
+
+    def record_success(self):
+        """
+        요청이 성공했습니다. 회로가 열려 있었으면 닫고 True를 반환합니다.
+        """
+        with self.lock:
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+            self.reset_timeout = self.base_reset_timeout
+            return recovered
+
+    def record_failure(self):
+        """
+        요청이 실패했습니다. 이번 실패로 회로가 열렸으면 True를 반환합니다.
+        """
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            elif self.state == self.OPEN or self.failures < self.failure_threshold:
+                return False
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probing = False
+            return True
+
+
+def parse_rate_limit(header_value):
+    """
+    "20:1,100:120" 형식의 Riot 레이트 리밋 헤더를 [(20, 1), (100, 120)] 으로 변환합니다.
+    X-App-Rate-Limit-Count 처럼 "횟수:초" 형식인 헤더에도 그대로 사용합니다.
+    """
+    pairs = []
+    for part in (header_value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        count, seconds = part.split(":", 1)
+        pairs.append((int(count), int(seconds)))
+    return pairs
+
+
+class RateLimitWindow:
+    """
+    "seconds초 동안 limit회" 제한 하나.
+    최근 요청 시각을 기록해 두고, 창 안의 요청 수가 limit에 도달하면 가장 오래된 요청이
+    창 밖으로 나갈 때까지 기다리도록 합니다 (슬라이딩 윈도우 토큰 버킷).
+    """
+
+    def __init__(self, limit, seconds):
+        self.limit = limit
+        self.seconds = seconds
+        self.timestamps = deque()
+
+    def _expire(self, now):
+        while self.timestamps and self.timestamps[0] <= now - self.seconds:
+            self.timestamps.popleft()
+
+    def wait_time(self, now, headroom=0.0):
+        """
+        요청 1회를 보내려면 기다려야 하는 시간(초). headroom은 남겨 둘 한도 비율입니다 (우선순위가 낮은 요청용).
+        """
+        self._expire(now)
+        limit = max(1, self.limit - int(self.limit * headroom))
+        if len(self.timestamps) < limit:
+            return 0.0
+        return self.timestamps[len(self.timestamps) - limit] + self.seconds - now
+
+    def remaining(self, now):
+        self._expire(now)
+        return max(0, self.limit - len(self.timestamps))
+
+    def record(self, now):
+        self.timestamps.append(now)
+
+    def sync(self, server_count, now):
+        """
+        서버가 알려준 현재 사용량(X-*-Rate-Limit-Count)이 로컬 기록보다 많으면
+        (다른 프로세스가 같은 키를 쓰는 경우 등) 그만큼 사용한 것으로 채웁니다.
+        """
+        self._expire(now)
+        for _ in range(server_count - len(self.timestamps)):
+            self.timestamps.append(now)
+
+
+class RateLimiter:
+    """
+    여러 RateLimitWindow를 묶은 레이트 리미터 (앱 전체 또는 메서드 하나에 해당).
+    제한 값은 응답 헤더를 받을 때마다 갱신됩니다.
+    """
+
+    def __init__(self, limits=None):
+        self.windows = {}
+        self.blocked_until = 0.0
+        if limits:
+            self.update_limits(limits)
+
+    def update_limits(self, limits):
+        windows = {}
+        for limit, seconds in limits:
+            window = self.windows.get(seconds)
+            if window is None:
+                window = RateLimitWindow(limit, seconds)
+            window.limit = limit
+            windows[seconds] = window
+        self.windows = windows
+
+    def sync_counts(self, counts, now):
+        for count, seconds in counts:
+            window = self.windows.get(seconds)
+            if window is not None:
+                window.sync(count, now)
+
+    def wait_time(self, now, headroom=0.0):
+        wait = max(0.0, self.blocked_until - now)
+        for window in self.windows.values():
+            wait = max(wait, window.wait_time(now, headroom))
+        return wait
+
+    def remaining(self, now):
+        """
+        가장 빡빡한 창 기준으로 지금 바로 보낼 수 있는 요청 수. 제한 정보가 없으면 None.
+        """
+        if not self.windows:
+            return None
+        return min(window.remaining(now) for window in self.windows.values())
+
+    def record(self, now):
+        for window in self.windows.values():
+            window.record(now)
+
+
+class RateBudget:
+    """
+    호스트별 앱 레이트 리밋과 (호스트, 메서드)별 메서드 레이트 리밋 모음.
+    RiotClient가 요청 전에 reserve()로 요청 1회를 잡고, 응답 헤더와 429로 한도를 갱신합니다.
+    샤딩 모드에서는 코디네이터(sharding.py)가 이 객체 하나를 여러 워커 프로세스에 나눠 줍니다.
+    """
+
+    def __init__(self, default_app_limits="20:1,100:120"):
+        self.default_app_limits = parse_rate_limit(default_app_limits)
+        self.app_limiters = {}
+        self.method_limiters = {}
+        self.lock = threading.Lock()
+
+    def _limiters(self, host, method):
+        app = self.app_limiters.get(host)
+        if app is None:
+            app = self.app_limiters[host] = RateLimiter(self.default_app_limits)
+        method_limiter = self.method_limiters.get((host, method))
+        if method_limiter is None:
+            method_limiter = self.method_limiters[(host, method)] = RateLimiter()
+        return app, method_limiter
+
+    def reserve(self, host, method, priority=PRIORITY_EVENT):
+        """
+        앱/메서드 리미터 모두에 여유가 있으면 요청 1회를 기록하고 (0, None)을,
+        아니면 (기다려야 할 시간(초), 더 오래 막고 있는 쪽 "app" 또는 "method")를 반환합니다.
+        우선순위가 낮을수록 PRIORITY_HEADROOM만큼 한도를 남겨 두고 기다립니다.
+        """
+        headroom = PRIORITY_HEADROOM[priority]
+        with self.lock:
+            app, method_limiter = self._limiters(host, method)
+            now = time.monotonic()
+            app_wait = app.wait_time(now, headroom)
+            method_wait = method_limiter.wait_time(now, headroom)
+            if app_wait <= 0 and method_wait <= 0:
+                app.record(now)
+                method_limiter.record(now)
+                return 0.0, None
+            return (app_wait, "app") if app_wait >= method_wait else (method_wait, "method")
+
+    def update_from_headers(self, host, method, headers):
+        with self.lock:
+            app, method_limiter = self._limiters(host, method)
+            now = time.monotonic()
+            if headers.get("X-App-Rate-Limit"):
+                app.update_limits(parse_rate_limit(headers["X-App-Rate-Limit"]))
+            if headers.get("X-App-Rate-Limit-Count"):
+                app.sync_counts(parse_rate_limit(headers["X-App-Rate-Limit-Count"]), now)
+            if headers.get("X-Method-Rate-Limit"):
+                method_limiter.update_limits(parse_rate_limit(headers["X-Method-Rate-Limit"]))
+            if headers.get("X-Method-Rate-Limit-Count"):
+                method_limiter.sync_counts(parse_rate_limit(headers["X-Method-Rate-Limit-Count"]), now)
+
+    def block(self, host, method, limit_type, retry_after):
+        """
+        429 응답을 받은 리미터를 retry_after초 동안 막습니다.
+        limit_type이 application이면 앱 리미터를, 그 밖의 경우(method, service 또는 헤더 없음)에는 메서드 리미터를 막습니다.
+        """
+        with self.lock:
+            app, method_limiter = self._limiters(host, method)
+            until = time.monotonic() + retry_after
+            if limit_type == "application":
+                app.blocked_until = max(app.blocked_until, until)
+            else:
+                method_limiter.blocked_until = max(method_limiter.blocked_until, until)
+
+    def remaining(self, host, method=None):
+        """
+        (앱 잔여 요청 수, 메서드 잔여 요청 수)를 반환합니다. 아직 모르는 값은 None.
+        """
+        with self.lock:
+            now = time.monotonic()
+            app = self.app_limiters.get(host)
+            method_limiter = self.method_limiters.get((host, method))
+            return (
+                app.remaining(now) if app else None,
+                method_limiter.remaining(now) if method_limiter else None,
+            )
+
+    def snapshot(self):
+        """
+        [(호스트, "app" 또는 메서드 이름, 잔여 요청 수), ...] 잔여 요청 수를 아직 모르면 None.
+        """
+        with self.lock:
+            now = time.monotonic()
+            budgets = [(host, "app", limiter.remaining(now)) for host, limiter in self.app_limiters.items()]
+            budgets += [
+                (host, method, limiter.remaining(now))
+                for (host, method), limiter in self.method_limiters.items()
+            ]
+        return budgets
+
+
+class RiotClient:
+    """
+    모든 riot_api 호출이 공유하는 Riot API HTTP 클라이언트.
+
+    - 라우팅 호스트(kr, asia 등)마다 keep-alive 커넥션 풀(requests.Session)을 재사용합니다.
+    - 호스트별 앱 레이트 리밋과 (호스트, 메서드)별 메서드 레이트 리밋을 응답 헤더
+      (X-App-Rate-Limit / X-Method-Rate-Limit 및 *-Count)로 채우고,
+      한도에 닿기 전에 요청을 지연시킵니다.
+    - 그래도 429를 받으면 Retry-After 만큼 해당 리미터를 막아 두고 재시도합니다.
+    - 메서드별 응답 시간, 상태 코드, 429 횟수, 리미터 대기 시간을 metrics에 기록합니다.
+    - budget을 주면 레이트 리밋을 그 객체와 나눠 씁니다 (샤딩 모드의 RemoteRateBudget 등).
+    - 요청마다 우선순위(PRIORITY_*)를 받습니다. 호스트별로 더 높은 우선순위 요청이 기다리는 동안 낮은 우선순위 요청은 멈추고,
+      한도가 빠듯하면 낮은 우선순위부터 기다리며, 대기 폴링(PRIORITY_IDLE)은 idle_max_wait초 넘게 기다려야 하면
+      RequestDeferred로 포기합니다 (다음 폴링 주기에 다시 시도).
+    - (호스트, 메서드)마다 회로 차단기(CircuitBreaker)를 둡니다. 한 지역의 한 엔드포인트가 계속 실패하면
+      시간 초과를 기다리지 않고 CircuitOpen으로 바로 실패하고, 가끔 시험 요청 하나로 복구를 확인합니다.
+    """
+
+    def __init__(self, api_key, default_app_limits="20:1,100:120", pool_size=32, max_retries=3, timeout=10,
+                 base_url="https://{host}.api.riotgames.com", budget=None, idle_max_wait=5,
+                 breaker_threshold=5, breaker_reset=30, breaker_max_reset=300):
+        self.api_key = api_key
+        self.base_url_template = base_url
+        self.budget = budget or RateBudget(default_app_limits)
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.idle_max_wait = idle_max_wait
+        self.sessions = {}
+        self.lock = threading.Lock()
+        # 호스트별로 앱 한도를 기다리는 요청 수 (우선순위별)
+        self.waiting = {}
+        self.waiting_changed = threading.Condition()
+        self.breaker_options = (breaker_threshold, breaker_reset, breaker_max_reset)
+        self.breakers = {}
+
+    def base_url(self, host):
+        return self.base_url_template.format(host=host)
+
+    def session(self, host):
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["X-Riot-Token"] = self.api_key
+                self.sessions[host] = session
+            return session
+
+    def breaker(self, host, method):
+        with self.lock:
+            breaker = self.breakers.get((host, method))
+            if breaker is None:
+                breaker = self.breakers[(host, method)] = CircuitBreaker(*self.breaker_options)
+            return breaker
+
+    def _record_failure(self, host, method, breaker):
+        if breaker.record_failure():
+            print(f"Riot API 회로 열림 ({host} {method}): {breaker.reset_timeout:.0f}초 동안 요청을 보내지 않습니다.")
+
+    def _preempted(self, host, priority):
+        # 호출하는 쪽에서 self.waiting_changed를 잡고 불러야 함
+        waiting = self.waiting.get(host)
+        return waiting is not None and any(waiting[:priority])
+
+    def acquire(self, host, method, priority=PRIORITY_EVENT):
+        """
+        앱/메서드 리미터 모두에 여유가 생길 때까지 기다린 뒤 요청 1회를 기록합니다.
+        같은 호스트의 앱 한도를 더 높은 우선순위 요청이 기다리고 있으면 그 요청들이 나갈 때까지 기다립니다.
+        PRIORITY_IDLE 요청은 idle_max_wait초 안에 보내지 못하면 RequestDeferred를 발생시킵니다.
+        """
+        started = time.monotonic()
+        waiting = None
+        try:
+            while True:
+                with self.waiting_changed:
+                    preempted = self._preempted(host, priority)
+                wait = None
+                if not preempted:
+                    wait, scope = self.budget.reserve(host, method, priority)
+                    if wait <= 0:
+                        return
+                    # 앱 한도 때문에 기다리는 요청만 같은 호스트의 낮은 우선순위 요청을 멈춤
+                    # (메서드 한도는 다른 메서드 요청과 상관없음)
+                    with self.waiting_changed:
+                        if (scope == "app") != (waiting is not None):
+                            if waiting is None:
+                                waiting = self.waiting.setdefault(host, [0] * len(PRIORITY_NAMES))
+                                waiting[priority] += 1
+                            else:
+                                waiting[priority] -= 1
+                                waiting = None
+                            self.waiting_changed.notify_all()
+                if priority == PRIORITY_IDLE and time.monotonic() - started + (wait or 0) > self.idle_max_wait:
+                    RIOT_DEFERRED.inc(method, PRIORITY_NAMES[priority])
+                    raise RequestDeferred(method)
+                paused = time.monotonic()
+                with self.waiting_changed:
+                    # 높은 우선순위 요청이 나가면(대기 수가 바뀌면) 바로 깨어나서 다시 확인
+                    self.waiting_changed.wait(1.0 if wait is None else wait)
+                RIOT_THROTTLE_SECONDS.inc(method, amount=time.monotonic() - paused)
+        finally:
+            if waiting is not None:
+                with self.waiting_changed:
+                    waiting[priority] -= 1
+                    self.waiting_changed.notify_all()
+
+    def _update_from_headers(self, host, method, headers):
+        self.budget.update_from_headers(host, method, headers)
+
+    def _block(self, host, method, headers):
+        """
+        429 응답의 Retry-After(초)만큼 해당 리미터를 막고, 기다릴 시간을 반환합니다.
+        """
+        retry_after = float(headers.get("Retry-After") or 1)
+        limit_type = (headers.get("X-Rate-Limit-Type") or "").lower()
+        RIOT_RATE_LIMITED.inc(method, limit_type or "unknown")
+        self.budget.block(host, method, limit_type, retry_after)
+        return retry_after
+
+    def get(self, host, path, method, params=None, priority=PRIORITY_EVENT):
+        """
+        GET {host}{path} 요청을 보내고 응답을 반환합니다.
+        host는 라우팅 값(kr, asia 등), method는 레이트 리밋을 구분하는 메서드 이름, priority는 PRIORITY_* 값입니다.
+        429는 재시도 횟수 안에서 자동으로 재시도하고, 그 밖의 상태 코드 처리는 호출하는 쪽에 맡깁니다.
+        (호스트, 메서드)의 회로가 열려 있으면 요청을 보내지 않고 CircuitOpen을 발생시킵니다.
+        """
+        url = self.base_url(host) + path
+        session = self.session(host)
+        breaker = self.breaker(host, method)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                RIOT_CIRCUIT_REJECTED.inc(method)
+                raise CircuitOpen(f"{host} {method} 회로가 열려 있습니다 (Riot API 장애).")
+            # 결과(성공/실패)를 회로에 기록했는지. 기록하지 못하고 빠져나가면 시험 요청 자리를 돌려놓음
+            # (레이트 리밋으로 미뤄짐, 코디네이터 연결 오류, 중단 등)
+            settled = False
+            try:
+                self.acquire(host, method, priority)
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, params=params, timeout=self.timeout)
+                except requests.RequestException:
+                    RIOT_REQUEST_ERRORS.inc(method)
+                    settled = True
+                    self._record_failure(host, method, breaker)
+                    raise
+                finally:
+                    RIOT_REQUEST_SECONDS.observe(method, value=time.perf_counter() - started)
+                RIOT_RESPONSES.inc(method, str(response.status_code))
+                settled = True
+                if response.status_code >= 500:
+                    self._record_failure(host, method, breaker)
+                elif breaker.record_success():
+                    print(f"Riot API 회로 닫힘 ({host} {method}): 응답이 돌아왔습니다.")
+            finally:
+                if not settled:
+                    breaker.release()
+            self._update_from_headers(host, method, response.headers)
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+            retry_after = self._block(host, method, response.headers)
+            print(f"Riot API 429 응답 ({method}): {retry_after}초 후 재시도")
+        return response
+
+    def remaining_budget(self, host, method=None):
+        """
+        (앱 잔여 요청 수, 메서드 잔여 요청 수)를 반환합니다. 아직 모르는 값은 None.
+        """
+        return self.budget.remaining(host, method)
+
+    def export_budget(self):
+        """
+        호스트별 앱 잔여 요청 수와 (호스트, 메서드)별 잔여 요청 수를 지표 게이지에 채웁니다.
+        metrics.METRICS.add_collector()로 등록해서 지표를 내보낼 때마다 호출됩니다.
+        """
+        for host, scope, remaining in self.budget.snapshot():
+            if remaining is not None:
+                RIOT_BUDGET_REMAINING.set(host, scope, value=remaining)
+
+    def export_circuits(self):
+        """
+        (호스트, 메서드)별 회로 상태를 지표 게이지에 채웁니다 (0: closed, 1: half_open, 2: open).
+        """
+        with self.lock:
+            breakers = list(self.breakers.items())
+        for (host, method), breaker in breakers:
+            RIOT_CIRCUIT_STATE.set(host, method, value=(CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN,
+                                                        CircuitBreaker.OPEN).index(breaker.state))
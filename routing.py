@@ -0,0 +1,79 @@
+"""
+Riot API 라우팅 표 (플랫폼 → 지역 클러스터).
+
+spectator-v5 / league-v4 는 플랫폼 호스트(kr, jp1, na1, euw1 등)로, match-v5 는 지역 클러스터(asia, americas, europe, sea)로,
+account-v1 은 가까운 계정 클러스터(americas, asia, europe)로 보냅니다.
+RiotClient는 호스트마다 레이트 리밋을 따로 두므로, 서로 다른 지역으로 가는 요청은 서로의 한도를 기다리지 않습니다.
+
+소환사 목록에는 "이름#태그@플랫폼" (예: "Hide on bush#KR1@kr", "Doublelift#NA1@na1") 형식으로 플랫폼을 지정할 수 있고,
+지정하지 않으면 RIOT_SUMMONER_REGION을 씁니다.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+from config import RIOT_REGION, RIOT_SUMMONER_REGION, RIOT_MATCH_REGION
+
+# 플랫폼 → match-v5 지역 클러스터
+PLATFORM_REGIONS = {
+    "br1": "americas", "la1": "americas", "la2": "americas", "na1": "americas",
+    "eun1": "europe", "euw1": "europe", "tr1": "europe", "ru": "europe", "me1": "europe",
+    "jp1": "asia", "kr": "asia",
+    "oc1": "sea", "ph2": "sea", "sg2": "sea", "th2": "sea", "tw2": "sea", "vn2": "sea",
+}
+
+# match-v5 지역 클러스터 → account-v1 클러스터 (account-v1에는 sea가 없음)
+ACCOUNT_REGIONS = {"americas": "americas", "asia": "asia", "europe": "europe", "sea": "asia"}
+
+
+class Route(NamedTuple):
+    """
+    소환사 한 명의 요청을 보낼 호스트들.
+    platform: spectator/league 호스트, region: match-v5 호스트, account_region: account-v1 호스트
+    """
+    platform: str
+    region: str
+    account_region: str
+
+
+def normalize_platform(platform):
+    """
+    "KR", " NA1 " 같은 플랫폼 값(spectator platformId, matchId 앞부분 포함)을 호스트 이름(kr, na1)으로 바꿉니다.
+    비어 있으면 RIOT_SUMMONER_REGION.
+    """
+    return (platform or RIOT_SUMMONER_REGION).strip().lower()
+
+
+def regional_cluster(platform):
+    """
+    플랫폼의 match-v5 지역 클러스터. 표에 없는 플랫폼이면 RIOT_MATCH_REGION(기본 asia).
+    """
+    return PLATFORM_REGIONS.get(normalize_platform(platform), RIOT_MATCH_REGION)
+
+
+@lru_cache(maxsize=None)
+def route_for(platform=None):
+    """
+    플랫폼의 Route. 같은 플랫폼이면 같은 Route 객체를 돌려주므로 소환사마다 따로 만들지 않습니다.
+    """
+    platform = normalize_platform(platform)
+    region = regional_cluster(platform)
+    return Route(platform, region, ACCOUNT_REGIONS.get(region, RIOT_REGION))
+
+
+def platform_of_match(match_id):
+    """
+    matchId("KR_7000000001")가 속한 플랫폼 호스트 이름 ("kr").
+    """
+    return normalize_platform(match_id.split("_", 1)[0]) if "_" in match_id else normalize_platform(None)
+
+
+def split_summoner(spec):
+    """
+    소환사 목록 항목 "이름#태그@플랫폼"을 (Riot ID, 플랫폼)으로 나눕니다. 플랫폼이 없으면 RIOT_SUMMONER_REGION.
+    표에 없는 플랫폼이면 ValueError.
+    """
+    riot_id, _, platform = spec.partition("@")
+    platform = normalize_platform(platform)
+    if platform not in PLATFORM_REGIONS and platform != normalize_platform(None):
+        raise ValueError(f"알 수 없는 플랫폼입니다: {platform} ({spec})")
+    return riot_id.strip(), platform
@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import random
+
+# 게임 중 폴링 구간 (게임 경과 시간 기준, 초)
+REMAKE_WINDOW = 4 * 60       # 다시하기(리메이크)가 가능한 초반 구간
+SURRENDER_TIME = 15 * 60     # 항복이 가능해지는 시점. 이 전에는 리메이크가 아니면 거의 끝나지 않음
+LIKELY_END_TIME = 25 * 60    # 이 시점 이후로는 언제든 끝날 수 있다고 보고 가장 촘촘하게 폴링
+
+
+class PollPolicy:
+    """
+    소환사 상태에 따라 다음 폴링까지의 간격(초)을 정합니다.
+
+    - 대기 중: min_interval에서 시작해 폴링할 때마다 idle_backoff배씩 늘려 idle_max까지.
+      게임이 끝나면 바로 다시 큐를 돌리는 경우가 많으므로 종료 직후에는 다시 min_interval부터 시작합니다.
+    - 게임 중: spectator gameLength로 계산한 경과 시간 기준으로
+      리메이크 구간은 1분, 항복 가능 전까지는 드문드문, 이후에는 점점 촘촘하게 폴링합니다.
+    - 게임이 끝난 뒤 경기 결과 확인: result_delay에서 시작해 확인할 때마다 두 배씩 result_max_delay까지.
+    - 모든 간격에 ±jitter 비율의 무작위 값을 더해서 수천 명이 같은 순간에 몰리지 않게 합니다.
+    """
+
+    def __init__(self, min_interval=15, idle_max=60, idle_backoff=1.5, jitter=0.1,
+                 result_delay=10, result_max_delay=60):
+        self.min_interval = min_interval
+        self.idle_max = idle_max
+        self.idle_backoff = idle_backoff
+        self.jitter = jitter
+        self.result_delay = result_delay
+        self.result_max_delay = result_max_delay
+
+    def idle_delay(self, idle_polls):
+        return min(self.idle_max, self.min_interval * self.idle_backoff ** idle_polls)
+
+    def in_game_delay(self, elapsed):
+        if elapsed < REMAKE_WINDOW:
+            return max(self.min_interval, min(60, REMAKE_WINDOW - elapsed))
+        if elapsed < SURRENDER_TIME:
+            # 항복 가능 시점까지 남은 시간의 절반씩 (최대 5분) 기다림
+            return max(self.min_interval, min(300, (SURRENDER_TIME - elapsed) / 2))
+        if elapsed < LIKELY_END_TIME:
+            return max(self.min_interval, 2 * self.min_interval)
+        return self.min_interval
+
+    def result_check_delay(self, attempts):
+        """
+        경기 결과를 attempts번 확인한 뒤(아직 공개되지 않음) 다음 확인까지 기다릴 시간(초).
+        """
+        base = min(self.result_max_delay, self.result_delay * 2 ** attempts)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def delay(self, in_game, idle_polls=0, elapsed=0):
+        """
+        다음 폴링까지 기다릴 시간(초). in_game이면 elapsed(게임 경과 초)를, 아니면 연속 대기 폴링 횟수를 사용합니다.
+        """
+        base = self.in_game_delay(elapsed) if in_game else self.idle_delay(idle_polls)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class PollScheduler:
+    """
+    소환사별 다음 폴링 시각을 담는 최소 힙.
+    같은 키를 다시 예약하면 이전 예약은 무시됩니다 (지연 삭제).
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.due = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.due)
+
+    def schedule(self, key, at):
+        self.due[key] = at
+        heapq.heappush(self.heap, (at, next(self.counter), key))
+
+    def remove(self, key):
+        self.due.pop(key, None)
+
+    def _discard_stale(self):
+        while self.heap:
+            at, _, key = self.heap[0]
+            if self.due.get(key) == at:
+                return
+            heapq.heappop(self.heap)
+
+    def next_due(self):
+        """
+        가장 이른 예약 시각. 예약이 없으면 None.
+        """
+        self._discard_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """
+        now 이전으로 예약된 키를 모두 꺼냅니다 (꺼낸 키는 다시 예약해야 폴링됩니다).
+        """
+        keys = []
+        while True:
+            self._discard_stale()
+            if not self.heap or self.heap[0][0] > now:
+                return keys
+            _, _, key = heapq.heappop(self.heap)
+            del self.due[key]
+            keys.append(key)
@@ -0,0 +1,222 @@
+"""
+샤딩 모드: 모니터링 대상 소환사를 여러 워커 프로세스(여러 호스트 가능)에 나눠 감시합니다.
+
+- 소환사는 Riot ID의 일관된 해싱(HashRing)으로 워커에 배정됩니다. 워커가 들어오거나 빠져도
+  그 워커 몫의 소환사만 옮겨 가고 나머지는 그대로 남습니다.
+- 워커 목록과 레이트 리밋은 코디네이터(rate_coordinator.py) 하나가 관리합니다. 모든 워커의 Riot API 호출은
+  코디네이터의 허가를 받고 나가므로 워커를 늘려도 같은 API 키의 한도를 넘지 않습니다.
+- 워커는 SHARD_HEARTBEAT_INTERVAL마다 하트비트를 보내고, 워커 목록이 바뀌면 자기 몫을 다시 계산해서
+  새로 맡은 소환사는 추가하고 넘겨준 소환사는 뺍니다. 넘겨받은 소환사는 상태 저장소(STATE_DB)에서 이어서 감시하므로,
+  같은 호스트의 워커들은 같은 STATE_DB를 써야 게임 중인 소환사의 종료 알림이 이어집니다.
+- 소환사 목록 파일(SUMMONER_LIST_FILE)이 바뀌면 각 워커가 전체 목록을 다시 나눠서 자기 몫의 변경만 반영합니다
+  (ShardWatchList). 제어 소켓(CONTROL_SOCKET)은 샤드 모드에서 쓰지 않습니다.
+
+사용 예:
+  set SHARD_COORDINATOR=127.0.0.1:8790
+  python start.py coordinator        (한 번만)
+  python start.py shard              (워커 수만큼)
+"""
+import asyncio
+import bisect
+import hashlib
+import os
+import socket
+
+from config import (
+    SHARD_COORDINATOR, SHARD_WORKER_ID, SHARD_HEARTBEAT_INTERVAL, SHARD_VIRTUAL_NODES, SUMMONER_LIST_FILE,
+    WATCHLIST_CHECK_INTERVAL,
+)
+from multi_monitor import MultiMonitor, load_summoner_names, valid_summoners
+from metrics import start_metrics_exporter
+from rate_coordinator import RemoteRateBudget
+from routing import split_summoner
+from state_store import open_state_store
+from watchlist import WatchList
+
+
+def ring_hash(value):
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    일관된 해싱 링. 워커마다 virtual_nodes개의 점을 링 위에 찍고,
+    키는 시계 방향으로 처음 만나는 점의 워커에 배정합니다.
+    """
+
+    def __init__(self, nodes=(), virtual_nodes=SHARD_VIRTUAL_NODES):
+        self.virtual_nodes = virtual_nodes
+        self.points = []
+        self.owners = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        for i in range(self.virtual_nodes):
+            point = ring_hash(f"{node}#{i}")
+            index = bisect.bisect(self.points, point)
+            self.points.insert(index, point)
+            self.owners.insert(index, node)
+
+    def owner(self, key):
+        """
+        key를 맡는 워커. 워커가 없으면 None.
+        """
+        if not self.points:
+            return None
+        index = bisect.bisect(self.points, ring_hash(key)) % len(self.points)
+        return self.owners[index]
+
+
+def default_worker_id():
+    return SHARD_WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+
+
+def shard_of(riot_ids, workers, worker_id):
+    """
+    워커 목록(workers)으로 riot_ids를 나눴을 때 worker_id가 맡는 항목 목록 (원래 순서 유지).
+    항목에 "@플랫폼"이 붙어 있어도 Riot ID로 나누므로, 플랫폼 표기를 바꿔도 맡는 워커는 그대로입니다.
+    """
+    ring = HashRing(workers)
+    return [spec for spec in riot_ids if ring.owner(split_summoner(spec)[0]) == worker_id]
+
+
+class ShardWorker:
+    """
+    코디네이터에 워커로 참여해서 자기 몫의 소환사를 MultiMonitor로 감시합니다.
+    """
+
+    def __init__(self, riot_ids, budget, worker_id=None, heartbeat_interval=SHARD_HEARTBEAT_INTERVAL):
+        self.riot_ids = riot_ids
+        self.budget = budget
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_interval = heartbeat_interval
+        self.version = None
+        self.workers = []
+        # 지금 맡고 있는 소환사 (Riot ID → 목록 항목)
+        self.owned = {}
+        self.monitor = None
+
+    def owned_specs(self):
+        # 코디네이터가 잠깐 이 워커를 빠뜨렸어도(하트비트 지연 등) 자기 자신은 항상 포함해서 계산
+        return shard_of(self.riot_ids, sorted(set(self.workers) | {self.worker_id}), self.worker_id)
+
+    def reassign(self, reason):
+        """
+        지금 워커 목록과 소환사 목록으로 자기 몫을 다시 계산해서 모니터에 추가/제거합니다.
+        같은 Riot ID의 "@플랫폼"이 바뀌면 뺐다가 다시 추가합니다.
+        """
+        # 목록 항목에는 "@플랫폼"이 붙을 수 있으므로 모니터의 키(Riot ID)로 비교
+        owned = {split_summoner(spec)[0]: spec for spec in self.owned_specs()}
+        removed = [riot_id for riot_id, spec in self.owned.items() if owned.get(riot_id) != spec]
+        added = [spec for riot_id, spec in owned.items() if self.owned.get(riot_id) != spec]
+        for riot_id in removed:
+            self.monitor.remove_summoner(riot_id)
+        for spec in added:
+            self.monitor.add_summoner(spec)
+        self.owned = owned
+        if added or removed:
+            print(f"[샤드 {self.worker_id}] {reason}: "
+                  f"소환사 {len(owned)}/{len(self.riot_ids)}명 담당 (+{len(added)}, -{len(removed)})")
+
+    def rebalance(self, workers, version):
+        """
+        워커 목록이 바뀌었으면 자기 몫을 다시 계산해서 모니터에 추가/제거합니다.
+        """
+        if version == self.version:
+            return
+        self.version = version
+        self.workers = workers
+        self.reassign(f"워커 {len(workers)}개로 재배정")
+
+    def update_summoners(self, riot_ids):
+        """
+        전체 소환사 목록이 바뀌었을 때 (ShardWatchList) 자기 몫만 다시 계산해서 반영합니다.
+        """
+        self.riot_ids = riot_ids
+        self.reassign("소환사 목록 변경")
+
+    async def follow_membership(self):
+        """
+        하트비트를 보내면서 워커 목록이 바뀔 때마다 다시 나눕니다. 코디네이터에 닿지 않으면 지금 몫을 그대로 유지합니다.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                workers, version = await loop.run_in_executor(
+                    None, self.budget.membership, "heartbeat", self.worker_id
+                )
+            except Exception as e:
+                print(f"[샤드 {self.worker_id}] 코디네이터 하트비트 실패:", e)
+                continue
+            self.rebalance(workers, version)
+
+    async def run(self, state_store=None):
+        loop = asyncio.get_running_loop()
+        workers, version = await loop.run_in_executor(None, self.budget.membership, "join", self.worker_id)
+        self.version = version
+        self.workers = workers
+        owned = self.owned_specs()
+        self.owned = {split_summoner(spec)[0]: spec for spec in owned}
+        print(f"[샤드 {self.worker_id}] 워커 {len(workers)}개 중 소환사 {len(owned)}/{len(self.riot_ids)}명 담당")
+        self.monitor = MultiMonitor(owned, state_store=state_store)
+        # 목록 파일이 바뀌면 전체 목록을 다시 나눠서 자기 몫만 반영
+        watch = ShardWatchList(self, self.riot_ids)
+        try:
+            await asyncio.gather(self.monitor.run(), self.follow_membership(), watch.run())
+        finally:
+            try:
+                await loop.run_in_executor(None, self.budget.membership, "leave", self.worker_id)
+            except Exception:
+                pass
+
+
+class ShardWatchList(WatchList):
+    """
+    샤드 워커용 WatchList. 목록 파일이 바뀌면 전체 목록을 worker에 넘겨서 자기 몫만 다시 계산하게 합니다.
+    제어 소켓은 워커 하나의 모니터만 바꾸게 되므로 쓰지 않습니다 (목록 파일을 고치면 모든 워커에 반영됨).
+    """
+
+    def __init__(self, worker, initial, path=SUMMONER_LIST_FILE, check_interval=WATCHLIST_CHECK_INTERVAL):
+        super().__init__(None, initial, path=path, check_interval=check_interval, address=None)
+        self.worker = worker
+
+    def apply(self, specs):
+        wanted = {split_summoner(spec)[0]: spec for spec in valid_summoners(specs)}
+        added = sum(1 for riot_id, spec in wanted.items() if self.current.get(riot_id) != spec)
+        removed = sum(1 for riot_id, spec in self.current.items() if wanted.get(riot_id) != spec)
+        self.current = wanted
+        if added or removed:
+            print(f"[샤드 {self.worker.worker_id}] 소환사 목록 변경: +{added}, -{removed} (전체 {len(wanted)}명)")
+            self.worker.update_summoners(list(wanted.values()))
+        return added, removed
+
+
+def run_shard_worker():
+    """
+    load_summoner_names()로 읽은 전체 목록 중 이 워커 몫을 감시합니다. SHARD_COORDINATOR가 필요합니다.
+    """
+    if not SHARD_COORDINATOR:
+        raise EnvironmentError("SHARD_COORDINATOR 환경변수가 설정되어 있지 않습니다.")
+    riot_ids = []
+    for spec in load_summoner_names():
+        try:
+            if "#" in split_summoner(spec)[0]:
+                riot_ids.append(spec)
+        except ValueError as e:
+            print(e)
+    if not riot_ids:
+        print("모니터링할 소환사가 없습니다.")
+        return
+    # riot_api.RIOT_CLIENT도 SHARD_COORDINATOR로 같은 코디네이터의 레이트 리밋을 씀
+    worker = ShardWorker(riot_ids, RemoteRateBudget(SHARD_COORDINATOR))
+    start_metrics_exporter()
+    try:
+        asyncio.run(worker.run(state_store=open_state_store()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    run_shard_worker()
@@ -0,0 +1,445 @@
+"""
+가상 시계 시뮬레이터: 수천~수만 명의 가상 소환사가 하루 동안 게임하는 상황을 몇 분 만에 돌려 봅니다.
+
+benchmark.py는 모의 서버를 실제 시간으로 상대하지만, 이 시뮬레이터는 HTTP와 실제 시간을 모두 빼고
+- riot_api.RIOT_CLIENT 자리에 모의 응답(mock_riot_server.MockRiotApi)을 바로 돌려주는 클라이언트를 넣고,
+- 다중 모니터(MultiMonitor)를 가상 시계로 도는 이벤트 루프에서 실행합니다.
+  루프가 다음 예약 시각까지 기다려야 할 때 실제로 자지 않고 가상 시계를 그만큼 앞으로 돌립니다.
+
+게임 일정(SimWorld)은 실제에 가깝게 만듭니다.
+- 소환사는 접속(세션)마다 평균 session_games판을 큐 대기 queue_min~queue_max초를 사이에 두고 이어서 하고,
+  세션이 끝나면 평균 offline_hours시간 쉽니다.
+- 게임 길이는 평균 game_mean초(15~50분), remake_rate 비율은 3~4분 만에 끝나는 다시하기입니다.
+- duo_rate 비율의 파티는 2인(듀오)이라 항상 같은 게임에 들어갑니다.
+- 경기 결과는 끝나고 publish_min~publish_max초 뒤에 match-v5에 공개되고,
+  publish_slow_rate 비율은 publish_slow초까지 늦게 공개됩니다.
+
+끝나면 실제 게임 일정과 비교해서 놓친/중복 알림, 감지 지연(p50/p95/p99), 소환사 1명이 1시간 동안 쓰는 API 호출 수를 보여 줍니다.
+레이트 리밋과 네트워크 지연은 시뮬레이션하지 않습니다 (그쪽은 benchmark.py로 확인).
+
+사용 예:
+  python start.py simulate
+  python simulator.py --summoners 10000 --hours 24 --duo-rate 0.3
+  python simulator.py --summoners 1000 --hours 6 --json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import selectors
+import sys
+import tempfile
+import time
+from collections import Counter
+from urllib.parse import unquote
+
+import requests
+
+from benchmark import percentile
+from mock_riot_server import MockWorld, MockRiotApi, load_fixture
+
+# 가상 시계의 시작 시각. 0 근처의 작은 값으로 두어 부동소수점 오차가 루프의 시계 해상도보다 작게 합니다.
+SIM_EPOCH = 1_000_000.0
+
+
+class VirtualClock:
+    def __init__(self, start=SIM_EPOCH):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class VirtualSelector:
+    """
+    실제 셀렉터를 감싸서, 이벤트 루프가 타이머를 기다릴 때 실제로 자지 않고 가상 시계를 앞으로 돌립니다.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.selector = selectors.DefaultSelector()
+
+    def select(self, timeout=None):
+        events = self.selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # 예약된 타이머가 없으면 실제로 기다림 (모니터는 항상 다음 확인을 예약하므로 보통은 없음)
+            return self.selector.select(None)
+        # 루프의 시계 해상도보다 조금 더 돌려서 기다리던 타이머가 반드시 실행되게 함
+        self.clock.advance(max(timeout, 1e-6))
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self.selector, name)
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """
+    loop.time()이 가상 시계를 따르는 이벤트 루프. asyncio.sleep / wait_for / call_later가 모두 가상 시간으로 동작합니다.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        super().__init__(VirtualSelector(clock))
+
+    def time(self):
+        return self.clock.now
+
+
+class SimGame(dict):
+    """
+    시뮬레이션 게임 한 판. 참가자 10명 정보는 저장하지 않고 필요할 때마다 gameId로 똑같이 다시 만듭니다
+    (하루 분량 수만 판의 참가자를 모두 들고 있지 않도록).
+    """
+
+    def __init__(self, world, members, **fields):
+        super().__init__(**fields)
+        self.world = world
+        self.members = members
+
+    def __missing__(self, key):
+        if key == "participants":
+            return self.world.build_participants(self.members, self["gameId"], random.Random(self["gameId"]))
+        raise KeyError(key)
+
+
+class SimWorld(MockWorld):
+    """
+    세션, 큐 대기, 다시하기, 듀오, 경기 결과 공개 지연이 있는 게임 일정 (모듈 설명 참고).
+    """
+
+    def __init__(self, summoners, seed=1, duo_rate=0.3, queue_min=60, queue_max=420, session_games=4,
+                 offline_hours=6, game_mean=1800, game_sd=360, remake_rate=0.03,
+                 publish_min=20, publish_max=180, publish_slow_rate=0.05, publish_slow=900, start_time=SIM_EPOCH):
+        super().__init__(summoners, party_size=1, seed=seed, name_prefix="sim", start_time=start_time)
+        self.queue_min, self.queue_max = queue_min, queue_max
+        self.session_games = session_games
+        self.offline_mean = offline_hours * 3600
+        self.game_mean, self.game_sd = game_mean, game_sd
+        self.remake_rate = remake_rate
+        self.publish_min, self.publish_max = publish_min, publish_max
+        self.publish_slow_rate, self.publish_slow = publish_slow_rate, publish_slow
+
+        # 솔로와 듀오로 파티를 다시 묶음
+        rng = random.Random(seed)
+        self.parties = []
+        i = 0
+        while i < len(self.summoners):
+            size = 2 if i + 1 < len(self.summoners) and rng.random() < duo_rate else 1
+            members = self.summoners[i:i + size]
+            index = len(self.parties)
+            for member in members:
+                member["party"] = index
+            party_rng = random.Random(seed * 1000003 + index)
+            self.parties.append({
+                "members": members,
+                "rng": party_rng,
+                "games": [],
+                # 시작 시각에 이미 접속해 있는 소환사도 있도록 첫 게임을 쉬는 시간 안에 고르게 흩음
+                "next_start": self.start_time + party_rng.uniform(0, self.offline_mean),
+                "session_left": self._session_length(party_rng),
+                "counter": 0,
+            })
+            i += size
+
+    def _session_length(self, rng):
+        # 평균 session_games판인 기하분포
+        games = 1
+        while rng.random() > 1 / self.session_games:
+            games += 1
+        return games
+
+    def _new_game(self, party, index, start):
+        rng = party["rng"]
+        party["counter"] += 1
+        game_id = 7_000_000_000 + index * 10_000 + party["counter"]
+        remake = rng.random() < self.remake_rate
+        if remake:
+            length = rng.uniform(180, 240)
+        else:
+            length = min(max(rng.gauss(self.game_mean, self.game_sd), 900), 3000)
+        if rng.random() < self.publish_slow_rate:
+            delay = rng.uniform(self.publish_max, self.publish_slow)
+        else:
+            delay = rng.uniform(self.publish_min, self.publish_max)
+        end = start + length
+        game = SimGame(self, party["members"], gameId=game_id, start=start, end=end, published=end + delay,
+                       party=index, remake=remake)
+        self.games[game_id] = game
+        return game
+
+    def _extend(self, index, until):
+        party = self.parties[index]
+        while party["next_start"] <= until:
+            game = self._new_game(party, index, party["next_start"])
+            party["games"].append(game)
+            rng = party["rng"]
+            party["session_left"] -= 1
+            if party["session_left"] > 0:
+                gap = rng.uniform(self.queue_min, self.queue_max)
+            else:
+                party["session_left"] = self._session_length(rng)
+                gap = rng.expovariate(1 / self.offline_mean)
+            party["next_start"] = game["end"] + gap
+        return party["games"]
+
+    def is_published(self, game, now):
+        return game["published"] <= now
+
+
+class SimulatedRiotClient:
+    """
+    riot_api.RIOT_CLIENT 자리에 넣는 클라이언트. HTTP 요청 대신 MockRiotApi에 가상 시각으로 물어보고
+    requests.Response로 돌려줍니다. 메서드별 호출 수를 셉니다.
+    """
+
+    def __init__(self, api, clock):
+        self.api = api
+        self.clock = clock
+        self.calls = Counter()
+
+    def get(self, host, path, method, params=None, priority=None):
+        self.calls[method] += 1
+        route = [unquote(part) for part in path.split("/") if part]
+        endpoint = self.api.endpoint_name(route)
+        if endpoint is None:
+            status, body = 404, {"status": {"message": "Data not found", "status_code": 404}}
+        else:
+            query = {name: [str(value)] for name, value in (params or {}).items()}
+            status, body = self.api.route(endpoint, route, query, self.clock.now)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = f"sim://{host}{path}"
+        return response
+
+    def export_budget(self):
+        pass
+
+
+class StaticChampions:
+    """
+    Data Dragon 대신 fixtures/champion.json으로 챔피언 이름을 알려 줍니다 (네트워크와 백그라운드 갱신 없이).
+    """
+
+    def __init__(self):
+        data = load_fixture("champion.json")["data"]
+        self.mapping = {champ["key"]: champ["name"] for champ in data.values()}
+
+    def get_mapping(self):
+        return self.mapping
+
+
+class RecordingOutbox:
+    """
+    전송하지 않고 (키, 가상 시각)만 기록합니다. 중복 여부를 채점하기 위해 중복 제거도 하지 않습니다.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def enqueue(self, key, text, event_at=None, trace=None):
+        self.events.append((key, self.clock.now))
+        return True
+
+
+def score(events, world, riot_ids, started, ended, grace):
+    """
+    기록된 알림을 실제 게임 일정과 비교합니다. 시뮬레이션 시작 전에 시작한 게임의 시작 이벤트와
+    끝나기 grace초 전 이후의 이벤트는 채점에서 뺍니다. 종료 지연은 게임 종료 시각과 경기 결과 공개 시각 기준으로 각각 잽니다.
+    """
+    first_seen = {}
+    duplicates = 0
+    for key, at in events:
+        if key in first_seen:
+            duplicates += 1
+        else:
+            first_seen[key] = at
+
+    latencies = {"start": [], "end": [], "end_after_publish": []}
+    expected = missed = 0
+    known = set()
+    for game in world.games.values():
+        for member in world.parties[game["party"]]["members"]:
+            riot_id = riot_ids[member["puuid"]]
+            for event, truth in (("start", game["start"]), ("end", game["end"])):
+                key = (riot_id, game["gameId"], event)
+                known.add(key)
+                if not (started <= truth <= ended - grace):
+                    continue
+                expected += 1
+                at = first_seen.get(key)
+                if at is None:
+                    missed += 1
+                    continue
+                latencies[event].append(at - truth)
+                if event == "end":
+                    latencies["end_after_publish"].append(at - game["published"])
+    unexpected = sum(1 for key in first_seen if key not in known)
+    return latencies, expected, missed, duplicates, unexpected
+
+
+async def cancel_pending():
+    """
+    지금 루프에 남은 태스크를 모두 취소하고 끝날 때까지 기다립니다.
+    """
+    pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_simulation(args):
+    """
+    시뮬레이션을 돌리고 결과(dict)를 반환합니다.
+    riot_api의 클라이언트와 캐시/저장소를 모두 시뮬레이션용(가상 시계, 임시 디렉터리)으로 바꿔 끼우므로
+    실제 캐시(CACHE_DIR)에는 아무것도 쓰지 않습니다.
+    """
+    import riot_api
+    from analytics import MatchAnalytics
+    from config import LEAGUE_CACHE_TTL, MATCH_MEMORY_CACHE_SIZE, ANALYTICS_RECENT_GAMES
+    from league import LeagueCache
+    from match_store import MatchStore
+    from multi_monitor import MultiMonitor
+    from participants import decode_match, match_index_rows
+
+    class SimulatedMonitor(MultiMonitor):
+        async def call(self, func, *args):
+            # 모의 응답은 바로 돌아오므로 스레드 풀을 거치지 않음 (가상 시계가 실제 스레드를 기다리지 않게)
+            return func(*args)
+
+    clock = VirtualClock()
+    world = SimWorld(
+        args.summoners, seed=args.seed, duo_rate=args.duo_rate, queue_min=args.queue_min, queue_max=args.queue_max,
+        session_games=args.session_games, offline_hours=args.offline_hours, game_mean=args.game_mean,
+        game_sd=args.game_sd, remake_rate=args.remake_rate, publish_min=args.publish_min,
+        publish_max=args.publish_max, publish_slow_rate=args.publish_slow_rate, publish_slow=args.publish_slow,
+        start_time=clock.now,
+    )
+    client = SimulatedRiotClient(MockRiotApi(world), clock)
+    riot_api.RIOT_CLIENT = client
+    riot_api.LEAGUE_CACHE = LeagueCache(LEAGUE_CACHE_TTL, clock=clock.time)
+    riot_api.CHAMPION_CACHE = StaticChampions()
+    workdir = tempfile.mkdtemp(prefix="koalarm-sim-")
+    riot_api.MATCH_STORE = MatchStore(
+        os.path.join(workdir, "matches.sqlite3"), MATCH_MEMORY_CACHE_SIZE,
+        decode=decode_match, index_rows=match_index_rows
+    )
+    riot_api.ANALYTICS = MatchAnalytics(riot_api.MATCH_STORE, ANALYTICS_RECENT_GAMES)
+
+    riot_ids = {s["puuid"]: f"{s['gameName']}#{s['tagLine']}" for s in world.summoners}
+    outbox = RecordingOutbox(clock)
+    monitor = SimulatedMonitor(
+        list(riot_ids.values()), poll_interval=args.poll_interval, outbox=outbox, clock=clock.time
+    )
+    duration = args.hours * 3600
+
+    loop = VirtualEventLoop(clock)
+    started = clock.now
+    wall_started = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        try:
+            with output:
+                try:
+                    loop.run_until_complete(asyncio.wait_for(monitor.run(), duration))
+                except asyncio.TimeoutError:
+                    pass
+                # 시간이 다 되어 남은 폴링 태스크를 정리 (가상 루프 안에서 모아야 다른 루프에 묶이지 않음)
+                loop.run_until_complete(cancel_pending())
+        finally:
+            loop.close()
+            monitor.executor.shutdown(wait=False)
+    wall = time.perf_counter() - wall_started
+    ended = clock.now
+
+    latencies, expected, missed, duplicates, unexpected = score(
+        outbox.events, world, riot_ids, started, ended, args.grace
+    )
+    games = [g for g in world.games.values() if g["start"] < ended]
+    calls = sum(client.calls.values())
+    player_hours = args.summoners * args.hours
+    result = {
+        "summoners": args.summoners,
+        "hours": args.hours,
+        "games": len(games),
+        "remakes": sum(1 for g in games if g["remake"]),
+        "duo_games": sum(1 for g in games if len(world.parties[g["party"]]["members"]) > 1),
+        "events_expected": expected,
+        "events_missed": missed,
+        "events_duplicated": duplicates,
+        "events_unexpected": unexpected,
+        "api_calls": calls,
+        "calls_per_player_hour": round(calls / player_hours, 2) if player_hours else None,
+        "calls_by_method": {
+            method: round(count / player_hours, 2) for method, count in client.calls.most_common()
+        } if player_hours else {},
+        "wall_seconds": round(wall, 1),
+        "speedup": round((ended - started) / wall) if wall else None,
+    }
+    for event in ("start", "end", "end_after_publish"):
+        for pct in (50, 95, 99):
+            value = percentile(latencies[event], pct)
+            result[f"{event}_latency_p{pct}"] = round(value, 1) if value is not None else None
+    return result
+
+
+def print_report(result):
+    print(f"소환사 {result['summoners']}명, {result['hours']}시간 "
+          f"(실제 {result['wall_seconds']}초, {result['speedup']}배속)")
+    print(f"게임 {result['games']}판 (다시하기 {result['remakes']}, 듀오 {result['duo_games']})")
+    print(f"이벤트: 예상 {result['events_expected']}, 놓침 {result['events_missed']}, "
+          f"중복 {result['events_duplicated']}, 없는 게임 {result['events_unexpected']}")
+    for event, title in (("start", "시작 감지"), ("end", "종료 감지"), ("end_after_publish", "결과 공개 후 종료 알림")):
+        values = [result[f"{event}_latency_p{pct}"] for pct in (50, 95, 99)]
+        print(f"{title} 지연(초) p50/p95/p99: " + " / ".join("-" if v is None else f"{v:.1f}" for v in values))
+    print(f"API 호출 {result['api_calls']}회, 소환사 1명·1시간당 {result['calls_per_player_hour']}회")
+    for method, rate in result["calls_by_method"].items():
+        print(f"  {method}: {rate}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="가상 시계로 수천 명의 게임 일정을 시뮬레이션해서 모니터를 채점합니다.")
+    parser.add_argument("--summoners", type=int, default=10000)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--poll-interval", type=float, default=15, help="모니터의 POLL_INTERVAL")
+    parser.add_argument("--duo-rate", type=float, default=0.3, help="파티가 듀오일 확률")
+    parser.add_argument("--queue-min", type=float, default=60, help="세션 안 게임 사이 큐 대기 최소(초)")
+    parser.add_argument("--queue-max", type=float, default=420, help="세션 안 게임 사이 큐 대기 최대(초)")
+    parser.add_argument("--session-games", type=float, default=4, help="세션당 평균 게임 수")
+    parser.add_argument("--offline-hours", type=float, default=6, help="세션 사이 평균 쉬는 시간(시간)")
+    parser.add_argument("--game-mean", type=float, default=1800, help="평균 게임 길이(초)")
+    parser.add_argument("--game-sd", type=float, default=360, help="게임 길이 표준편차(초)")
+    parser.add_argument("--remake-rate", type=float, default=0.03, help="다시하기 비율")
+    parser.add_argument("--publish-min", type=float, default=20, help="경기 결과 공개 지연 최소(초)")
+    parser.add_argument("--publish-max", type=float, default=180, help="경기 결과 공개 지연 최대(초)")
+    parser.add_argument("--publish-slow-rate", type=float, default=0.05, help="결과 공개가 늦는 경기 비율")
+    parser.add_argument("--publish-slow", type=float, default=900, help="늦는 경기의 최대 공개 지연(초)")
+    parser.add_argument("--grace", type=float, default=1800,
+                        help="끝나기 이 시간(초) 전 이후의 이벤트는 채점에서 뺌 (결과 공개 대기 포함)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--verbose", action="store_true", help="모니터 로그를 그대로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run_simulation(args)
+    if args.json:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+알림 지연 SLO 추적.
+
+알림 하나가 파이프라인을 지나며 찍은 시각을 EventTrace에 모읍니다.
+  event_at      Riot 쪽 이벤트 시각 (시작: spectator gameStartTime, 종료: match-v5 gameEndTimestamp)
+  detected_at   모니터가 이벤트를 감지한 시각 (시작: spectator에서 게임을 본 폴링, 종료: spectator에서 사라진 폴링)
+  rendered_at   알림 메시지를 다 만든 시각
+  enqueued_at   Outbox 대기열에 넣은 시각
+  delivered_at  전송이 끝난 시각
+모두 유닉스 시각(초)입니다.
+
+전송이 끝나면 LatencyTracker가 (지역, 이벤트)별로 최근 SLO_WINDOW초 동안의
+감지 지연(detected_at - event_at)과 전송 지연(delivered_at - event_at)을 모아 p50/p95/p99를 계산하고,
+SLO_TRACE_LOG가 설정되어 있으면 트레이스를 한 줄에 JSON 하나씩 남깁니다.
+"""
+import json
+import math
+import threading
+import time
+from collections import deque
+
+from config import SLO_WINDOW, SLO_TRACE_LOG
+from metrics import METRICS, NOTIFY_LATENCY_QUANTILE_SECONDS
+
+QUANTILES = (0.5, 0.95, 0.99)
+STAGES = ("detection", "delivery")
+
+
+class EventTrace:
+    """
+    알림 하나의 시각 기록. region은 소환사의 플랫폼(kr, na1 등)입니다.
+    """
+
+    __slots__ = (
+        "event", "riot_id", "region", "game_id", "event_at", "detected_at", "rendered_at", "enqueued_at",
+        "delivered_at",
+    )
+
+    def __init__(self, event, riot_id, region, game_id, event_at, detected_at):
+        self.event = event
+        self.riot_id = riot_id
+        self.region = region
+        self.game_id = game_id
+        self.event_at = event_at
+        self.detected_at = detected_at
+        self.rendered_at = None
+        self.enqueued_at = None
+        self.delivered_at = None
+
+    def latency(self, stage):
+        """
+        Riot 이벤트 시각부터 stage(detection / delivery)까지 걸린 시간(초). 모르면 None.
+        """
+        end = self.detected_at if stage == "detection" else self.delivered_at
+        if not self.event_at or end is None:
+            return None
+        return end - self.event_at
+
+    def to_dict(self):
+        record = {name: getattr(self, name) for name in self.__slots__}
+        for stage in STAGES:
+            latency = self.latency(stage)
+            record[f"{stage}_seconds"] = round(latency, 3) if latency is not None else None
+        return record
+
+
+def quantile(sorted_values, q):
+    """
+    정렬된 값에서 q 분위수 (nearest-rank).
+    """
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """
+    전송이 끝난 EventTrace를 받아 (지역, 이벤트, 단계)별 최근 window초의 지연 분포를 유지합니다.
+    Riot 이벤트 시각을 모르는 알림(결과 없이 보낸 종료 알림 등)은 분포에 넣지 않고 트레이스 로그에만 남깁니다.
+    """
+
+    def __init__(self, window=SLO_WINDOW, trace_log=SLO_TRACE_LOG, clock=time.time):
+        self.window = window
+        self.trace_log = trace_log
+        self.clock = clock
+        # (지역, 이벤트, 단계) → (전송 완료 시각, 지연) deque
+        self.samples = {}
+        self.lock = threading.Lock()
+        self.log_file = None
+
+    def record(self, trace):
+        now = self.clock()
+        with self.lock:
+            for stage in STAGES:
+                latency = trace.latency(stage)
+                if latency is None:
+                    continue
+                samples = self.samples.setdefault((trace.region, trace.event, stage), deque())
+                samples.append((trace.delivered_at or now, latency))
+            self._expire(now)
+            if self.trace_log:
+                self._write(trace)
+
+    def _expire(self, now):
+        cutoff = now - self.window
+        for samples in self.samples.values():
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def _write(self, trace):
+        try:
+            if self.log_file is None:
+                self.log_file = open(self.trace_log, "a", encoding="utf-8", buffering=1)
+            self.log_file.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            print("지연 트레이스 기록 중 오류 발생:", e)
+
+    def percentiles(self):
+        """
+        {(지역, 이벤트, 단계): {"count": n, "p50": 초, "p95": 초, "p99": 초}}. 최근 window초에 샘플이 없으면 빠집니다.
+        """
+        with self.lock:
+            self._expire(self.clock())
+            snapshot = {key: sorted(latency for _, latency in samples) for key, samples in self.samples.items()}
+        summary = {}
+        for key, values in snapshot.items():
+            if not values:
+                continue
+            summary[key] = {"count": len(values)}
+            for q in QUANTILES:
+                summary[key][f"p{int(q * 100)}"] = quantile(values, q)
+        return summary
+
+    def export_metrics(self):
+        summaries = self.percentiles()
+        # 창 밖으로 밀려난 조합은 지표에서도 뺌
+        with NOTIFY_LATENCY_QUANTILE_SECONDS.lock:
+            NOTIFY_LATENCY_QUANTILE_SECONDS.values.clear()
+        for (region, event, stage), summary in summaries.items():
+            for q in QUANTILES:
+                NOTIFY_LATENCY_QUANTILE_SECONDS.set(
+                    region, event, stage, str(q), value=summary[f"p{int(q * 100)}"]
+                )
+
+
+LATENCY = LatencyTracker()
+METRICS.add_collector(LATENCY.export_metrics)
@@ -1,4 +1,24 @@
+import sys
 from monitor_lol_game import monitor_game
 
 if __name__ == "__main__":
-    monitor_game() 
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "multi":
+        from multi_monitor import run_multi_monitor
+        run_multi_monitor()
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == "shard":
+        from sharding import run_shard_worker
+        run_shard_worker()
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == "coordinator":
+        from rate_coordinator import main
+        main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == "simulate":
+        from simulator import main
+        main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == "profile":
+        from profiler import CycleProfiler
+        monitor_game(profiler=CycleProfiler())
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == "backfill":
+        from backfill import main
+        main(sys.argv[2:])
+    else:
+        monitor_game()
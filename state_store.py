@@ -0,0 +1,255 @@
+"""
+모니터 상태 저장소 (재시작해도 이어서 감시).
+
+Riot ID → puuid 매핑, 소환사별 진행 중인 gameId, 마지막으로 처리한 게임/matchId, 보낸(보낼) 알림을
+SQLite(CACHE_DIR/state.sqlite3)에 저장합니다. 시작할 때 읽어 들이므로 재시작해도 계정 조회(API 호출) 없이
+바로 폴링을 시작하고, 재시작 전에 시작한 게임의 종료 알림도 보내며, 같은 알림을 두 번 보내지 않습니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from config import STATE_DB
+
+# 보낸 알림 기록을 남겨 두는 기간(초)
+NOTIFICATION_RETENTION = 30 * 86400
+
+
+class SummonerRecord(NamedTuple):
+    """
+    저장된 소환사 한 명의 모니터링 상태.
+    game_id가 있으면 그 게임을 진행 중인 것으로 기록된 상태이고, game_started_at은 게임 시작 시각(유닉스 시각)입니다.
+    ended_games는 끝났지만 아직 경기 결과(종료 알림)를 기다리는 게임들의 ((gameId, 종료를 감지한 시각), ...)입니다.
+    """
+    riot_id: str
+    puuid: str = None
+    summoner_id: str = None
+    game_id: int = None
+    game_started_at: float = None
+    last_game_id: int = None
+    last_match_id: str = None
+    last_event: str = None
+    last_event_at: float = None
+    ended_games: tuple = ()
+
+
+def notification_key(key):
+    """
+    Outbox 알림 키 (소환사, gameId, 이벤트)를 저장용 문자열로 바꿉니다.
+    """
+    return json.dumps(list(key), ensure_ascii=False)
+
+
+class StateStore:
+    """
+    모니터 상태를 재시작 후에도 이어 쓸 수 있도록 SQLite에 저장합니다.
+
+    - summoners: Riot ID → puuid/summonerId, 진행 중인 게임(gameId), 마지막으로 처리한 게임/matchId와 알림
+    - pending_results: 끝났지만 경기 결과를 기다리는 게임 ((Riot ID, gameId)마다 한 줄, 결과 대기 중인 게임이 여럿일 수 있음)
+    - notifications: 보내야 할 알림 (키, 본문, 보낸 시각)
+
+    게임 시작/종료 같은 상태 변화와 그 알림은 한 트랜잭션으로 함께 기록합니다.
+    그래서 재시작하면 puuid 조회 없이 바로 이어서 감시하고, 진행 중이던 게임의 종료 알림도 보내며,
+    이미 기록한 알림은 다시 만들지 않고, 기록했지만 보내지 못한 알림만 다시 보냅니다.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS summoners ("
+            " riot_id TEXT PRIMARY KEY,"
+            " puuid TEXT,"
+            " summoner_id TEXT,"
+            " game_id INTEGER,"
+            " game_started_at REAL,"
+            " last_game_id INTEGER,"
+            " last_match_id TEXT,"
+            " last_event TEXT,"
+            " last_event_at REAL,"
+            " ended_game_id INTEGER,"
+            " ended_at REAL,"
+            " updated_at REAL NOT NULL)"
+        )
+        # 이전 버전에서 만든 파일에는 없는 열 추가 (ended_game_id/ended_at은 아래에서 pending_results로 옮기고 더 쓰지 않음)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(summoners)")}
+        for column, kind in (("ended_game_id", "INTEGER"), ("ended_at", "REAL")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE summoners ADD COLUMN {column} {kind}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_results ("
+            " riot_id TEXT NOT NULL,"
+            " game_id INTEGER NOT NULL,"
+            " ended_at REAL,"
+            " PRIMARY KEY (riot_id, game_id))"
+        )
+        # 이전 버전은 소환사마다 결과 대기 게임을 하나만 summoners 열에 저장했으므로 새 표로 옮김
+        self.conn.execute(
+            "INSERT OR IGNORE INTO pending_results (riot_id, game_id, ended_at)"
+            " SELECT riot_id, ended_game_id, ended_at FROM summoners WHERE ended_game_id IS NOT NULL"
+        )
+        self.conn.execute("UPDATE summoners SET ended_game_id = NULL, ended_at = NULL WHERE ended_game_id IS NOT NULL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS notifications ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " event_at REAL,"
+            " created_at REAL NOT NULL,"
+            " sent_at REAL)"
+        )
+        self.conn.commit()
+
+    def load(self, riot_id):
+        """
+        저장된 SummonerRecord를 반환합니다. 없으면 None.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT riot_id, puuid, summoner_id, game_id, game_started_at, last_game_id, last_match_id,"
+                " last_event, last_event_at FROM summoners WHERE riot_id = ?",
+                (riot_id,)
+            ).fetchone()
+            ended = self.conn.execute(
+                "SELECT game_id, ended_at FROM pending_results WHERE riot_id = ? ORDER BY ended_at", (riot_id,)
+            ).fetchall()
+        return SummonerRecord(*row, ended_games=tuple(ended)) if row else None
+
+    def load_all(self):
+        """
+        {Riot ID: SummonerRecord}
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT riot_id, puuid, summoner_id, game_id, game_started_at, last_game_id, last_match_id,"
+                " last_event, last_event_at FROM summoners"
+            ).fetchall()
+            ended = self.conn.execute(
+                "SELECT riot_id, game_id, ended_at FROM pending_results ORDER BY ended_at"
+            ).fetchall()
+        ended_games = {}
+        for riot_id, game_id, ended_at in ended:
+            ended_games.setdefault(riot_id, []).append((game_id, ended_at))
+        return {row[0]: SummonerRecord(*row, ended_games=tuple(ended_games.get(row[0], ()))) for row in rows}
+
+    def _upsert(self, riot_id, **fields):
+        # 호출하는 쪽에서 self.lock을 잡고 트랜잭션 안에서 불러야 함
+        self.conn.execute(
+            "INSERT OR IGNORE INTO summoners (riot_id, updated_at) VALUES (?, ?)", (riot_id, time.time())
+        )
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"UPDATE summoners SET {assignments} WHERE riot_id = ?", tuple(fields.values()) + (riot_id,)
+        )
+
+    def _add_notification(self, key, text, event_at):
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO notifications (key, text, event_at, created_at) VALUES (?, ?, ?, ?)",
+            (notification_key(key), text, event_at, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def save_account(self, riot_id, puuid):
+        with self.lock, self.conn:
+            self._upsert(riot_id, puuid=puuid)
+
+    def record_start(self, riot_id, summoner_id, game_id, game_started_at, key, text, event_at=None):
+        """
+        게임 시작과 시작 알림을 함께 기록합니다. 같은 알림을 이미 기록했으면 False (보내지 말아야 함).
+        """
+        with self.lock, self.conn:
+            self._upsert(
+                riot_id, summoner_id=summoner_id, game_id=game_id, game_started_at=game_started_at,
+                last_event="start", last_event_at=time.time()
+            )
+            return self._add_notification(key, text, event_at)
+
+    def record_game_over(self, riot_id, game_id, ended_at):
+        """
+        게임이 끝난 것(spectator에서 사라짐)을 기록합니다. 종료 알림은 경기 결과가 공개된 뒤 record_end로 기록합니다.
+        """
+        with self.lock, self.conn:
+            self._upsert(riot_id, game_id=None, game_started_at=None, last_game_id=game_id)
+            self.conn.execute(
+                "INSERT OR IGNORE INTO pending_results (riot_id, game_id, ended_at) VALUES (?, ?, ?)",
+                (riot_id, game_id, ended_at)
+            )
+
+    def record_end(self, riot_id, game_id, match_id, key, text, event_at=None):
+        """
+        게임 종료와 종료 알림을 함께 기록합니다. 같은 알림을 이미 기록했으면 False (보내지 말아야 함).
+        """
+        with self.lock, self.conn:
+            record = self.conn.execute("SELECT game_id FROM summoners WHERE riot_id = ?", (riot_id,)).fetchone()
+            fields = dict(last_game_id=game_id, last_match_id=match_id, last_event="end", last_event_at=time.time())
+            # 그 사이 시작한 다음 게임의 기록은 지우지 않음
+            if record is None or record[0] == game_id:
+                fields.update(game_id=None, game_started_at=None)
+            self._upsert(riot_id, **fields)
+            # 이 게임의 결과 대기만 끝냄 (다른 게임의 결과 대기는 그대로)
+            self.conn.execute("DELETE FROM pending_results WHERE riot_id = ? AND game_id = ?", (riot_id, game_id))
+            return self._add_notification(key, text, event_at)
+
+    def mark_sent(self, keys):
+        with self.lock, self.conn:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE notifications SET sent_at = ? WHERE key = ?",
+                [(now, notification_key(key)) for key in keys]
+            )
+
+    def pending_notifications(self, riot_ids=None):
+        """
+        기록했지만 아직 보내지 못한 알림. [(키 튜플, 본문, event_at), ...] (기록 순서)
+        riot_ids를 주면 그 소환사들의 알림만 반환합니다.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, text, event_at FROM notifications WHERE sent_at IS NULL ORDER BY created_at"
+            ).fetchall()
+        pending = [(tuple(json.loads(key)), text, event_at) for key, text, event_at in rows]
+        if riot_ids is not None:
+            riot_ids = set(riot_ids)
+            pending = [item for item in pending if item[0][0] in riot_ids]
+        return pending
+
+    def prune_notifications(self, older_than):
+        """
+        older_than초보다 오래된, 이미 보낸 알림 기록을 지웁니다.
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM notifications WHERE sent_at IS NOT NULL AND sent_at < ?", (time.time() - older_than,)
+            )
+
+
+def open_state_store(path=STATE_DB):
+    """
+    설정(STATE_DB)의 상태 저장소를 엽니다. 경로가 비어 있으면 None (상태를 저장하지 않음).
+    """
+    if not path:
+        return None
+    store = StateStore(path)
+    # 보낸 지 오래된 알림 기록은 중복 방지에 더 쓰이지 않으므로 정리
+    store.prune_notifications(NOTIFICATION_RETENTION)
+    return store
+
+
+def resend_pending(store, outbox, riot_ids):
+    """
+    재시작 전에 기록했지만 보내지 못한 알림을 다시 Outbox에 넣습니다. 넣은 알림 수를 반환합니다.
+    """
+    pending = store.pending_notifications(riot_ids)
+    for key, text, event_at in pending:
+        outbox.enqueue(key, text, event_at)
+    if pending:
+        print(f"보내지 못한 알림 {len(pending)}건을 다시 보냅니다.")
+    return len(pending)
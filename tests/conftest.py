@@ -0,0 +1,10 @@
+"""
+테스트 공통 설정: 저장소 루트를 import 경로에 넣고, 캐시는 임시 디렉터리를 씁니다.
+"""
+import os
+import sys
+import tempfile
+
+# riot_api는 import할 때 CACHE_DIR에 경기 저장소를 만들므로 실제 캐시를 건드리지 않도록 먼저 바꿔 둠
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="koalarm-test-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
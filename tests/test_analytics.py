@@ -0,0 +1,75 @@
+"""
+최근 전적 계산(analytics.py) 테스트.
+"""
+import numpy as np
+import pytest
+
+from analytics import MatchAnalytics, current_streak, kda, rolling_win_rate
+
+
+class FakeMatchStore:
+    """
+    MatchStore의 participant_count / participant_rows만 흉내 냅니다.
+    rows: [(win, kills, deaths, assists, champion_id, queue_id, duration, ended_at), ...]
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def participant_count(self, puuid):
+        return len(self.rows)
+
+    def participant_rows(self, puuid):
+        return list(self.rows)
+
+
+def game(win, kills=0, deaths=0, assists=0, champion_id=1, queue_id=420, ended_at=0):
+    return (win, kills, deaths, assists, champion_id, queue_id, 1800, ended_at)
+
+
+def test_rolling_win_rate_uses_available_games_at_start():
+    win = np.array([1, 0, 1, 1, 0], dtype=bool)
+    assert rolling_win_rate(win, 2).tolist() == [100.0, 50.0, 50.0, 100.0, 50.0]
+    assert rolling_win_rate(win, 10).tolist() == [100.0, 50.0, pytest.approx(200 / 3), 75.0, 60.0]
+
+
+def test_rolling_win_rate_rejects_empty_window():
+    with pytest.raises(ValueError):
+        rolling_win_rate(np.array([True]), 0)
+
+
+def test_current_streak():
+    assert current_streak(np.array([], dtype=bool)) == 0
+    assert current_streak(np.array([0, 1, 1, 1], dtype=bool)) == 3
+    assert current_streak(np.array([1, 0, 0], dtype=bool)) == -2
+    assert current_streak(np.array([1, 1], dtype=bool)) == 2
+
+
+def test_kda_treats_zero_deaths_as_one():
+    assert kda([3, 2], [0, 0], [1, 0]) == 6
+    assert kda([4], [2], [2]) == 3
+
+
+def test_recent_stats_window_and_previous_window():
+    # 오래된 경기부터: 앞의 2경기는 승, 뒤의 2경기는 패
+    rows = [game(True, ended_at=1), game(True, ended_at=2), game(False, ended_at=3), game(False, ended_at=4)]
+    stats = MatchAnalytics(FakeMatchStore(rows), recent_games=2).recent_stats("P")
+    assert (stats.games, stats.wins, stats.losses, stats.win_rate) == (2, 0, 2, 0)
+    assert stats.previous_win_rate == 100
+    assert stats.streak == -2
+
+
+def test_recent_stats_champion_record_and_queue_filter():
+    rows = [
+        game(True, kills=10, deaths=2, assists=0, champion_id=7, ended_at=1),
+        game(False, kills=0, deaths=4, assists=2, champion_id=7, ended_at=2),
+        game(True, kills=1, deaths=1, assists=1, champion_id=8, ended_at=3),
+        game(False, champion_id=7, queue_id=450, ended_at=4),
+    ]
+    analytics = MatchAnalytics(FakeMatchStore(rows), recent_games=20)
+    stats = analytics.recent_stats("P", champion_id=7, queue_id=420)
+    assert (stats.games, stats.wins) == (3, 2)
+    assert stats.previous_win_rate is None
+    assert (stats.champion_games, stats.champion_wins, stats.champion_win_rate) == (2, 1, 50)
+    assert stats.champion_kda == 2
+    assert analytics.recent_stats("P", queue_id=900) is None
@@ -0,0 +1,103 @@
+"""
+백필 이어받기 테스트. Riot API 호출(backfill.get_match_ids 등)은 가짜 경기 목록으로 바꿔서 돌립니다.
+"""
+import asyncio
+
+import pytest
+
+import backfill
+from backfill import Backfill, BackfillProgress
+from state_store import StateStore
+
+
+class MemoryStore:
+    def __init__(self):
+        self.matches = set()
+
+    def missing(self, match_ids):
+        return [match_id for match_id in match_ids if match_id not in self.matches]
+
+    def put_raw(self, match_id, raw, remember=True):
+        self.matches.add(match_id)
+
+
+class FakeRiot:
+    """
+    최신순 경기 ID 목록(history)을 페이지로 돌려줍니다. fail_after번 조회한 뒤부터는 오류를 냅니다.
+    """
+
+    def __init__(self, count):
+        self.history = [f"KR_{i}" for i in range(count, 0, -1)]
+        self.fail_after = None
+        self.id_calls = 0
+        self.account_calls = 0
+
+    def play(self, count):
+        newest = int(self.history[0][3:])
+        self.history = [f"KR_{i}" for i in range(newest + count, newest, -1)] + self.history
+
+    def get_match_ids(self, puuid, region, start=0, count=100, **filters):
+        self.id_calls += 1
+        if self.fail_after is not None and self.id_calls > self.fail_after:
+            raise RuntimeError("riot unavailable")
+        return self.history[start:start + count]
+
+    def get_account_info(self, game_name, tag_line, region=None, priority=None):
+        self.account_calls += 1
+        return {"puuid": "P"}
+
+
+@pytest.fixture
+def riot(monkeypatch):
+    fake = FakeRiot(250)
+    monkeypatch.setattr(backfill, "get_match_ids", fake.get_match_ids)
+    monkeypatch.setattr(backfill, "get_account_info", fake.get_account_info)
+    monkeypatch.setattr(backfill, "fetch_match_raw", lambda match_id, region, priority: {})
+    return fake
+
+
+@pytest.fixture
+def progress(tmp_path):
+    return BackfillProgress(str(tmp_path / "backfill.sqlite3"))
+
+
+def run(progress, store, **options):
+    job = Backfill(progress=progress, store=store, region="asia", filter_key="test", **options)
+    asyncio.run(job.run(["a#KR1"]))
+    return job
+
+
+def test_interrupted_catch_up_resumes_without_gap(riot, progress):
+    store = MemoryStore()
+    run(progress, store)
+    assert len(store.matches) == 250
+
+    riot.play(230)
+    riot.fail_after = riot.id_calls + 1
+    assert run(progress, store).failed == 1
+    # 새 경기 중 첫 페이지만 받고 멈춤
+    assert len(store.matches) == 350
+
+    riot.fail_after = None
+    run(progress, store)
+    assert store.matches == set(riot.history)
+    assert progress.get_catch_up("P", "test") == ("KR_480", None, None)
+
+
+def test_capped_backfill_catches_up_new_matches(riot, progress):
+    store = MemoryStore()
+    run(progress, store, max_matches=120)
+    assert len(store.matches) == 120
+
+    riot.play(10)
+    run(progress, store, max_matches=120)
+    assert len(store.matches) == 130
+    assert "KR_260" in store.matches
+
+
+def test_puuid_comes_from_state_store(riot, progress, tmp_path):
+    state_store = StateStore(str(tmp_path / "state.sqlite3"))
+    run(progress, MemoryStore(), state_store=state_store)
+    run(progress, MemoryStore(), state_store=state_store)
+    assert riot.account_calls == 1
+    assert state_store.load("a#KR1").puuid == "P"
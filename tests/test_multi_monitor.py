@@ -0,0 +1,43 @@
+"""
+MultiMonitor 테스트: 재시작 후 같은 게임의 소환사들을 리더 하나로 다시 묶는지 확인합니다.
+"""
+import asyncio
+
+import multi_monitor
+from multi_monitor import MultiMonitor
+from state_store import SummonerRecord
+
+
+class NullOutbox:
+    def enqueue(self, *args, **kwargs):
+        return True
+
+
+def test_restored_players_in_same_game_share_one_leader(monkeypatch):
+    spectator_calls = []
+
+    def get_active_game(puuid, platform, priority):
+        spectator_calls.append(puuid)
+        return {"gameId": 7, "participants": [{"puuid": "PA"}, {"puuid": "PB"}]}
+
+    monkeypatch.setattr(multi_monitor, "get_active_game", get_active_game)
+    monitor = MultiMonitor(["a#KR1", "b#KR1"], outbox=NullOutbox())
+
+    async def scenario():
+        for state, puuid in zip(monitor.registry, ("PA", "PB")):
+            # 재시작 직후: 둘 다 게임 7을 진행 중인 것으로 불러와서 각자 리더로 예약됨
+            assert monitor.restore_state(state, SummonerRecord(state.riot_id, puuid=puuid, game_id=7))
+            monitor.scheduler.schedule(state.riot_id, 0)
+        a, b = monitor.registry.get("a#KR1"), monitor.registry.get("b#KR1")
+        await monitor.poll_and_reschedule(a)
+        return a, b
+
+    try:
+        a, b = asyncio.run(scenario())
+    finally:
+        monitor.executor.shutdown(wait=False)
+    assert spectator_calls == ["PA"]
+    assert b.game_leader == "a#KR1" and monitor.is_follower(b)
+    assert "b#KR1" not in monitor.scheduler.due
+    assert "a#KR1" in monitor.scheduler.due
+    assert monitor.games[7] == [a, b]
@@ -0,0 +1,102 @@
+"""
+Outbox 테스트: 중복 방지, 일부만 보내진 묶음의 나머지 재전송, 보내지 못한 메시지를 기다리는 동안의 새 메시지 전송.
+"""
+import threading
+import time
+
+import pytest
+
+import notifier
+from notifier import Outbox, PartialDelivery
+
+
+class RecordingTransport:
+    """
+    보낸 메시지를 기록합니다. fail에 있는 메시지를 만나면 그 앞까지만 보내고 PartialDelivery를 냅니다.
+    recover_after번 보낸 뒤에는 모두 성공합니다.
+    """
+
+    def __init__(self, fail=(), recover_after=None):
+        self.fail = set(fail)
+        self.recover_after = recover_after
+        self.sent = []
+        self.calls = []
+
+    def send(self, texts):
+        if self.recover_after is not None and len(self.calls) >= self.recover_after:
+            self.fail.clear()
+        self.calls.append(list(texts))
+        for i, text in enumerate(texts):
+            if text in self.fail:
+                raise PartialDelivery(i, RuntimeError("send failed"))
+            self.sent.append(text)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # 재시도 사이의 대기(time.sleep)를 건너뜀
+    monkeypatch.setattr(notifier.time, "sleep", lambda seconds: None)
+
+
+def flush(outbox, timeout=5):
+    waiter = threading.Thread(target=outbox.flush, daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    assert not waiter.is_alive(), "outbox did not drain"
+
+
+def test_enqueue_drops_duplicate_keys():
+    outbox = Outbox(RecordingTransport(), latency=None)
+    assert outbox.enqueue(("a#KR1", 1, "start"), "first")
+    assert not outbox.enqueue(("a#KR1", 1, "start"), "again")
+    assert outbox.enqueue(("a#KR1", 1, "end"), "end")
+    assert outbox.queue.qsize() == 2
+
+
+def test_dedupe_forgets_oldest_keys_past_limit():
+    outbox = Outbox(RecordingTransport(), latency=None, dedupe_size=2)
+    for game_id in range(3):
+        outbox.enqueue(("a#KR1", game_id, "start"), "msg")
+    assert outbox.enqueue(("a#KR1", 0, "start"), "msg")
+    assert not outbox.enqueue(("a#KR1", 2, "start"), "msg")
+
+
+def test_partial_delivery_retries_only_unsent_tail():
+    transport = RecordingTransport(fail={"c"}, recover_after=1)
+    delivered = []
+    outbox = Outbox(transport, max_retries=1, latency=None, on_delivered=delivered.extend)
+    batch = [(key, key, time.time(), None, None) for key in ("a", "b", "c", "d")]
+    assert outbox._deliver(batch) == []
+    # 이미 보낸 a, b는 다시 보내지 않음
+    assert transport.calls == [["a", "b", "c", "d"], ["c", "d"]]
+    assert transport.sent == ["a", "b", "c", "d"]
+    assert delivered == ["a", "b", "c", "d"]
+
+
+def test_failed_items_are_returned_after_retries():
+    transport = RecordingTransport(fail={"b"})
+    delivered = []
+    outbox = Outbox(transport, max_retries=2, latency=None, on_delivered=delivered.extend)
+    batch = [(key, key, time.time(), None, None) for key in ("a", "b", "c")]
+    failed = outbox._deliver(batch)
+    assert [item[0] for item in failed] == ["b", "c"]
+    assert transport.sent == ["a"]
+    assert delivered == ["a"]
+    assert len(transport.calls) == 3
+
+
+def test_new_messages_flow_while_failed_ones_wait():
+    transport = RecordingTransport(fail={"bad"})
+    outbox = Outbox(transport, max_retries=0, latency=None, requeue_delay=0.3, batch_size=1).start()
+    outbox.enqueue(("a#KR1", 1, "start"), "bad")
+    deadline = time.monotonic() + 5
+    while not outbox.delayed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    outbox.enqueue(("b#KR1", 2, "start"), "good")
+    while "good" not in transport.sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # 실패한 메시지의 재전송을 기다리는 동안에도 새 메시지는 바로 나감
+    assert transport.sent == ["good"]
+    transport.fail.clear()
+    flush(outbox)
+    assert transport.sent == ["good", "bad"]
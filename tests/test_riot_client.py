@@ -0,0 +1,177 @@
+"""
+레이트 리밋(RateLimitWindow, RateBudget)과 회로 차단기(CircuitBreaker) 테스트.
+"""
+import pytest
+
+import riot_client
+from riot_client import (
+    CircuitBreaker, RateBudget, RateLimitWindow, parse_rate_limit, PRIORITY_EVENT, PRIORITY_IDLE, PRIORITY_BACKFILL
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(riot_client.time, "monotonic", fake)
+    return fake
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit("20:1,100:120") == [(20, 1), (100, 120)]
+    assert parse_rate_limit("") == []
+    assert parse_rate_limit(None) == []
+
+
+def test_window_waits_for_oldest_request():
+    window = RateLimitWindow(2, 10)
+    window.record(0)
+    window.record(3)
+    assert window.wait_time(5) == 5
+    assert window.remaining(5) == 0
+    # 가장 오래된 요청이 창 밖으로 나가면 바로 보낼 수 있음
+    assert window.wait_time(10) == 0
+    assert window.remaining(10) == 1
+
+
+def test_window_headroom_leaves_part_of_limit():
+    window = RateLimitWindow(10, 10)
+    for _ in range(8):
+        window.record(0)
+    assert window.wait_time(1) == 0
+    # 20%를 남겨 두면 8회까지만 씀
+    assert window.wait_time(1, headroom=0.2) == 9
+
+
+def test_window_sync_only_adds_usage():
+    window = RateLimitWindow(10, 10)
+    window.record(0)
+    window.sync(4, 1)
+    assert window.remaining(1) == 6
+    # 서버가 알려준 사용량이 로컬 기록보다 적으면 그대로 둠
+    window.sync(2, 1)
+    assert window.remaining(1) == 6
+
+
+def test_budget_syncs_limits_and_counts_from_headers(clock):
+    budget = RateBudget("20:1")
+    budget.update_from_headers("kr", "spectator", {
+        "X-App-Rate-Limit": "20:1,100:120",
+        "X-App-Rate-Limit-Count": "3:1,50:120",
+        "X-Method-Rate-Limit": "5:10",
+        "X-Method-Rate-Limit-Count": "5:10",
+    })
+    assert budget.remaining("kr", "spectator") == (17, 0)
+    wait, scope = budget.reserve("kr", "spectator")
+    assert wait == 10 and scope == "method"
+    # 다른 메서드는 앱 한도만 봄
+    assert budget.reserve("kr", "league") == (0.0, None)
+
+
+def test_budget_priority_headroom(clock):
+    budget = RateBudget("10:10")
+    for _ in range(5):
+        assert budget.reserve("kr", "m", PRIORITY_EVENT) == (0.0, None)
+    # 백필은 한도의 절반을 남겨 둠
+    assert budget.reserve("kr", "m", PRIORITY_BACKFILL)[0] > 0
+    for _ in range(3):
+        assert budget.reserve("kr", "m", PRIORITY_IDLE) == (0.0, None)
+    # 대기 폴링은 20%를 남겨 두고, 이벤트 요청은 끝까지 씀
+    assert budget.reserve("kr", "m", PRIORITY_IDLE)[0] > 0
+    assert budget.reserve("kr", "m", PRIORITY_EVENT) == (0.0, None)
+    assert budget.reserve("kr", "m", PRIORITY_EVENT) == (0.0, None)
+    assert budget.reserve("kr", "m", PRIORITY_EVENT) == (10, "app")
+
+
+def test_budget_block_by_limit_type(clock):
+    budget = RateBudget("100:1")
+    budget.block("kr", "m", "method", 30)
+    assert budget.reserve("kr", "m") == (30, "method")
+    assert budget.reserve("kr", "other") == (0.0, None)
+    budget.block("kr", "m", "application", 60)
+    assert budget.reserve("kr", "other") == (60, "app")
+    clock.now += 60
+    assert budget.reserve("kr", "other") == (0.0, None)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    assert not breaker.record_success()
+    assert not breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_allows_one_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    assert breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_doubles_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, max_reset_timeout=50)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.reset_timeout == 50
+    clock.now += 49
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.reset_timeout == 30
+
+
+def test_breaker_release_returns_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    # 시험 요청을 보내지 못했으면 다른 요청이 다시 시험할 수 있어야 함
+    breaker.release()
+    assert breaker.allow()
+
+
+class UnreachableBudget(RateBudget):
+    """
+    코디네이터에 닿지 않는 RemoteRateBudget처럼 reserve()에서 OSError를 냅니다.
+    """
+
+    def reserve(self, host, method, priority=PRIORITY_EVENT):
+        raise OSError("coordinator unreachable")
+
+
+def test_client_releases_probe_when_request_is_not_sent(clock):
+    client = riot_client.RiotClient("key", budget=UnreachableBudget(), breaker_threshold=1, breaker_reset=30)
+    breaker = client.breaker("kr", "m")
+    breaker.record_failure()
+    clock.now += 30
+    with pytest.raises(OSError):
+        client.get("kr", "/path", "m")
+    # 시험 요청이 나가지 못했으므로 회로는 다음 요청에 다시 시험 기회를 줘야 함
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,49 @@
+"""
+PollScheduler(지연 삭제 힙)와 PollPolicy 테스트.
+"""
+from scheduler import PollPolicy, PollScheduler
+
+
+def test_reschedule_replaces_previous_entry():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 10)
+    scheduler.schedule("a", 5)
+    scheduler.schedule("b", 7)
+    assert len(scheduler) == 2
+    assert scheduler.next_due() == 5
+    assert scheduler.pop_due(10) == ["a", "b"]
+    # 예전 예약(10)은 힙에 남아 있어도 다시 나오지 않음
+    assert scheduler.pop_due(100) == []
+    assert scheduler.next_due() is None
+
+
+def test_reschedule_later_skips_stale_entry():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 5)
+    scheduler.schedule("a", 20)
+    assert scheduler.next_due() == 20
+    assert scheduler.pop_due(10) == []
+    assert scheduler.pop_due(20) == ["a"]
+
+
+def test_remove_drops_pending_entry():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 5)
+    scheduler.schedule(("result", 1), 6)
+    scheduler.remove("a")
+    scheduler.remove("missing")
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(10) == [("result", 1)]
+
+
+def test_popped_key_can_be_scheduled_again():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 5)
+    assert scheduler.pop_due(5) == ["a"]
+    scheduler.schedule("a", 5)
+    assert scheduler.pop_due(5) == ["a"]
+
+
+def test_idle_delay_backs_off_to_max():
+    policy = PollPolicy(min_interval=10, idle_max=60, idle_backoff=2, jitter=0)
+    assert [policy.delay(False, idle_polls=n) for n in range(5)] == [10, 20, 40, 60, 60]
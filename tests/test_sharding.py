@@ -0,0 +1,47 @@
+"""
+HashRing / shard_of 테스트: 워커가 들고 나도 그 워커 몫만 옮겨 가는지 확인합니다.
+"""
+from sharding import HashRing, shard_of
+
+RIOT_IDS = [f"player{i}#KR1" for i in range(500)]
+
+
+def owners(workers):
+    ring = HashRing(workers)
+    return {riot_id: ring.owner(riot_id) for riot_id in RIOT_IDS}
+
+
+def test_empty_ring_has_no_owner():
+    assert HashRing().owner("player#KR1") is None
+
+
+def test_owner_does_not_depend_on_worker_order():
+    assert owners(["a", "b", "c"]) == owners(["c", "a", "b"])
+
+
+def test_adding_worker_only_moves_keys_to_it():
+    before = owners(["a", "b", "c"])
+    after = owners(["a", "b", "c", "d"])
+    moved = [riot_id for riot_id in RIOT_IDS if before[riot_id] != after[riot_id]]
+    assert moved
+    assert all(after[riot_id] == "d" for riot_id in moved)
+    # 대략 1/4만 옮겨 감
+    assert len(moved) < len(RIOT_IDS) / 2
+
+
+def test_removing_worker_only_moves_its_keys():
+    before = owners(["a", "b", "c"])
+    after = owners(["a", "c"])
+    for riot_id in RIOT_IDS:
+        if before[riot_id] != "b":
+            assert after[riot_id] == before[riot_id]
+
+
+def test_shard_of_partitions_list_by_riot_id():
+    specs = RIOT_IDS[:100] + ["other#NA1@na1"]
+    workers = ["a", "b", "c"]
+    shards = [shard_of(specs, workers, worker) for worker in workers]
+    assert sorted(spec for shard in shards for spec in shard) == sorted(specs)
+    # "@플랫폼"이 붙어도 Riot ID로 나눔
+    owner = HashRing(workers).owner("other#NA1")
+    assert "other#NA1@na1" in shards[workers.index(owner)]
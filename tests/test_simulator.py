@@ -0,0 +1,18 @@
+"""
+시뮬레이터 스모크 테스트: 작은 시뮬레이션을 끝까지 돌려서 정리 단계까지 오류 없이 끝나는지 확인합니다.
+"""
+import simulator
+from metrics import METRICS
+from multi_monitor import MultiMonitor
+
+
+def test_small_simulation_runs_to_completion():
+    args = simulator.parse_args(["--summoners", "30", "--hours", "2", "--grace", "600"])
+    result = simulator.run_simulation(args)
+    # 모니터가 끝나면 자기 지표 수집기를 빼야 함
+    assert not [c for c in METRICS.collectors if isinstance(getattr(c, "__self__", None), MultiMonitor)]
+    assert result["games"] > 0
+    assert result["events_expected"] > 0
+    assert result["events_missed"] == 0
+    assert result["events_duplicated"] == 0
+    assert result["events_unexpected"] == 0
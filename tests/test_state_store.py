@@ -0,0 +1,67 @@
+"""
+StateStore 테스트: 끝난 게임별 결과 대기(pending_results)와 이전 버전 파일의 이전.
+"""
+import sqlite3
+
+from state_store import StateStore
+
+
+def test_each_ended_game_keeps_its_own_pending_row(tmp_path):
+    store = StateStore(str(tmp_path / "state.sqlite3"))
+    store.save_account("a#KR1", "PA")
+    store.record_game_over("a#KR1", 1, 100.0)
+    store.record_game_over("a#KR1", 2, 200.0)
+    assert store.load("a#KR1").ended_games == ((1, 100.0), (2, 200.0))
+
+    assert store.record_end("a#KR1", 1, "KR_1", ("a#KR1", 1, "end"), "end 1")
+    record = store.load("a#KR1")
+    assert record.ended_games == ((2, 200.0),)
+    assert record.last_match_id == "KR_1"
+    # 같은 알림은 두 번 기록하지 않음
+    assert not store.record_end("a#KR1", 1, "KR_1", ("a#KR1", 1, "end"), "end 1")
+
+
+def test_record_end_keeps_next_game(tmp_path):
+    store = StateStore(str(tmp_path / "state.sqlite3"))
+    store.record_start("a#KR1", "S", 1, 10.0, ("a#KR1", 1, "start"), "start 1")
+    store.record_game_over("a#KR1", 1, 100.0)
+    store.record_start("a#KR1", "S", 2, 110.0, ("a#KR1", 2, "start"), "start 2")
+    store.record_end("a#KR1", 1, "KR_1", ("a#KR1", 1, "end"), "end 1")
+    record = store.load("a#KR1")
+    assert record.game_id == 2
+    assert record.ended_games == ()
+
+
+def test_migrates_single_ended_game_columns(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    # 소환사마다 결과 대기 게임을 summoners 열 하나에 저장하던 이전 버전의 파일
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE summoners (riot_id TEXT PRIMARY KEY, puuid TEXT, summoner_id TEXT, game_id INTEGER,"
+        " game_started_at REAL, last_game_id INTEGER, last_match_id TEXT, last_event TEXT, last_event_at REAL,"
+        " ended_game_id INTEGER, ended_at REAL, updated_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO summoners (riot_id, puuid, ended_game_id, ended_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        ("a#KR1", "PA", 7, 70.0, 0)
+    )
+    conn.execute("INSERT INTO summoners (riot_id, puuid, updated_at) VALUES (?, ?, ?)", ("b#KR1", "PB", 0))
+    conn.commit()
+    conn.close()
+
+    store = StateStore(path)
+    records = store.load_all()
+    assert records["a#KR1"].ended_games == ((7, 70.0),)
+    assert records["b#KR1"].ended_games == ()
+    # 다시 열어도 두 번 옮기지 않음
+    store.conn.close()
+    assert StateStore(path).load("a#KR1").ended_games == ((7, 70.0),)
+
+
+def test_pending_notifications_until_marked_sent(tmp_path):
+    store = StateStore(str(tmp_path / "state.sqlite3"))
+    store.record_start("a#KR1", "S", 1, 10.0, ("a#KR1", 1, "start"), "start 1", 10.0)
+    assert store.pending_notifications(["a#KR1"]) == [(("a#KR1", 1, "start"), "start 1", 10.0)]
+    assert store.pending_notifications(["b#KR1"]) == []
+    store.mark_sent([("a#KR1", 1, "start")])
+    assert store.pending_notifications(["a#KR1"]) == []
@@ -0,0 +1,171 @@
+"""
+실행 중인 다중 모니터(multi_monitor.py)의 소환사 목록을 재시작 없이 바꿉니다.
+
+- 목록 파일: SUMMONER_LIST_FILE의 수정 시각을 WATCHLIST_CHECK_INTERVAL초마다 확인해서, 바뀌었으면 다시 읽고
+  지난번에 읽은 목록과 비교해 추가/제거된 소환사만 MultiMonitor.add_summoner()/remove_summoner()로 반영합니다.
+  같은 Riot ID의 "@플랫폼"이 바뀌면 뺐다가 다시 추가합니다.
+- 제어 소켓: CONTROL_SOCKET("호스트:포트" 또는 "unix:/경로")으로 한 줄에 JSON 하나씩 보냅니다.
+    {"op": "add", "summoner": "이름#태그@kr"}   → {"added": true}
+    {"op": "remove", "summoner": "이름#태그"}   → {"removed": true}
+    {"op": "list"}                              → {"summoners": ["이름#태그@kr", ...]}
+  소켓으로 바꾼 소환사는 목록 파일과 따로 관리됩니다 (파일을 다시 읽어도 그 줄이 바뀌지 않았으면 건드리지 않음).
+
+나머지 소환사는 그대로 두므로 다시 폴링하거나 puuid를 다시 조회하지 않고, 게임 중 상태도 유지됩니다.
+새로 추가된 소환사의 puuid는 MultiMonitor의 PuuidResolver가 나눠서 천천히 조회합니다.
+
+사용 예:
+  set CONTROL_SOCKET=127.0.0.1:8791
+  python start.py multi
+  python watchlist.py add "Hide on bush#KR1" "Doublelift#NA1@na1"
+  python watchlist.py remove "Hide on bush#KR1"
+  python watchlist.py list
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+
+from config import SUMMONER_LIST_FILE, WATCHLIST_CHECK_INTERVAL, CONTROL_SOCKET
+from multi_monitor import load_summoner_names, valid_summoners
+from rate_coordinator import parse_address
+from routing import split_summoner
+
+
+class WatchList:
+    """
+    monitor(MultiMonitor)의 대상을 목록 파일과 제어 소켓의 변경에 맞춰 바꿉니다.
+    initial은 monitor를 만들 때 쓴 목록입니다 (파일을 다시 읽었을 때 비교할 기준).
+    """
+
+    def __init__(self, monitor, initial, path=SUMMONER_LIST_FILE, check_interval=WATCHLIST_CHECK_INTERVAL,
+                 address=CONTROL_SOCKET):
+        self.monitor = monitor
+        self.path = path
+        self.check_interval = check_interval
+        self.address = address
+        self.current = {split_summoner(spec)[0]: spec for spec in initial}
+        self.mtime = self._mtime()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns if self.path else None
+        except OSError:
+            return None
+
+    def apply(self, specs):
+        """
+        새 목록(specs)을 지난번 목록과 비교해서 바뀐 소환사만 반영하고 (추가 수, 제거 수)를 반환합니다.
+        """
+        wanted = {split_summoner(spec)[0]: spec for spec in valid_summoners(specs)}
+        added = removed = 0
+        for riot_id, spec in self.current.items():
+            if wanted.get(riot_id) != spec:
+                removed += self.monitor.remove_summoner(riot_id)
+        for riot_id, spec in wanted.items():
+            if self.current.get(riot_id) != spec:
+                added += self.monitor.add_summoner(spec)
+        self.current = wanted
+        if added or removed:
+            print(f"소환사 목록 변경: +{added}, -{removed} (현재 {len(self.monitor.registry)}명)")
+        return added, removed
+
+    async def watch_file(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            mtime = self._mtime()
+            if mtime is None or mtime == self.mtime:
+                continue
+            self.mtime = mtime
+            try:
+                specs = load_summoner_names(self.path)
+            except OSError as e:
+                print("소환사 목록 파일을 읽지 못했습니다:", e)
+                continue
+            self.apply(specs)
+
+    def dispatch(self, request):
+        op = request.get("op")
+        if op == "add":
+            specs = valid_summoners([request["summoner"].strip()])
+            if not specs:
+                return {"error": f"올바르지 않은 소환사입니다: {request['summoner']}"}
+            return {"added": self.monitor.add_summoner(specs[0])}
+        if op == "remove":
+            return {"removed": self.monitor.remove_summoner(split_summoner(request["summoner"])[0])}
+        if op == "list":
+            return {"summoners": [f"{state.riot_id}@{state.route.platform}" for state in self.monitor.registry]}
+        return {"error": f"알 수 없는 요청입니다: {op}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {"error": str(e)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        family, target = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(target):
+                os.unlink(target)
+            server = await asyncio.start_unix_server(self.handle, target)
+        else:
+            server = await asyncio.start_server(self.handle, *target)
+        print(f"제어 소켓 시작: {self.address}")
+        async with server:
+            await server.serve_forever()
+
+    async def run(self):
+        """
+        목록 파일 감시와 제어 소켓을 (설정된 것만) 실행합니다. 둘 다 없으면 바로 돌아옵니다.
+        """
+        jobs = []
+        if self.path:
+            jobs.append(self.watch_file())
+        if self.address:
+            jobs.append(self.serve())
+        if jobs:
+            await asyncio.gather(*jobs)
+
+
+def send_command(address, request, timeout=10):
+    """
+    실행 중인 모니터의 제어 소켓에 요청 하나를 보내고 응답(dict)을 반환합니다.
+    """
+    family, target = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(target)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="실행 중인 다중 모니터의 소환사 목록 변경")
+    parser.add_argument("op", choices=("add", "remove", "list"))
+    parser.add_argument("summoners", nargs="*", help='"이름#태그" 또는 "이름#태그@플랫폼"')
+    parser.add_argument("--address", default=CONTROL_SOCKET, help="제어 소켓 주소 (기본: CONTROL_SOCKET)")
+    args = parser.parse_args(argv)
+    if not args.address:
+        parser.error("CONTROL_SOCKET 환경변수나 --address가 필요합니다.")
+
+    if args.op == "list":
+        for summoner in send_command(args.address, {"op": "list"}).get("summoners", []):
+            print(summoner)
+        return
+    for summoner in args.summoners:
+        print(summoner, send_command(args.address, {"op": args.op, "summoner": summoner}))
+
+
+if __name__ == "__main__":
+    main()